@@ -0,0 +1,315 @@
+import copy
+import math
+import sys
+
+from mita_backend import HISTORY_LIMIT, HISTORY_POLICIES, HISTORY_SNAPSHOT_EVERY, History, type_info
+
+# ArrayBackend without any GUI dependency; the visualizer in teststs.py is the
+# GUI entry point built on top of it.
+
+# ==========================================
+#               BACKEND LOGIC
+# ==========================================
+GROWTH = {"2x": 2.0, "1.5x": 1.5, "golden": (1 + 5 ** 0.5) / 2}
+
+# Converters and display formats come from the shared type registry (DATA_TYPES in mita_backend.py)
+
+# Fixed slot buffer: items fill the first n slots, overflow reallocates and copies
+class SlotBuffer:
+    def __init__(self, size=0, growth="2x", shrink_at=None):
+        self.slots, self.n = [None] * max(size, 0), 0
+        self.growth, self.shrink_at = GROWTH.get(growth, growth), shrink_at
+        self.copies = self.moved = 0 # Reallocations / bytes of slot pointers copied
+
+    def __len__(self): return self.n
+    def __iter__(self): return iter(self.slots[:self.n])
+
+    def _pos(self, i):
+        if i < 0: i += self.n
+        if not 0 <= i < self.n: raise IndexError("slot out of range")
+        return i
+
+    def __getitem__(self, i): return self.slots[self._pos(i)]
+    def __setitem__(self, i, v): self.slots[self._pos(i)] = v
+
+    @property
+    def capacity(self): return len(self.slots)
+
+    def grown(self): return max(self.capacity + 1, math.ceil(self.capacity * self.growth))
+
+    def realloc(self, size):
+        size = max(size, self.n)
+        if size == self.capacity: return
+        new = [None] * size; new[:self.n] = self.slots[:self.n]
+        self.slots, self.copies, self.moved = new, self.copies + 1, self.moved + 8 * self.n
+
+    def append(self, v):
+        if self.n == self.capacity: self.realloc(self.grown())
+        self.slots[self.n] = v; self.n += 1
+
+    def insert(self, i, v):
+        i = max(0, min(i if i >= 0 else i + self.n, self.n))
+        if self.n == self.capacity: self.realloc(self.grown())
+        self.slots[i + 1:self.n + 1] = self.slots[i:self.n]
+        self.slots[i] = v; self.n += 1
+
+    def pop(self, i=-1):
+        i = self._pos(i); v = self.slots[i]
+        self.slots[i:self.n - 1] = self.slots[i + 1:self.n]
+        self.n -= 1; self.slots[self.n] = None
+        if self.shrink_at and self.n < self.capacity * self.shrink_at:
+            self.realloc(max(1, int(self.capacity / self.growth)))
+        return v
+
+    def index(self, v): return self.slots.index(v, 0, self.n)
+
+    # Replace all items at once, keeping capacity and copy counters
+    def assign(self, items):
+        self.slots, self.n = list(items) + [None] * (self.capacity - len(items)), len(items)
+    def clear(self): self.slots[:self.n] = [None] * self.n; self.n = 0
+    def copy(self):
+        c = copy.copy(self); c.slots = self.slots[:]
+        return c
+
+class ArrayBackend:
+    def __init__(self):
+        self.arr, self.type, self.conv = SlotBuffer(), "String", type_info("String").parse
+        self.growth, self.shrink_at = "2x", None
+        self.idx, self.idx_stale = None, True # Optional value -> first index map
+        self.log = None # Change records for incremental repaint, when tracked
+        self.hist, self.frozen = None, None # Undo journal; buffer it still holds (copied before the next edit)
+
+    # Records: ("set", i), ("shift", i, delta), ("capacity", cap), ("cleared", old_len), ("reset",)
+    def track_changes(self, on=True): self.log = [] if on else None
+
+    def pop_changes(self):
+        if self.log is None: return []
+        out, self.log = self.log, []
+        return out
+
+    def _rec(self, *change):
+        if self.log is not None:
+            if len(self.log) >= 1000: self.log[:] = [("reset",)] # Too many to patch one by one
+            self.log.append(change)
+
+    # Capacity is the slot count of the buffer
+    @property
+    def cap(self): return self.arr.capacity
+
+    # Growth policy for insert(resize=True): "2x", "1.5x", "golden" or a factor > 1
+    def set_growth(self, growth="2x", shrink_at=None):
+        self.growth, self.shrink_at = growth, shrink_at
+        self.arr.growth, self.arr.shrink_at = GROWTH.get(growth, growth), shrink_at
+
+    def growth_stats(self):
+        return {"capacity": self.cap, "reallocations": self.arr.copies, "bytes_moved": self.arr.moved}
+
+    # Search index: kept current on appends/edits, rebuilt lazily after shifts
+    def use_index(self, on=True):
+        self.idx, self.idx_stale = ({} if on else None), True
+
+    def _indexed(self, pos, val):
+        if self.idx is not None and not self.idx_stale: self.idx.setdefault(val, pos)
+
+    def _stale(self):
+        if self.idx is not None: self.idx_stale = True
+
+    # --- HISTORY: undo/redo over the shared History journal (see MitaInABox.set_history) ---
+    # Entries: ("insert"/"delete", i, v, cap before, cap after), ("modify", i, old, new),
+    # ("replace", state before, state after) for bulk edits, ("group", entries)
+    def use_history(self, on=True, limit=HISTORY_LIMIT, policy="drop-oldest", every=HISTORY_SNAPSHOT_EVERY):
+        if policy not in HISTORY_POLICIES: return False
+        self.hist = History(limit, policy, every) if on else None
+        return True
+
+    def _state(self): return (self.arr, self.type)
+    def _install(self, st):
+        self.arr, self.type = st; self.conv = type_info(self.type).parse
+        self.frozen = self.arr; self._stale(); self._rec("reset")
+
+    # Copy-on-write: the journal's buffer is never edited in place
+    def _own(self):
+        if self.arr is self.frozen: self.arr, self.frozen = self.arr.copy(), None
+
+    # Start of a bulk edit: freezes the buffer and returns it as the "before" state
+    def _bulk(self):
+        if self.hist is not None: self.frozen = self.arr
+        return self._state()
+
+    def _jr(self, *e):
+        h = self.hist
+        if h is None: return
+        if e[0] == "replace": self.frozen = self.arr
+        h.record(e, self._cost(e))
+        if h.snapshot_due() and h.add_snapshot(self._state(), 120 + 8 * self.cap): self.frozen = self.arr
+
+    def _cost(self, e):
+        if e[0] == "group": return sum(map(self._cost, e[1]))
+        if e[0] == "replace": return 120 + 8 * e[1][0].capacity
+        return 120 + sum(map(sys.getsizeof, e[2:4]))
+
+    def _apply(self, e, fwd):
+        k = e[0]
+        if k == "group":
+            for s in (e[1] if fwd else reversed(e[1])): self._apply(s, fwd)
+            return
+        if k == "replace": return self._install(e[2] if fwd else e[1])
+        self._own(); self._stale()
+        if k == "modify": self.arr[e[1]] = e[3] if fwd else e[2]; self._rec("set", e[1]); return
+        if (k == "insert") == fwd: self.arr.insert(e[1], e[2])
+        else: self.arr.pop(e[1])
+        cap = e[4] if fwd else e[3]
+        if self.cap != cap: self.arr.realloc(cap)
+        self._rec("reset")
+
+    def undo(self):
+        e = self.hist.undo() if self.hist is not None else None
+        if e is None: return False
+        self._apply(e, False); return True
+
+    def redo(self):
+        e = self.hist.redo() if self.hist is not None else None
+        if e is None: return False
+        self._apply(e, True); return True
+
+    # Jump to a journal position, from the nearest snapshot when that replays less
+    def revert_to(self, pos):
+        h = self.hist
+        if h is None or not h.first() <= pos <= h.last(): return False
+        st, start = h.route(pos)
+        if st is not None: self._install(st); h.seek(start)
+        while h.position < pos: self._apply(h.redo(), True)
+        while h.position > pos: self._apply(h.undo(), False)
+        return True
+
+    def validate(self, val): return self.conv(val)
+    def show(self, val): return type_info(self.type).display(val)
+
+    # progress(done, total) is called every 65536 items; returning False cancels
+    def create(self, cap_input, raw_data, dtype, progress=None):
+        try: cap = int(cap_input) if cap_input else 1
+        except ValueError: cap = 1
+        before = self._bulk()
+        self.type, self.conv, self.arr = dtype, type_info(dtype).parse, SlotBuffer(cap, self.growth, self.shrink_at)
+        
+        if raw_data and raw_data.strip():
+            items = raw_data.split(',')
+            for n, item in enumerate(items):
+                if progress and n % 65536 == 0 and progress(n, len(items)) is False:
+                    self.arr.clear(); self._stale(); self._rec("reset"); self._jr("replace", before, self._state())
+                    return False, "Cancelled"
+                valid, val = self.validate(item)
+                if not valid: # The old buffer is gone either way, so views must redraw the empty one
+                    self.arr.clear(); self._stale(); self._rec("reset"); self._jr("replace", before, self._state())
+                    return False, f"'{item.strip()}' invalid for {dtype}"
+                if len(self.arr) < cap: self.arr.append(val)
+        self._stale(); self._rec("reset"); self._jr("replace", before, self._state())
+        return True, "Success"
+
+    def insert(self, item, resize=False):
+        valid, val = self.validate(item)
+        if not valid: return False, "TYPE_ERROR"
+        cap = self.cap
+        if len(self.arr) >= cap:
+            if not resize: return False, "FULL"
+            self._own(); self.arr.realloc(self.arr.grown()); self._rec("capacity", self.cap)
+        self._own(); self.arr.append(val)
+        self._indexed(len(self.arr) - 1, val); self._rec("set", len(self.arr) - 1)
+        self._jr("insert", len(self.arr) - 1, val, cap, self.cap)
+        return True, "Success"
+
+    def modify(self, idx, val):
+        if not (0 <= idx < len(self.arr)): return "INDEX_ERROR"
+        valid, conv = self.validate(val)
+        if not valid: return "TYPE_ERROR"
+        if self.idx is not None and not self.idx_stale and conv != self.arr[idx]:
+            if self.idx.get(self.arr[idx]) == idx: self.idx_stale = True
+            elif self.idx.get(conv, idx + 1) > idx: self.idx[conv] = idx
+        self._own(); self._jr("modify", idx, self.arr[idx], conv)
+        self.arr[idx] = conv; self._rec("set", idx)
+        return True
+
+    def insert_at(self, idx, val):
+        if len(self.arr) >= self.cap: return "FULL"
+        # Check Valid Bounds (0 to Capacity-1) for UI safety
+        if idx < 0 or idx >= self.cap: return "INDEX_ERROR"
+        
+        valid, conv = self.validate(val)
+        if not valid: return "TYPE_ERROR"
+        
+        # Standard insert behavior (appends if idx > current length)
+        self._own(); self.arr.insert(idx, conv)
+        self._jr("insert", min(idx, len(self.arr) - 1), conv, self.cap, self.cap)
+        if idx >= len(self.arr) - 1: self._indexed(len(self.arr) - 1, conv); self._rec("set", len(self.arr) - 1)
+        else: self._stale(); self._rec("shift", idx, 1)
+        return True
+
+    def delete(self, idx):
+        if 0 <= idx < len(self.arr):
+            cap = self.cap
+            self._own(); removed = self.arr.pop(idx)
+            self._jr("delete", idx, removed, cap, self.cap)
+            if idx < len(self.arr): self._stale()
+            elif self.idx is not None and not self.idx_stale and self.idx.get(removed) == idx: del self.idx[removed]
+            self._rec("shift", idx, -1)
+            if self.cap != cap: self._rec("capacity", self.cap) # Shrunk below the threshold
+            return removed is not None
+        return False
+
+    def clear(self):
+        self._rec("cleared", len(self.arr))
+        before = self._bulk(); self._own()
+        self.arr.clear(); self._jr("replace", before, self._state())
+        if self.idx is not None: self.idx, self.idx_stale = {}, False
+
+    # --- BATCH OPS: validate the whole batch, then apply it in one pass ---
+    def insert_many(self, pairs):
+        pairs = list(pairs)
+        if len(self.arr) + len(pairs) > self.cap: return "FULL"
+        conv = []
+        for idx, val in pairs:
+            if idx < 0 or idx >= self.cap: return "INDEX_ERROR"
+            valid, v = self.validate(val)
+            if not valid: return "TYPE_ERROR"
+            conv.append((min(idx, len(self.arr)), v)) # Past the end appends, like insert_at
+        conv.sort(key=lambda p: p[0])
+        items, out, start = list(self.arr), [], 0
+        for idx, v in conv: out += items[start:idx]; out.append(v); start = idx
+        before = self._bulk(); self._own()
+        self.arr.assign(out + items[start:]); self._stale(); self._jr("replace", before, self._state())
+        if conv: self._rec("shift", conv[0][0], len(conv))
+        return True
+
+    def delete_many(self, idxs):
+        idxs = sorted(set(idxs))
+        if idxs and not (0 <= idxs[0] and idxs[-1] < len(self.arr)): return False
+        items, out, start = list(self.arr), [], 0
+        for idx in idxs: out += items[start:idx]; start = idx + 1
+        before = self._bulk(); self._own()
+        self.arr.assign(out + items[start:]); self._stale(); self._jr("replace", before, self._state())
+        if idxs: self._rec("shift", idxs[0], -len(idxs))
+        return True
+
+    def modify_many(self, pairs):
+        conv = []
+        for idx, val in pairs:
+            if not (0 <= idx < len(self.arr)): return "INDEX_ERROR"
+            valid, v = self.validate(val)
+            if not valid: return "TYPE_ERROR"
+            conv.append((idx, v))
+        self._own(); steps = []
+        for idx, v in conv: steps.append(("modify", idx, self.arr[idx], v)); self.arr[idx] = v; self._rec("set", idx)
+        if steps: self._jr("group", steps)
+        self._stale()
+        return True
+
+    def search(self, val):
+        valid, target = self.validate(val)
+        if not valid: return -1
+        if self.idx is not None:
+            if self.idx_stale:
+                self.idx = dict(zip(reversed(self.arr), range(len(self.arr) - 1, -1, -1)))
+                self.idx_stale = False
+            return self.idx.get(target, -1)
+        try: return self.arr.index(target)
+        except ValueError: return -1
@@ -0,0 +1,370 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date
+from functools import partial
+from itertools import cycle, islice
+
+from array_backend import ArrayBackend
+from mita_backend import MitaInABox
+from parallel_scan import PARALLEL_WORKERS, scan
+from table import Table
+
+# ==========================================
+#        HEADLESS BACKEND BENCHMARKS
+# ==========================================
+# Times the array backends without opening a window:
+#   python bench.py                           (default sizes, all types)
+#   python bench.py --sizes 10 1000 --types Integer
+#   python bench.py --save-baseline           (store results as the new baseline)
+#   python bench.py --table-rows              (Table queries vs a per-row loop, 10^6 rows)
+#   python bench.py --startup                 (import time of the backends and GUIs;
+#                                              MITA_STARTUP_TIMING=1 python test.py adds window build time)
+#   python bench.py --scan-rows               (parallel scan speedup per worker count, 2^23 rows)
+# Results are written as JSON and compared against the stored baseline;
+# the exit code is 1 when any case got slower than the tolerance allows, and
+# 2 when there is no baseline to compare with.
+# bench_baseline.json is committed so slowdowns show up in review. It was
+# recorded with --sizes 10 1000 100000 (larger sizes have no baseline rows and
+# are not compared). Timings are machine specific: after a deliberate change,
+# or on a new machine, refresh it on the previous commit with
+#   python bench.py --sizes 10 1000 100000 --save-baseline
+# and commit the file together with the change.
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 10_000_000]
+DATA_TYPES = ["Integer", "Boolean", "String", "Float", "Date"]
+HEADROOM = 10_000 # Spare capacity for the insert benchmarks (also their call limit)
+
+# Per type: token used to fill arrays, a value that is never present (worst-case search)
+TOKENS = {
+    "Integer": (lambda i: str(i), "-1"),
+    "Boolean": (lambda i: "t", "f"),
+    "String": (lambda i: f"s{i}", "missing"),
+    "Float": (lambda i: f"{i}.5", "-1.5"),
+    "Date": (lambda i: date.fromordinal(1 + i % 3_000_000).isoformat(), "9999-12-31"),
+}
+
+def make_payload(data_type, size):
+    token = TOKENS[data_type][0]
+    return ",".join(token(i) for i in range(size))
+
+# ---- Case builders: (name, setup, op, max_calls, items per call) ----
+
+def mita_cases(data_type, size, payload, storage="contiguous"):
+    value, missing = TOKENS[data_type][0](size), TOKENS[data_type][1]
+    batch = [value] * 1_000
+
+    def fresh(capacity):
+        def setup():
+            box = MitaInABox()
+            box.create_array(capacity, payload, data_type, storage=storage)
+            return box
+        return setup
+
+    # Edits that stay around one cursor position, the gap buffer's best case
+    def cursor_edits(box):
+        box.insert_at_specific_index(size // 2, value)
+        box.delete_at_index(size // 2)
+
+    return [
+        ("create_array", MitaInABox, lambda b: b.create_array(size, payload, data_type, storage=storage), 50, size),
+        ("insert", fresh(size + HEADROOM), lambda b: b.insert(value), HEADROOM, 1),
+        ("resize_and_insert", fresh(size), lambda b: b.resize_and_insert(value), HEADROOM, 1),
+        ("insert_at_specific_index", fresh(size + HEADROOM), lambda b: b.insert_at_specific_index(0, value), HEADROOM, 1),
+        ("delete_at_index", fresh(size), lambda b: b.delete_at_index(0), size, 1),
+        ("cursor_edit", fresh(size + 1), cursor_edits, 100_000, 2),
+        ("search", fresh(size), lambda b: b.search(missing), HEADROOM, 1),
+        # Full scans; from PARALLEL_THRESHOLD elements on they run in worker processes
+        ("count", fresh(size), lambda b: b.count(missing), HEADROOM, size),
+        ("find_all", fresh(size), lambda b: b.find_all(value), HEADROOM, size),
+        ("min_value", fresh(size), lambda b: b.min_value(), HEADROOM, size),
+        ("sum_values", fresh(size), lambda b: b.sum_values(), HEADROOM, size),
+        ("filter_values", fresh(size), lambda b: b.filter_values("<", value), HEADROOM, size),
+        ("validate_and_convert", fresh(size), lambda b: b.validate_and_convert(value), 100_000, 1),
+        ("validate_and_convert_many", fresh(size), lambda b: b.validate_and_convert_many(batch), 1_000, len(batch)),
+    ]
+
+def backend_cases(data_type, size, payload):
+    value, missing = TOKENS[data_type][0](size), TOKENS[data_type][1]
+
+    def fresh(capacity):
+        def setup():
+            backend = ArrayBackend()
+            backend.create(capacity, payload, data_type)
+            return backend
+        return setup
+
+    def cursor_edits(backend):
+        backend.insert_at(size // 2, value)
+        backend.delete(size // 2)
+
+    return [
+        ("create_array", ArrayBackend, lambda b: b.create(size, payload, data_type), 50, size),
+        ("insert", fresh(size + HEADROOM), lambda b: b.insert(value), HEADROOM, 1),
+        ("resize_and_insert", fresh(size), lambda b: b.insert(value, resize=True), HEADROOM, 1),
+        ("insert_at_specific_index", fresh(size + HEADROOM), lambda b: b.insert_at(0, value), HEADROOM, 1),
+        ("delete_at_index", fresh(size), lambda b: b.delete(0), size, 1),
+        ("cursor_edit", fresh(size + 1), cursor_edits, 100_000, 2),
+        ("search", fresh(size), lambda b: b.search(missing), HEADROOM, 1),
+        ("validate_and_convert", fresh(size), lambda b: b.validate(value), 100_000, 1),
+    ]
+
+BACKENDS = {
+    "MitaInABox": mita_cases,
+    "MitaInABoxGap": partial(mita_cases, storage="gap"),
+    "ArrayBackend": backend_cases,
+}
+
+# ---- Table queries: columnar engine vs a naive loop over row dicts ----
+
+TABLE_CSV = "oldfilese/PokemonData.csv"
+
+# Repeats the CSV rows until the table has `rows` rows
+def expand_table(rows):
+    base = Table.from_csv(TABLE_CSV)
+    return Table.from_lists({
+        name: (base.data_type(name), list(islice(cycle(base.values(name)), rows)))
+        for name in base.column_names()
+    })
+
+def naive_filter(records):
+    return [record for record in records if record["Generation"] <= 3]
+
+def naive_sort(records):
+    projected = [{"Name": record["Name"], "Attack": record["Attack"]} for record in records]
+    projected.sort(key=lambda record: record["Attack"])
+    return projected
+
+def naive_group_mean(records):
+    totals, counts = defaultdict(int), defaultdict(int)
+    for record in records:
+        if record["Generation"] <= 3:
+            totals[record["Type1"]] += record["Attack"]
+            counts[record["Type1"]] += 1
+    return {key: totals[key] / counts[key] for key in sorted(totals)}
+
+# Forces every lazily selected column of a query result
+def materialize(table):
+    return [table.values(name) for name in table.column_names()]
+
+# (operation, table query, equivalent row-dict loop)
+TABLE_QUERIES = [
+    ("filter", lambda t: materialize(t.filter(("Generation", "<=", 3))), naive_filter),
+    ("project_sort", lambda t: materialize(t.select("Name", "Attack").sort("Attack")), naive_sort),
+    ("group_mean", lambda t: t.filter(("Generation", "<=", 3)).group_by("Type1", "Attack", "mean"), naive_group_mean),
+]
+
+def run_table(rows, min_time):
+    table = expand_table(rows)
+    names = table.column_names()
+    records = [dict(zip(names, row)) for row in table.rows()]
+    results = []
+    for name, query, naive in TABLE_QUERIES:
+        timings = {}
+        for backend, state, op in (("Table", table, query), ("NaiveLoop", records, naive)):
+            calls, elapsed, peak = run_case(lambda: state, op, 1_000, min_time)
+            row = {
+                "backend": backend, "operation": name, "data_type": "mixed", "size": rows,
+                "calls": calls, "seconds": round(elapsed, 6),
+                "ops_per_sec": round(calls / elapsed, 2) if elapsed else None,
+                "items_per_sec": round(calls * rows / elapsed, 2) if elapsed else None,
+                "peak_kib": round(peak / 1024, 1),
+            }
+            results.append(row)
+            print_row(row)
+            timings[backend] = row["ops_per_sec"]
+        if timings["Table"] and timings["NaiveLoop"]:
+            print(f"{'':<13} {name:<25} columnar speedup {timings['Table'] / timings['NaiveLoop']:.1f}x")
+    return results
+
+# ---- Startup: import time in a fresh interpreter ----
+
+# Headless modules first; the GUI modules pull in customtkinter / Tk
+STARTUP_MODULES = ["mita_backend", "array_backend", "table", "test", "teststs"]
+
+def time_import(statement, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# Best-of-`repeats` import time per module, minus the bare interpreter start
+def run_startup(repeats=5):
+    interpreter = time_import("pass", repeats)
+    results = []
+    for module in STARTUP_MODULES:
+        elapsed = max(time_import(f"import {module}", repeats) - interpreter, 1e-6)
+        row = {
+            "backend": "startup", "operation": f"import {module}", "data_type": "-", "size": 1,
+            "calls": repeats, "seconds": round(elapsed, 6),
+            "ops_per_sec": round(1 / elapsed, 2), "items_per_sec": None, "peak_kib": 0.0,
+        }
+        results.append(row)
+        print(f"{'startup':<13} {'import ' + module:<25} {elapsed * 1000:>10.1f} ms")
+    return results
+
+# ---- Scan scaling: the same parallel scan at each worker count ----
+
+# 1, 2, 4, ... and the core count itself; 1 is the in-process path
+def worker_counts():
+    counts, workers = [], 1
+    while workers < PARALLEL_WORKERS:
+        counts.append(workers)
+        workers *= 2
+    return counts + [PARALLEL_WORKERS]
+
+# The untimed first call starts the pool and fills the shared segment, which
+# later calls reuse (as repeated scans of an unchanged array do)
+def run_scaling(rows, workers_list, min_time):
+    box = MitaInABox()
+    box.create_array(rows, make_payload("Integer", rows), "Integer")
+    buffer, results, serial = box.array.scan_buffer(), [], None
+    for workers in workers_list:
+        op = lambda storage, workers=workers: scan("sum", buffer, rows, workers=workers, share=storage.shared_buffer)
+        calls, elapsed, peak = run_case(lambda: box.array, op, 1_000, min_time)
+        row = {
+            "backend": "ParallelScan", "operation": f"sum workers={workers}", "data_type": "Integer", "size": rows,
+            "calls": calls, "seconds": round(elapsed, 6),
+            "ops_per_sec": round(calls / elapsed, 2) if elapsed else None,
+            "items_per_sec": round(calls * rows / elapsed, 2) if elapsed else None,
+            "peak_kib": round(peak / 1024, 1),
+        }
+        results.append(row)
+        print_row(row)
+        serial = serial or row["ops_per_sec"]
+        if serial and row["ops_per_sec"]:
+            print(f"{'':<13} {row['operation']:<25} speedup over 1 worker {row['ops_per_sec'] / serial:.2f}x")
+    return results
+
+# ---- Runner ----
+
+# The first call runs under tracemalloc for the peak; the rest are timed untraced
+def run_case(setup, op, max_calls, min_time):
+    state = setup()
+    tracemalloc.start()
+    op(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    calls, elapsed, batch = 0, 0.0, 1
+    max_calls -= 1
+    while calls < max_calls and elapsed < min_time:
+        batch = min(batch, max_calls - calls)
+        start = time.perf_counter()
+        for _ in range(batch):
+            op(state)
+        elapsed += time.perf_counter() - start
+        calls += batch
+        batch *= 2
+    return calls, elapsed, peak
+
+def run_all(backends, data_types, sizes, min_time):
+    results = []
+    for size in sizes:
+        for data_type in data_types:
+            payload = make_payload(data_type, size)
+            for backend in backends:
+                for name, setup, op, max_calls, items in BACKENDS[backend](data_type, size, payload):
+                    calls, elapsed, peak = run_case(setup, op, max_calls, min_time)
+                    row = {
+                        "backend": backend, "operation": name, "data_type": data_type, "size": size,
+                        "calls": calls, "seconds": round(elapsed, 6),
+                        "ops_per_sec": round(calls / elapsed, 2) if elapsed else None,
+                        "items_per_sec": round(calls * items / elapsed, 2) if elapsed else None,
+                        "peak_kib": round(peak / 1024, 1),
+                    }
+                    results.append(row)
+                    print_row(row)
+    return results
+
+def print_row(row):
+    rate = f"{row['ops_per_sec']:>14,.1f}" if row["ops_per_sec"] else f"{'-':>14}"
+    print(f"{row['backend']:<13} {row['operation']:<25} {row['data_type']:<8} {row['size']:>11,}  "
+          f"{rate} ops/s  {row['peak_kib']:>11,.1f} KiB peak")
+
+# ---- Baseline comparison ----
+
+def case_key(row):
+    return (row["backend"], row["operation"], row["data_type"], row["size"])
+
+def compare(results, baseline, tolerance):
+    previous = {case_key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get(case_key(row))
+        if not old or not old.get("ops_per_sec") or not row["ops_per_sec"]:
+            continue
+        change = row["ops_per_sec"] / old["ops_per_sec"] - 1
+        if change < -tolerance:
+            regressions.append((row, old, change))
+
+    for row, old, change in regressions:
+        print(f"REGRESSION {row['backend']} {row['operation']} {row['data_type']} n={row['size']:,}: "
+              f"{old['ops_per_sec']:,.1f} -> {row['ops_per_sec']:,.1f} ops/s ({change:+.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MitaInABox and ArrayBackend without Tk.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--types", nargs="+", choices=DATA_TYPES, default=DATA_TYPES)
+    parser.add_argument("--backends", nargs="*", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--table-rows", type=int, nargs="?", const=1_000_000, help="also benchmark Table queries on this many rows")
+    parser.add_argument("--startup", action="store_true", help="also time importing each module in a fresh interpreter")
+    parser.add_argument("--scan-rows", type=int, nargs="?", const=1 << 23, help="also time parallel scans of this many rows")
+    parser.add_argument("--scan-workers", type=int, nargs="+", default=worker_counts(), help="worker counts for --scan-rows")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent timing each case")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.backends, args.types, args.sizes, args.min_time)
+    if args.table_rows:
+        results += run_table(args.table_rows, args.min_time)
+    if args.startup:
+        results += run_startup()
+    if args.scan_rows:
+        results += run_scaling(args.scan_rows, args.scan_workers, args.min_time)
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {len(results)} results to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"ERROR: no baseline at {args.baseline}, so nothing was compared "
+              f"(run with --save-baseline to create one)", file=sys.stderr)
+        return 2
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2049 @@
+import copy
+import csv
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import closing
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import accumulate, compress, islice, repeat
+from operator import itemgetter, le, methodcaller
+from types import MappingProxyType
+
+from parallel_scan import SCAN_OPERATORS, SCANS, SharedBuffer, scan
+
+# MitaInABox and its storages, with no GUI dependencies: scripts, benchmarks
+# and the Table engine import this module without loading Tk. The visualizer
+# in test.py is the GUI entry point built on top of it.
+
+
+# ==========================================
+#          TYPED STORAGE BACKENDS
+# ==========================================
+
+# Token tables shared by the converters and the bulk parser (read-only)
+INTEGER_TOKEN = re.compile(r"-?\d+")
+BOOLEAN_TOKENS = MappingProxyType({
+    'true': True, '1': True, 'yes': True, 'on': True, 't': True, 'y': True,
+    'false': False, '0': False, 'no': False, 'off': False, 'f': False, 'n': False,
+})
+BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+# Tokens converted between progress reports (also lets other threads take the GIL)
+BULK_CHUNK = 65536
+
+# Pending change records beyond this collapse into a single full reset
+CHANGE_LOG_LIMIT = 1000
+
+# Growth factors accepted by MitaInABox.set_growth_policy
+GROWTH_FACTORS = {"2x": 2.0, "1.5x": 1.5, "golden": (1 + 5 ** 0.5) / 2}
+
+# Undo history: byte budget, what to evict first when it is exceeded, and how
+# many entries apart snapshots are taken (0 turns snapshots off)
+HISTORY_LIMIT = 64 * 1024 * 1024
+HISTORY_POLICIES = ["drop-oldest", "drop-snapshots"]
+HISTORY_SNAPSHOT_EVERY = 256
+HISTORY_ENTRY_BYTES = 120 # Rough footprint of one journal entry tuple
+
+# Saved array files: a 24-byte header followed by the raw storage payload.
+#   header   magic, version, type code, byte order (0 little / 1 big), capacity, length
+#   array    length * item (int64 for Integer, float64 for Float, ...)
+#   bits     (length + 7) // 8 bytes of packed bits, LSB first
+#   fixed    length * width bytes
+#   heap     (length + 1) * int64 offsets into the UTF-8 heap, then the heap
+# The type code is the registered DataType.code; the layout follows from the type.
+ARRAY_FILE_MAGIC = b"MITA"
+ARRAY_FILE_VERSION = 1
+ARRAY_FILE_HEADER = struct.Struct("<4sBBBxqq")
+
+# Per-type converters behind MitaInABox.validate_and_convert; each returns
+# (is_valid, value). Values that already have the right type skip the parsing.
+def convert_integer(value):
+    if type(value) is int:
+        return True, value
+    text = (value if type(value) is str else str(value)).strip()
+    # isdecimal accepts exactly the digits int() does, without a regex
+    if text.isdecimal() or (text[:1] == "-" and text[1:].isdecimal()):
+        try:
+            return True, int(text)
+        except ValueError: # Beyond sys.get_int_max_str_digits()
+            pass
+    return False, None
+
+def convert_boolean(value):
+    if type(value) is bool:
+        return True, value
+    flag = BOOLEAN_TOKENS.get((value if type(value) is str else str(value)).strip().lower())
+    return (False, None) if flag is None else (True, flag)
+
+def convert_string(value): # Accepts anything
+    return True, (value if type(value) is str else str(value)).strip()
+
+def convert_float(value):
+    if type(value) is float:
+        return math.isfinite(value), value
+    try:
+        number = float((value if type(value) is str else str(value)).strip())
+    except ValueError:
+        return False, None
+    return (True, number) if math.isfinite(number) else (False, None) # inf / nan would break ordering
+
+DECIMAL_PLACES = 4
+DECIMAL_QUANTUM = Decimal(1).scaleb(-DECIMAL_PLACES)
+DECIMAL_LIMIT = Decimal(2 ** 63 - 1).scaleb(-DECIMAL_PLACES)
+
+# Decimals keep up to DECIMAL_PLACES fraction digits exactly; more digits are rejected, not rounded
+def convert_decimal(value):
+    try:
+        number = value if type(value) is Decimal else Decimal((value if type(value) is str else str(value)).strip())
+        fixed = number.quantize(DECIMAL_QUANTUM)
+    except InvalidOperation:
+        return False, None
+    if fixed != number or abs(fixed) > DECIMAL_LIMIT:
+        return False, None
+    return True, fixed
+
+# Dates are written as ISO 8601 (YYYY-MM-DD)
+def convert_date(value):
+    if type(value) is date:
+        return True, value
+    try:
+        return True, date.fromisoformat((value if type(value) is str else str(value)).strip())
+    except ValueError:
+        return False, None
+
+# ---- Data type registry ----
+# A DataType declares how input is parsed, how values are laid out in memory and
+# in saved files, and how the GUIs show them. Layouts:
+#   "array"  fixed-width numbers in an array(typecode); encode / decode map values
+#            to the stored numbers when they differ (date ordinals, scaled decimals)
+#   "bits"   packed booleans
+#   "heap"   UTF-8 strings behind an offsets table
+#   "fixed"  byte strings of `width` bytes (shorter ones are NUL padded)
+class DataType:
+    def __init__(self, name, code, parse, layout, display=str, typecode=None, width=0, encode=None, decode=None,
+                 summable=False):
+        self.name = name
+        self.code = code # Type code in saved files, unique per type
+        self.parse = parse
+        self.layout = layout
+        self.display = display
+        self.typecode = typecode
+        self.width = width
+        self.encode = encode
+        self.decode = decode
+        self.summable = summable # Adding elements makes sense (MitaInABox.sum_values)
+
+    # Bytes a saved array of this type needs after the header (heap types: up to the heap)
+    def payload_size(self, length):
+        if self.layout == "array":
+            return array(self.typecode).itemsize * length
+        if self.layout == "bits":
+            return (length + 7) >> 3
+        if self.layout == "fixed":
+            return self.width * length
+        return 8 * (length + 1)
+
+DATA_TYPES = {} # name -> DataType, in menu order
+
+def register_type(data_type):
+    clash = next((other for other in DATA_TYPES.values() if other.code == data_type.code and other.name != data_type.name), None)
+    if clash:
+        raise ValueError(f"type code {data_type.code} is already used by {clash.name}")
+    DATA_TYPES[data_type.name] = data_type
+    return data_type
+
+# Unknown names behave as String, like the original if/elif chain did
+def type_info(name):
+    return DATA_TYPES.get(name) or DATA_TYPES["String"]
+
+# A byte-string type of exactly `width` bytes; text input is stored as UTF-8
+def fixed_bytes_type(width, code):
+    def parse(value):
+        if type(value) is not bytes:
+            value = (value if type(value) is str else str(value)).strip().encode("utf-8")
+        return (True, value) if len(value) <= width and not value.endswith(b"\0") else (False, None)
+    return DataType(f"Bytes{width}", code, parse, "fixed", width=width,
+                    display=lambda value: value.decode("utf-8", "backslashreplace"))
+
+register_type(DataType("String", 2, convert_string, "heap"))
+register_type(DataType("Integer", 0, convert_integer, "array", typecode="q", summable=True))
+register_type(DataType("Boolean", 1, convert_boolean, "bits"))
+register_type(DataType("Float", 3, convert_float, "array", typecode="d", display=repr, summable=True))
+register_type(DataType("Decimal", 4, convert_decimal, "array", typecode="q",
+                       encode=lambda value: int(value.scaleb(DECIMAL_PLACES)),
+                       decode=lambda number: Decimal(number).scaleb(-DECIMAL_PLACES), summable=True))
+register_type(DataType("Date", 5, convert_date, "array", typecode="i", display=date.isoformat,
+                       encode=date.toordinal, decode=date.fromordinal))
+register_type(fixed_bytes_type(16, 6))
+
+# Fixed-size slot buffer bookkeeping shared by the typed storages.
+# Elements live in the first `size` slots; when every slot is taken the
+# buffer is reallocated and the copy is counted in the growth stats.
+class SlotStorage:
+    def __init__(self):
+        self.size = 0
+        self.reallocations = 0
+        self.bytes_moved = 0
+        self.shared = None # SharedBuffer copy of the elements for parallel scans, until the next write
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self[i]
+
+    def _check(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("storage index out of range")
+        return index
+
+    # Clamps an insert position the same way list.insert does
+    def _clamp(self, index):
+        if index < 0:
+            index += self.size
+        return max(0, min(index, self.size))
+
+    # Fallback growth when an append overflows without a resize request
+    def _make_room(self):
+        if self.size >= self.slots:
+            self.reserve(max(1, self.slots * 2))
+
+    # Reallocates the buffer to `slots` (never below the current length)
+    def reserve(self, slots):
+        slots = max(slots, self.size)
+        if slots != self.slots:
+            self.bytes_moved += self._reallocate(slots)
+            self.reallocations += 1
+
+    def tolist(self):
+        return list(self)
+
+    # Elements at the given in-range positions, in that order (for gathering a row selection)
+    def take(self, positions):
+        return list(map(self.__getitem__, positions))
+
+    # Insert position for value when the elements are in ascending order
+    def bisect(self, value, right=False):
+        return (bisect_right if right else bisect_left)(self, value, 0, self.size)
+
+    # Independent copy (buffers duplicated at C speed), for copy-on-write
+    def copy(self):
+        clone = copy.copy(self)
+        clone.shared = None
+        for name in self.BUFFERS:
+            setattr(clone, name, getattr(self, name)[:])
+        return clone
+
+    # Typed buffer whose first len(self) items are the elements as stored
+    # (encoded for coded types), for parallel_scan; None when there is none
+    def scan_buffer(self):
+        return None
+
+    # The scan buffer copied into shared memory, made by the first parallel scan
+    # and reused by later ones; storages that can be written call _unshare first
+    def shared_buffer(self):
+        if self.shared is None:
+            self.shared = SharedBuffer(self.scan_buffer(), self.size)
+        return self.shared
+
+    def _unshare(self):
+        self.shared.release()
+        self.shared = None
+
+# Packs numbers into a machine array (8 bytes per Integer instead of a boxed int)
+class ArrayStorage(SlotStorage):
+    BUFFERS = ("buf",)
+
+    def __init__(self, typecode, items=(), slots=0):
+        super().__init__()
+        self.typecode = typecode
+        if iter(items) is items: # A one-shot iterator would be used up by the failed array() call
+            items = list(items)
+        try:
+            self.buf = array(typecode, items)
+        except OverflowError:
+            self.buf = list(items)
+        self.size = len(self.buf)
+        self.buf.extend(self._blank(slots - self.size))
+
+    @property
+    def slots(self):
+        return len(self.buf)
+
+    def _blank(self, count):
+        count = max(count, 0)
+        if isinstance(self.buf, array):
+            return array(self.typecode, bytes(self.buf.itemsize * count))
+        return [0] * count
+
+    def _reallocate(self, slots):
+        old = self.buf
+        self.buf = self._blank(slots)
+        self.buf[:self.size] = old[:self.size]
+        return self.size * (old.itemsize if isinstance(old, array) else 8)
+
+    def __iter__(self):
+        return iter(self.buf[:self.size])
+
+    def __getitem__(self, index):
+        return self.buf[self._check(index)]
+
+    def __setitem__(self, index, value):
+        self._put(self._check(index), value)
+
+    # Values that do not fit the typecode (e.g. ints beyond 64 bits) fall back to a list
+    def _put(self, position, value):
+        if self.shared is not None:
+            self._unshare()
+        try:
+            self.buf[position] = value
+        except OverflowError:
+            self.buf = list(self.buf)
+            self.buf[position] = value
+
+    def append(self, value):
+        self._make_room()
+        self._put(self.size, value)
+        self.size += 1
+
+    def insert(self, index, value):
+        index = self._clamp(index)
+        self._make_room()
+        self.buf[index + 1:self.size + 1] = self.buf[index:self.size]
+        self._put(index, value)
+        self.size += 1
+
+    def pop(self, index=-1):
+        index = self._check(index)
+        if self.shared is not None:
+            self._unshare()
+        removed = self.buf[index]
+        self.buf[index:self.size - 1] = self.buf[index + 1:self.size]
+        self.size -= 1
+        self.buf[self.size] = 0
+        return removed
+
+    def index(self, value):
+        return self.buf.index(value, 0, self.size)
+
+    def bisect(self, value, right=False):
+        return (bisect_right if right else bisect_left)(self.buf, value, 0, self.size)
+
+    def clear(self):
+        if self.shared is not None:
+            self._unshare()
+        self.buf[:self.size] = self._blank(self.size)
+        self.size = 0
+
+    def tolist(self):
+        return list(self.buf[:self.size])
+
+    def take(self, positions):
+        return list(map(self.buf.__getitem__, positions))
+
+    def nbytes(self):
+        if isinstance(self.buf, array):
+            return self.buf.itemsize * len(self.buf)
+        return 8 * len(self.buf) + sum(item.__sizeof__() for item in self.buf[:self.size])
+
+    def buffers(self):
+        if not isinstance(self.buf, array):
+            raise OverflowError("integers beyond 64 bits cannot be saved")
+        return [memoryview(self.buf)[:self.size]]
+
+    def scan_buffer(self):
+        return self.buf if isinstance(self.buf, array) else None
+
+# Array storage for types kept as numbers: values are encoded on the way in
+# and decoded on the way out (dates as day ordinals, decimals as scaled integers)
+class CodedArrayStorage(ArrayStorage):
+    def __init__(self, info, items=(), slots=0):
+        self.encode, self.decode = info.encode, info.decode
+        super().__init__(info.typecode, map(info.encode, items), slots)
+
+    def __iter__(self):
+        return map(self.decode, super().__iter__())
+
+    def __getitem__(self, index):
+        return self.decode(super().__getitem__(index))
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, self.encode(value))
+
+    def append(self, value):
+        super().append(self.encode(value))
+
+    def insert(self, index, value):
+        super().insert(index, self.encode(value))
+
+    def pop(self, index=-1):
+        return self.decode(super().pop(index))
+
+    def index(self, value):
+        return super().index(self.encode(value))
+
+    # Encoding keeps the order, so bisecting the stored numbers is enough
+    def bisect(self, value, right=False):
+        return super().bisect(self.encode(value), right)
+
+    def tolist(self):
+        return list(map(self.decode, super().tolist()))
+
+    def take(self, positions):
+        return list(map(self.decode, super().take(positions)))
+
+# Byte strings of one fixed width packed back to back (NUL padded)
+class FixedBytesStorage(SlotStorage):
+    BUFFERS = ("buf",)
+
+    def __init__(self, width, items=(), slots=0):
+        super().__init__()
+        self.width = width
+        items = [item.ljust(width, b"\0") for item in items]
+        self.size = len(items)
+        self.buf = bytearray(b"".join(items))
+        self.buf.extend(bytes(width * max(slots - self.size, 0)))
+
+    @property
+    def slots(self):
+        return len(self.buf) // self.width
+
+    def _reallocate(self, slots):
+        old, used = self.buf, self.size * self.width
+        self.buf = bytearray(slots * self.width)
+        self.buf[:used] = old[:used]
+        return used
+
+    def __getitem__(self, index):
+        start = self._check(index) * self.width
+        return bytes(self.buf[start:start + self.width]).rstrip(b"\0")
+
+    def __setitem__(self, index, value):
+        start = self._check(index) * self.width
+        self.buf[start:start + self.width] = value.ljust(self.width, b"\0")
+
+    def append(self, value):
+        self._make_room()
+        self.size += 1
+        self[self.size - 1] = value
+
+    def insert(self, index, value):
+        index = self._clamp(index)
+        self._make_room()
+        start, used, width = index * self.width, self.size * self.width, self.width
+        self.buf[start + width:used + width] = self.buf[start:used]
+        self.size += 1
+        self[index] = value
+
+    def pop(self, index=-1):
+        index = self._check(index)
+        removed = self[index]
+        start, used, width = index * self.width, self.size * self.width, self.width
+        self.buf[start:used - width] = self.buf[start + width:used]
+        self.buf[used - width:used] = bytes(width)
+        self.size -= 1
+        return removed
+
+    def index(self, value):
+        slot = find_aligned(self.buf, value.ljust(self.width, b"\0"), 0, self.size * self.width)
+        if slot == -1:
+            raise ValueError(f"{value!r} is not in storage")
+        return slot
+
+    def clear(self):
+        self.buf[:self.size * self.width] = bytes(self.size * self.width)
+        self.size = 0
+
+    def nbytes(self):
+        return len(self.buf)
+
+    def buffers(self):
+        return [memoryview(self.buf)[:self.size * self.width]]
+
+# Slot of the first item-aligned match of pattern (one item wide) in data[start:end]
+def find_aligned(data, pattern, start, end):
+    width = len(pattern)
+    pos = data.find(pattern, start, end)
+    while pos != -1 and (pos - start) % width:
+        pos = data.find(pattern, pos + 1, end)
+    return -1 if pos == -1 else (pos - start) // width
+
+# Packs booleans into a bitset (1 bit per element, unused bits kept at zero)
+class BitStorage(SlotStorage):
+    BUFFERS = ("bits",)
+
+    def __init__(self, items=(), slots=0):
+        super().__init__()
+        # Packs all initial flags at once through a binary digit string
+        digits = bytes(map(bool, items))[::-1].translate(BIT_DIGITS)
+        self.size = len(digits)
+        self.bits = bytearray((max(slots, self.size) + 7) >> 3)
+        self._store_int(int(digits, 2) if digits else 0)
+
+    @property
+    def slots(self):
+        return len(self.bits) * 8
+
+    def _reallocate(self, slots):
+        old = self.bits
+        self.bits = bytearray((slots + 7) >> 3)
+        used = (self.size + 7) >> 3
+        self.bits[:used] = old[:used]
+        return used
+
+    def __iter__(self):
+        bits = self.bits
+        for i in range(self.size):
+            yield bool(bits[i >> 3] >> (i & 7) & 1)
+
+    def __getitem__(self, index):
+        index = self._check(index)
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def __setitem__(self, index, value):
+        index = self._check(index)
+        if value:
+            self.bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def append(self, value):
+        self._make_room()
+        self.size += 1
+        self[self.size - 1] = value
+
+    # Mid-array edits shift the tail as one big integer instead of bit by bit
+    def _as_int(self):
+        return int.from_bytes(self.bits, "little")
+
+    def _store_int(self, value):
+        self.bits[:] = value.to_bytes(len(self.bits), "little")
+
+    def insert(self, index, value):
+        index = self._clamp(index)
+        self._make_room()
+        value_bits = self._as_int()
+        low = value_bits & ((1 << index) - 1)
+        high = value_bits >> index
+        self.size += 1
+        self._store_int(low | (int(bool(value)) << index) | (high << (index + 1)))
+
+    def pop(self, index=-1):
+        index = self._check(index)
+        removed = self[index]
+        value_bits = self._as_int()
+        low = value_bits & ((1 << index) - 1)
+        high = value_bits >> (index + 1)
+        self.size -= 1
+        self._store_int(low | (high << index))
+        return removed
+
+    def index(self, value):
+        value_bits = self._as_int()
+        if not value:
+            value_bits = ~value_bits & ((1 << self.size) - 1)
+        if value_bits == 0:
+            raise ValueError(f"{value!r} is not in storage")
+        return (value_bits & -value_bits).bit_length() - 1
+
+    def clear(self):
+        self.bits[:] = bytes(len(self.bits))
+        self.size = 0
+
+    def nbytes(self):
+        return len(self.bits)
+
+    def buffers(self):
+        return [memoryview(self.bits)[:(self.size + 7) >> 3]]
+
+# Stores strings back to back in one UTF-8 heap; the slot buffer is the offsets table
+class StringStorage(SlotStorage):
+    BUFFERS = ("heap", "offsets")
+
+    def __init__(self, items=(), slots=0):
+        super().__init__()
+        encoded = list(map(methodcaller("encode", "utf-8", "surrogatepass"), items))
+        self.heap = bytearray(b"".join(encoded))
+        self.offsets = array("q", [0])
+        self.offsets.extend(accumulate(map(len, encoded)))
+        self.size = len(encoded)
+        self.offsets.extend(bytes(8 * max(slots - self.size, 0)))
+
+    @property
+    def slots(self):
+        return len(self.offsets) - 1
+
+    def _reallocate(self, slots):
+        old = self.offsets
+        self.offsets = array("q", bytes(8 * (slots + 1)))
+        self.offsets[:self.size + 1] = old[:self.size + 1]
+        return 8 * (self.size + 1)
+
+    def __getitem__(self, index):
+        index = self._check(index)
+        return self.heap[self.offsets[index]:self.offsets[index + 1]].decode("utf-8", "surrogatepass")
+
+    # Slices the heap directly; an ASCII heap decodes once, as its byte offsets are then character offsets
+    def tolist(self):
+        bounds = zip(self.offsets[:self.size], islice(self.offsets, 1, self.size + 1))
+        if self.heap.isascii():
+            text = self.heap.decode("ascii")
+            return [text[start:end] for start, end in bounds]
+        heap = self.heap
+        return [heap[start:end].decode("utf-8", "surrogatepass") for start, end in bounds]
+
+    def take(self, positions):
+        offsets = self.offsets
+        if self.heap.isascii():
+            text = self.heap.decode("ascii")
+            return [text[offsets[i]:offsets[i + 1]] for i in positions]
+        heap = self.heap
+        return [heap[offsets[i]:offsets[i + 1]].decode("utf-8", "surrogatepass") for i in positions]
+
+    def __setitem__(self, index, value):
+        index = self._check(index)
+        encoded = value.encode("utf-8", "surrogatepass")
+        start, end = self.offsets[index], self.offsets[index + 1]
+        self.heap[start:end] = encoded
+        self._shift(index + 1, index + 1, len(encoded) - (end - start))
+
+    # Moves offsets[src:size + 1] to start at dst, adding delta to each
+    def _shift(self, src, dst, delta):
+        offsets = self.offsets
+        tail = offsets[src:self.size + 1]
+        if delta:
+            tail = array("q", [offset + delta for offset in tail])
+        offsets[dst:dst + len(tail)] = tail
+
+    def append(self, value):
+        self._make_room()
+        self.heap += value.encode("utf-8", "surrogatepass")
+        self.size += 1
+        self.offsets[self.size] = len(self.heap)
+
+    def insert(self, index, value):
+        index = self._clamp(index)
+        self._make_room()
+        encoded = value.encode("utf-8", "surrogatepass")
+        start = self.offsets[index]
+        self.heap[start:start] = encoded
+        self._shift(index + 1, index + 2, len(encoded))
+        self.offsets[index + 1] = start + len(encoded)
+        self.size += 1
+
+    def pop(self, index=-1):
+        index = self._check(index)
+        removed = self[index]
+        start, end = self.offsets[index], self.offsets[index + 1]
+        del self.heap[start:end]
+        self._shift(index + 2, index + 1, start - end)
+        self.size -= 1
+        return removed
+
+    def index(self, value):
+        slot = find_in_heap(self.heap, self.offsets, self.size, value.encode("utf-8", "surrogatepass"))
+        if slot == -1:
+            raise ValueError(f"{value!r} is not in storage")
+        return slot
+
+    def clear(self):
+        self.heap = bytearray()
+        self.size = 0
+
+    def nbytes(self):
+        return len(self.heap) + self.offsets.itemsize * len(self.offsets)
+
+    def buffers(self):
+        return [memoryview(self.offsets)[:self.size + 1], self.heap]
+
+# Finds an encoded string in a heap laid out by offsets (relative to `base`);
+# only byte matches that line up with element bounds count
+def find_in_heap(heap, offsets, size, encoded, base=0):
+    top, end = size + 1, base + offsets[size]
+    pos = heap.find(encoded, base, end)
+    while pos != -1:
+        start = pos - base
+        # Empty elements share their start offset with the next one, so pick the right slot
+        slot = bisect_left(offsets, start, 0, top) if not encoded else bisect_right(offsets, start, 0, top) - 1
+        if slot < size and offsets[slot] == start and offsets[slot + 1] - start == len(encoded):
+            return slot
+        if pos >= end:
+            break # mmap.find clamps a start past the end instead of failing
+        pos = heap.find(encoded, pos + 1, end)
+    return -1
+
+# Read-only view of a saved array file. Elements are decoded straight from the
+# mapping when asked for, so only the pages that are touched get read from disk.
+# MitaInABox swaps in a regular storage (materialize) before the first write.
+class MappedStorage(SlotStorage):
+    def __init__(self, data_type, mapped, capacity, length, start):
+        super().__init__()
+        self.data_type = data_type
+        self.info = info = type_info(data_type)
+        self.mapped = mapped
+        self.capacity = capacity
+        self.size = length
+        self.start = start # Payload offset in the file
+        view = memoryview(mapped)[start:]
+        if info.layout == "array":
+            self.items = view[:info.payload_size(length)].cast(info.typecode)
+        elif info.layout == "bits":
+            self.bits = view[:info.payload_size(length)]
+        elif info.layout == "fixed":
+            self.items = view[:info.payload_size(length)]
+        else:
+            self.offsets = view[:8 * (length + 1)].cast("q")
+            self.heap_start = start + 8 * (length + 1)
+            self.heap = view[8 * (length + 1):]
+
+    @property
+    def slots(self):
+        return self.capacity
+
+    def __getitem__(self, index):
+        index = self._check(index)
+        layout = self.info.layout
+        if layout == "array":
+            value = self.items[index]
+            return self.info.decode(value) if self.info.decode else value
+        if layout == "bits":
+            return bool(self.bits[index >> 3] >> (index & 7) & 1)
+        if layout == "fixed":
+            width = self.info.width
+            return bytes(self.items[index * width:(index + 1) * width]).rstrip(b"\0")
+        return str(self.heap[self.offsets[index]:self.offsets[index + 1]], "utf-8", "surrogatepass")
+
+    def __iter__(self):
+        if self.info.layout == "array":
+            return map(self.info.decode, self.items) if self.info.decode else iter(self.items)
+        return super().__iter__()
+
+    def tolist(self):
+        if self.info.layout == "array" and not self.info.decode:
+            return self.items.tolist()
+        return list(self)
+
+    # Scans the mapping at C speed instead of decoding element by element
+    def index(self, value):
+        info = self.info
+        if info.layout == "array" and info.typecode != "d":
+            stored = info.encode(value) if info.encode else value
+            try:
+                pattern = array(info.typecode, [stored]).tobytes()
+            except OverflowError:
+                raise ValueError(f"{value!r} is not in storage") from None # Cannot be stored, so cannot be present
+            slot = find_aligned(self.mapped, pattern, self.start, self.start + info.payload_size(self.size))
+        elif info.layout == "fixed":
+            slot = find_aligned(self.mapped, value.ljust(info.width, b"\0"), self.start, self.start + info.payload_size(self.size))
+        elif info.layout == "bits":
+            return BitStorage.index(self, value)
+        elif info.layout == "heap":
+            slot = find_in_heap(self.mapped, self.offsets, self.size, value.encode("utf-8", "surrogatepass"), self.heap_start)
+        else:
+            return self.tolist().index(value) # Floats: 0.0 and -0.0 are equal but differ in bytes
+        if slot == -1:
+            raise ValueError(f"{value!r} is not in storage")
+        return slot
+
+    # BitStorage.index reads the packed bits through this
+    def _as_int(self):
+        return int.from_bytes(self.bits, "little")
+
+    # Copies the elements into a regular, writable storage
+    def materialize(self, kind="contiguous"):
+        return new_storage(self.data_type, self.tolist(), self.capacity, kind)
+
+    # Unmaps the file; the views must be released first or mmap refuses to close
+    def close(self):
+        if self.shared is not None:
+            self._unshare()
+        for name in ("items", "bits", "offsets", "heap"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.mapped.close()
+
+    def nbytes(self):
+        return 0 # Pages belong to the OS file cache, not the process heap
+
+    def buffers(self):
+        if self.info.layout == "bits":
+            return [self.bits]
+        if self.info.layout == "heap":
+            return [self.offsets, self.heap]
+        return [self.items]
+
+    def scan_buffer(self):
+        return self.items if self.info.layout == "array" else None
+
+# Checks an array file's header and wraps the mapping; (False, message) when it is not usable
+def map_array_file(mapped):
+    if len(mapped) < ARRAY_FILE_HEADER.size:
+        return False, "Not an array file"
+    magic, version, type_code, big_endian, capacity, length = ARRAY_FILE_HEADER.unpack_from(mapped)
+    info = next((info for info in DATA_TYPES.values() if info.code == type_code), None)
+    if magic != ARRAY_FILE_MAGIC or version != ARRAY_FILE_VERSION:
+        return False, "Not an array file"
+    if info is None:
+        return False, f"Unknown data type code {type_code}"
+    if big_endian != (sys.byteorder == "big"):
+        return False, "File was saved with a different byte order"
+
+    start = ARRAY_FILE_HEADER.size
+    if length > capacity or len(mapped) < start + info.payload_size(length):
+        return False, "File is truncated"
+    storage = MappedStorage(info.name, mapped, capacity, length, start)
+    if info.layout == "heap" and storage.offsets[length] > len(storage.heap):
+        storage.close()
+        return False, "File is truncated"
+    return True, storage
+
+# Gap buffer: the free slots sit between the two halves of the elements, wherever
+# the last edit happened. Inserts and deletes only move the elements between the
+# old and new edit position, so edits clustered around a cursor are O(1) amortized
+# instead of shifting the whole tail. Plain numeric types stay in a machine
+# array; other types are held as Python objects.
+class GapStorage(SlotStorage):
+    BUFFERS = ("buf",)
+
+    def __init__(self, data_type, items=(), slots=0):
+        super().__init__()
+        self.data_type = data_type
+        info = type_info(data_type)
+        self.typecode = info.typecode if info.layout == "array" and not info.encode else None
+        items = list(items)
+        self.size = len(items)
+        self.buf = self._blank(max(slots, self.size))
+        self._fill(0, items)
+        self.gap_start, self.gap_end = self.size, len(self.buf)
+
+    @property
+    def slots(self):
+        return len(self.buf)
+
+    def _blank(self, count):
+        if self.typecode:
+            return array(self.typecode, bytes(array(self.typecode).itemsize * count))
+        return [None] * count
+
+    # Writes items at position, switching to a list when an integer overflows the array
+    def _fill(self, position, items):
+        try:
+            self.buf[position:position + len(items)] = array(self.typecode, items) if isinstance(self.buf, array) else items
+        except OverflowError:
+            self.buf = list(self.buf)
+            self.buf[position:position + len(items)] = items
+
+    def _reallocate(self, slots):
+        old, tail = self.buf, len(self.buf) - self.gap_end
+        self.buf = self._blank(slots) if isinstance(old, array) else [None] * slots
+        self.buf[:self.gap_start] = old[:self.gap_start]
+        self.buf[slots - tail:] = old[self.gap_end:]
+        self.gap_end = slots - tail
+        return self.size * (old.itemsize if isinstance(old, array) else 8)
+
+    def _position(self, index):
+        return index if index < self.gap_start else index + self.gap_end - self.gap_start
+
+    # Moves the gap so it starts at index, sliding only the elements in between
+    def _move_gap(self, index):
+        buf, start, end = self.buf, self.gap_start, self.gap_end
+        if index < start:
+            moved = start - index
+            buf[end - moved:end] = buf[index:start]
+            self.gap_start, self.gap_end = index, end - moved
+        elif index > start:
+            moved = index - start
+            buf[start:index] = buf[end:end + moved]
+            self.gap_start, self.gap_end = index, end + moved
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        return self.buf[self._position(self._check(index))]
+
+    def __setitem__(self, index, value):
+        position = self._position(self._check(index))
+        try:
+            self.buf[position] = value
+        except OverflowError:
+            self.buf = list(self.buf)
+            self.buf[position] = value
+
+    def append(self, value):
+        self.insert(self.size, value)
+
+    def insert(self, index, value):
+        index = self._clamp(index)
+        self._make_room()
+        self._move_gap(index)
+        self.gap_start += 1
+        self.size += 1
+        self[index] = value
+
+    def pop(self, index=-1):
+        index = self._check(index)
+        self._move_gap(index)
+        removed = self.buf[self.gap_end]
+        self.buf[self.gap_end] = 0 if isinstance(self.buf, array) else None
+        self.gap_end += 1
+        self.size -= 1
+        return removed
+
+    def index(self, value):
+        try:
+            return self.buf.index(value, 0, self.gap_start)
+        except ValueError:
+            return self.buf.index(value, self.gap_end) - (self.gap_end - self.gap_start)
+
+    def clear(self):
+        self.buf = self._blank(len(self.buf))
+        self.size, self.gap_start, self.gap_end = 0, 0, len(self.buf)
+
+    def tolist(self):
+        return list(self.buf[:self.gap_start]) + list(self.buf[self.gap_end:])
+
+    def nbytes(self):
+        if isinstance(self.buf, array):
+            return self.buf.itemsize * len(self.buf)
+        return 8 * len(self.buf) + sum(item.__sizeof__() for item in self.tolist())
+
+    # Saved files use the contiguous layouts
+    def buffers(self):
+        return new_storage(self.data_type, self.tolist(), self.size).buffers()
+
+# Storage layouts accepted by MitaInABox.create_array
+STORAGE_KINDS = ["contiguous", "gap"]
+
+# Picks the storage that matches a data type's layout: compact contiguous by
+# default, or a gap buffer for edit-heavy arrays
+def new_storage(data_type, items=(), slots=0, kind="contiguous"):
+    if kind == "gap":
+        return GapStorage(data_type, items, slots)
+    info = type_info(data_type)
+    if info.layout == "array":
+        if info.encode:
+            return CodedArrayStorage(info, items, slots)
+        return ArrayStorage(info.typecode, items, slots)
+    if info.layout == "bits":
+        return BitStorage(items, slots)
+    if info.layout == "fixed":
+        return FixedBytesStorage(info.width, items, slots)
+    return StringStorage(items, slots)
+
+# Splices (index, value) pairs sorted by index into items in one pass
+def merge_inserts(items, pairs):
+    merged, start = [], 0
+    for index, value in pairs:
+        merged.extend(items[start:index])
+        merged.append(value)
+        start = index
+    merged.extend(items[start:])
+    return merged
+
+def is_ordered(items):
+    return all(map(le, items, islice(items, 1, None)))
+
+# Drops sorted, distinct indices from items in one pass
+def drop_indices(items, indices):
+    kept, start = [], 0
+    for index in indices:
+        kept.extend(items[start:index])
+        start = index + 1
+    kept.extend(items[start:])
+    return kept
+
+# ---- CSV column streaming ----
+
+def csv_columns(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [name.strip() for name in next(csv.reader(f), [])]
+
+# Yields one column as lists of up to chunk_size stripped values. Rows are read
+# lazily through csv.reader, so memory stays flat however large the file is.
+def iter_csv_column(path, column, chunk_size=BULK_CHUNK):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = csv.reader(f)
+        header = [name.strip().lower() for name in next(rows, [])]
+        if column.strip().lower() not in header:
+            raise KeyError(column)
+        value = itemgetter(header.index(column.strip().lower()))
+        while True:
+            chunk = list(map(str.strip, map(value, islice(rows, chunk_size))))
+            if not chunk:
+                return
+            yield chunk
+
+# Narrowest data type every token fits: Integer, Float, Boolean, Date, then String
+def infer_data_type(tokens):
+    if tokens and all(map(INTEGER_TOKEN.fullmatch, tokens)):
+        return "Integer"
+    for name in ("Float", "Boolean", "Date"):
+        parse = DATA_TYPES[name].parse
+        if tokens and all(parse(token)[0] for token in tokens):
+            return name
+    return "String"
+
+# Maps each value to its first position so searches skip the linear scan.
+# Appends and in-place edits keep it current; shifting edits mark it stale
+# and the next lookup rebuilds it in one pass.
+class ValueIndex:
+    def __init__(self):
+        self.positions = {}
+        self.stale = True
+
+    def lookup(self, storage, value):
+        if self.stale:
+            values = storage.tolist()
+            self.positions = dict(zip(reversed(values), range(len(values) - 1, -1, -1)))
+            self.stale = False
+        return self.positions.get(value, -1)
+
+    def appended(self, value, position):
+        if not self.stale:
+            self.positions.setdefault(value, position)
+
+    def replaced(self, position, old_value, new_value):
+        if self.stale or old_value == new_value:
+            return
+        if self.positions.get(old_value) == position:
+            # The next occurrence of the old value is unknown without a scan
+            self.stale = True
+            return
+        if self.positions.get(new_value, position + 1) > position:
+            self.positions[new_value] = position
+
+    def removed_last(self, value, position):
+        if not self.stale and self.positions.get(value) == position:
+            del self.positions[value]
+
+    def invalidate(self):
+        self.stale = True
+
+    def reset(self):
+        self.positions = {}
+        self.stale = False
+
+# Append-only undo/redo journal. entries[:cursor] are applied and the rest can
+# be redone; the owner decides what an entry means and how to apply it.
+# Positions count every entry ever recorded, so they stay stable when the
+# oldest entries are evicted. Every `snapshot_every` entries the owner adds a
+# snapshot of its state, so reaching any position replays at most that many.
+class History:
+    def __init__(self, limit=HISTORY_LIMIT, policy="drop-oldest", snapshot_every=HISTORY_SNAPSHOT_EVERY):
+        self.entries = []
+        self.costs = [] # Approximate bytes held by each entry
+        self.cursor = 0
+        self.base = 0 # Entries evicted from the front
+        self.snapshots = {} # position -> (state, bytes)
+        self.bytes = 0
+        self.limit = limit
+        self.policy = policy
+        self.snapshot_every = snapshot_every
+
+    @property
+    def position(self):
+        return self.base + self.cursor
+
+    # Oldest and newest reachable positions
+    def first(self):
+        return self.base
+
+    def last(self):
+        return self.base + len(self.entries)
+
+    def record(self, entry, cost):
+        # Editing after an undo forks the timeline: the redo tail is dropped
+        if self.cursor < len(self.entries):
+            self.bytes -= sum(self.costs[self.cursor:])
+            del self.entries[self.cursor:], self.costs[self.cursor:]
+            for position in [position for position in self.snapshots if position > self.position]:
+                self._drop_snapshot(position)
+        self.entries.append(entry)
+        self.costs.append(cost)
+        self.bytes += cost
+        self.cursor += 1
+        self._evict()
+
+    def snapshot_due(self):
+        return bool(self.snapshot_every) and self.position % self.snapshot_every == 0 and self.position not in self.snapshots
+
+    # Skipped (False) when one snapshot would take over a quarter of the budget,
+    # since it would only push the entries it is meant to speed up out of the journal
+    def add_snapshot(self, state, cost):
+        if cost > self.limit // 4:
+            return False
+        self.snapshots[self.position] = (state, cost)
+        self.bytes += cost
+        self._evict()
+        return True
+
+    # Entry to reverse, moving the cursor back (None at the oldest position)
+    def undo(self):
+        if not self.cursor:
+            return None
+        self.cursor -= 1
+        return self.entries[self.cursor]
+
+    # Entry to re-apply, moving the cursor forward (None at the newest position)
+    def redo(self):
+        if self.cursor == len(self.entries):
+            return None
+        self.cursor += 1
+        return self.entries[self.cursor - 1]
+
+    # Closest starting point for reaching target: (snapshot state, its position)
+    # when restoring a snapshot replays fewer entries, else (None, current position)
+    def route(self, target):
+        start = max((position for position in self.snapshots if position <= target), default=None)
+        if start is not None and target - start < abs(target - self.position):
+            return self.snapshots[start][0], start
+        return None, self.position
+
+    # Moves the cursor without applying anything (after restoring a snapshot)
+    def seek(self, position):
+        self.cursor = position - self.base
+
+    def _drop_snapshot(self, position):
+        self.bytes -= self.snapshots.pop(position)[1]
+
+    # Over the limit, frees down to 3/4 of it so eviction does not run on every edit
+    def _evict(self):
+        if self.bytes <= self.limit:
+            return
+        target = self.limit * 3 // 4
+        if self.policy == "drop-snapshots":
+            for position in sorted(self.snapshots):
+                if self.bytes <= target:
+                    break
+                self._drop_snapshot(position)
+        dropped = 0
+        while self.bytes > target and dropped < self.cursor:
+            self.bytes -= self.costs[dropped]
+            dropped += 1
+        if dropped:
+            del self.entries[:dropped], self.costs[:dropped]
+            self.base += dropped
+            self.cursor -= dropped
+            for position in [position for position in self.snapshots if position < self.base]:
+                self._drop_snapshot(position)
+
+# ==========================================
+#            BACKEND ARRAY CLASS 
+# ==========================================
+
+class MitaInABox:
+    def __init__(self):
+        self.capacity = 0
+        self.data_type = "String" # Default data type (also picks the converter)
+        self.array = new_storage(self.data_type)
+        self.value_index = None # Optional ValueIndex for O(1) searches
+        self.growth_factor = GROWTH_FACTORS["2x"]
+        self.shrink_threshold = None # e.g. 0.25 shrinks once the array is a quarter full
+        self.change_log = None # Change records for incremental repaint, when tracked
+        self.keep_sorted = False # Sorted mode, see set_sorted
+        self.storage_kind = "contiguous" # One of STORAGE_KINDS, chosen at create_array
+        self.history = None # Undo/redo journal, see set_history
+        self.journal_group = None # Entries collected for one multi-step edit
+        self.frozen = None # Storage the journal or a clone still references; copied before its next edit
+
+    # Independent copy in O(1): both sides share the element storage and mark it
+    # frozen, so whichever edits it first copies it (see _writable). The clone
+    # keeps the settings but starts with an empty history and fresh index.
+    def clone(self):
+        twin = MitaInABox()
+        twin.capacity, twin.data_type, twin.array = self.capacity, self.data_type, self.array
+        twin.growth_factor, twin.shrink_threshold = self.growth_factor, self.shrink_threshold
+        twin.keep_sorted, twin.storage_kind = self.keep_sorted, self.storage_kind
+        if self.value_index is not None:
+            twin.set_indexing(True)
+        if self.change_log is not None:
+            twin.track_changes(True)
+        if self.history is not None:
+            twin.set_history(True, self.history.limit, self.history.policy, self.history.snapshot_every)
+        self.frozen = twin.frozen = self.array
+        return twin
+
+    # Setting the type resolves its converter once, so validation is a single call
+    @property
+    def data_type(self):
+        return self._data_type
+
+    @data_type.setter
+    def data_type(self, data_type):
+        self._data_type = data_type
+        self.converter = type_info(data_type).parse
+
+    # Text shown for one element (e.g. ISO dates, repr for floats)
+    def display(self, value):
+        return type_info(self.data_type).display(value)
+
+    # Change records: ("set", i), ("shift", i, delta) for slots [i, n) moving by delta,
+    # ("capacity", new_capacity), ("cleared", old_length) and ("reset",)
+    def track_changes(self, enabled):
+        self.change_log = [] if enabled else None
+
+    # Returns and forgets the records collected since the last call
+    def pop_changes(self):
+        if self.change_log is None:
+            return []
+        changes, self.change_log = self.change_log, []
+        return changes
+
+    def _record(self, *change):
+        log = self.change_log
+        if log is not None:
+            if len(log) >= CHANGE_LOG_LIMIT:
+                log[:] = [("reset",)]
+            log.append(change)
+
+    # Growth used by resize_and_insert: "2x", "1.5x", "golden" or a number above 1
+    def set_growth_policy(self, growth="2x", shrink_threshold=None):
+        factor = GROWTH_FACTORS.get(growth, growth)
+        if not isinstance(factor, (int, float)) or factor <= 1:
+            return False
+        self.growth_factor = factor
+        self.shrink_threshold = shrink_threshold
+        return True
+
+    # Sorted mode keeps the elements in ascending order: inserts find their slot by
+    # bisection, and search, bounds, counts and range queries run in O(log n).
+    # Edits that would break the order are rejected with "ORDER_ERROR".
+    def set_sorted(self, enabled):
+        before = self._state()
+        self.keep_sorted = enabled
+        if enabled:
+            items = self.array.tolist()
+            if not is_ordered(items):
+                items.sort()
+                self._replace_items(items)
+                self._record("reset")
+        if self._state() != before:
+            self._journal("replace", before, self._state())
+
+    # Turn the search index on or off (write-heavy arrays can skip it)
+    def set_indexing(self, enabled):
+        self.value_index = ValueIndex() if enabled else None
+
+    # ---- History: undo / redo ----
+
+    # Journals every edit so it can be undone. limit is an approximate byte budget
+    # and policy (one of HISTORY_POLICIES) picks what goes first once it is exceeded.
+    # Entries: ("insert", i, value), ("delete", i, value), ("modify", i, old, new),
+    # ("capacity", old, new), ("replace", state before, state after) for bulk edits
+    # and ("group", entries) for one edit made of several steps.
+    def set_history(self, enabled, limit=HISTORY_LIMIT, policy="drop-oldest", snapshot_every=HISTORY_SNAPSHOT_EVERY):
+        if policy not in HISTORY_POLICIES:
+            return False
+        self.history = History(limit, policy, snapshot_every) if enabled else None
+        return True
+
+    def undo(self):
+        entry = self.history.undo() if self.history is not None else None
+        if entry is None:
+            return False
+        self._apply(entry, forward=False)
+        return True
+
+    def redo(self):
+        entry = self.history.redo() if self.history is not None else None
+        if entry is None:
+            return False
+        self._apply(entry, forward=True)
+        return True
+
+    # Jumps to any journal position, starting from the nearest snapshot when that
+    # replays fewer entries than stepping from the current position
+    def revert_to(self, position):
+        history = self.history
+        if history is None or not history.first() <= position <= history.last():
+            return False
+        state, start = history.route(position)
+        if state is not None:
+            self._install(state)
+            history.seek(start)
+        while history.position < position:
+            self._apply(history.redo(), forward=True)
+        while history.position > position:
+            self._apply(history.undo(), forward=False)
+        return True
+
+    def get_history_info(self):
+        history = self.history
+        if history is None:
+            return None
+        return {
+            "position": history.position,
+            "first": history.first(),
+            "last": history.last(),
+            "bytes": history.bytes,
+            "snapshots": len(history.snapshots),
+        }
+
+    # Everything a bulk edit can change, as captured by replace entries and snapshots
+    def _state(self):
+        return (self.array, self.capacity, self.data_type, self.storage_kind, self.keep_sorted)
+
+    def _install(self, state):
+        self.array, self.capacity, self.data_type, self.storage_kind, self.keep_sorted = state
+        self.frozen = self.array
+        if self.value_index is not None:
+            self.value_index.invalidate()
+        self._record("reset")
+
+    def _journal(self, *entry):
+        if self.history is None:
+            return
+        if entry[0] == "replace":
+            self.frozen = self.array # The entry keeps the live storage as its "after" state
+        if self.journal_group is not None:
+            self.journal_group.append(entry)
+        else:
+            self._commit(entry)
+
+    # Entries journaled between these two calls are undone as one step
+    def _begin_group(self):
+        if self.history is None or self.journal_group is not None:
+            return None
+        self.journal_group = []
+        return self.journal_group
+
+    def _end_group(self, group):
+        if group is None:
+            return
+        self.journal_group = None
+        if len(group) == 1:
+            self._commit(group[0])
+        elif group:
+            self._commit(("group", group))
+
+    def _commit(self, entry):
+        history = self.history
+        history.record(entry, self._entry_cost(entry))
+        if history.snapshot_due() and history.add_snapshot(self._state(), HISTORY_ENTRY_BYTES + self.array.nbytes()):
+            self.frozen = self.array
+
+    def _entry_cost(self, entry):
+        if entry[0] == "group":
+            return sum(map(self._entry_cost, entry[1]))
+        if entry[0] == "replace":
+            return HISTORY_ENTRY_BYTES + entry[1][0].nbytes()
+        return HISTORY_ENTRY_BYTES + sum(map(sys.getsizeof, entry[2:]))
+
+    def _apply(self, entry, forward):
+        kind = entry[0]
+        if kind == "group":
+            for step in entry[1] if forward else reversed(entry[1]):
+                self._apply(step, forward)
+        elif kind == "replace":
+            self._install(entry[2] if forward else entry[1])
+        elif kind == "capacity":
+            self.capacity = entry[2] if forward else entry[1]
+            if self.array is not self.frozen and not isinstance(self.array, MappedStorage):
+                self.array.reserve(self.capacity)
+            self._record("capacity", self.capacity)
+        else:
+            self._writable()
+            if self.value_index is not None:
+                self.value_index.invalidate()
+            index = entry[1]
+            if kind == "modify":
+                self.array[index] = entry[3] if forward else entry[2]
+                self._record("set", index)
+            elif (kind == "insert") == forward:
+                self.array.insert(index, entry[2])
+                self._record(*(("set", index) if index == len(self.array) - 1 else ("shift", index, 1)))
+            else:
+                self.array.pop(index)
+                self._record("shift", index, -1)
+
+    # Validates and converts input based on current data type
+    def validate_and_convert(self, value):
+        return self.converter(value)
+
+    # Batch variant: (True, converted list) or (False, position of the first invalid value).
+    # data_type defaults to the array's own, so one instance can convert any column.
+    def validate_and_convert_many(self, values, data_type=None):
+        return self._convert_chunk(list(map(str.strip, map(str, values))), data_type)
+
+    # Creates array with initial data and type validation
+    # progress(done, total) is called between chunks; returning False cancels the load
+    # storage picks the layout: "contiguous" (compact) or "gap" (fast edits around a cursor)
+    def create_array(self, capacity_input, raw_data_string, selected_type, progress=None, storage="contiguous"):
+        before = self._state()
+        try:
+            self.capacity = int(capacity_input) if capacity_input else 1
+        except ValueError:
+            self.capacity = 1
+
+        self.data_type = selected_type
+        self.storage_kind = storage if storage in STORAGE_KINDS else "contiguous"
+        old, self.array = self.array, new_storage(self.data_type, slots=self.capacity, kind=self.storage_kind)
+        self._release(old)
+        
+        if raw_data_string and raw_data_string.strip():
+            is_valid, result = self.parse_bulk(raw_data_string, self.capacity, progress)
+            if not is_valid:
+                # The old array is gone either way, so views must redraw the empty one
+                self._reset_views()
+                self._journal("replace", before, self._state())
+                return False, result
+            if self.keep_sorted:
+                result.sort()
+            self.array = new_storage(self.data_type, result, self.capacity, self.storage_kind)
+
+        self._reset_views()
+        self._journal("replace", before, self._state())
+        return True, "Success"
+
+    # After the storage was swapped: the value index and any change-log reader start over
+    def _reset_views(self):
+        if self.value_index is not None:
+            self.value_index.invalidate()
+        self._record("reset")
+
+    # Converts a comma separated payload in one pass, reading at most `limit` items
+    def parse_bulk(self, raw_data_string, limit, progress=None):
+        limit = max(limit, 0)
+        tokens = raw_data_string.split(',', limit)
+        if len(tokens) > limit:
+            tokens.pop() # Unparsed remainder past capacity
+        tokens = list(map(str.strip, tokens))
+
+        values = []
+        for start in range(0, len(tokens), BULK_CHUNK):
+            is_valid, result = self._convert_chunk(tokens[start:start + BULK_CHUNK])
+            if not is_valid:
+                position = start + result
+                return False, f"'{tokens[position]}' at index {position} is not a valid {self.data_type}"
+            values += result
+            if progress is not None and not progress(len(values), len(tokens)):
+                return False, "Cancelled"
+        return True, values
+
+    # Returns (True, converted chunk) or (False, position of the first invalid token)
+    def _convert_chunk(self, tokens, data_type=None):
+        data_type = data_type or self.data_type
+        if data_type == "Integer":
+            # int() alone is the fast path; it also takes "+" and "_" forms, which are rejected here
+            joined = "".join(tokens)
+            if "+" not in joined and "_" not in joined:
+                try:
+                    return True, list(map(int, tokens))
+                except ValueError:
+                    pass
+            # Also catches well-formed tokens int() still refuses (too many digits)
+            return False, next(i for i, token in enumerate(tokens) if not convert_integer(token)[0])
+
+        elif data_type == "Boolean":
+            values = list(map(BOOLEAN_TOKENS.get, map(str.lower, tokens)))
+            if None not in values:
+                return True, values
+            return False, values.index(None)
+
+        elif type_info(data_type).name == "String": # Accepts anything
+            return True, tokens
+
+        else: # Registered types: one parse call per token
+            parse, values = type_info(data_type).parse, []
+            for position, token in enumerate(tokens):
+                is_valid, value = parse(token)
+                if not is_valid:
+                    return False, position
+                values.append(value)
+            return True, values
+
+    # Fills the array from one CSV column, reading no further than `capacity` rows.
+    # Without a data_type the column's type is inferred from its first chunk.
+    def load_csv_column(self, path, column, capacity_input, data_type=None, progress=None):
+        try:
+            capacity = int(capacity_input) if capacity_input else 1
+        except ValueError:
+            capacity = 1
+
+        values = []
+        try:
+            with closing(iter_csv_column(path, column)) as chunks:
+                for chunk in chunks:
+                    chunk = chunk[:capacity - len(values)]
+                    data_type = data_type or infer_data_type(chunk)
+                    is_valid, result = self._convert_chunk(chunk, data_type)
+                    if not is_valid:
+                        # Row numbers count the header as row 1, like a spreadsheet
+                        return False, f"'{chunk[result]}' in row {len(values) + result + 2} is not a valid {data_type}"
+                    values += result
+                    if progress is not None and not progress(len(values), capacity):
+                        return False, "Cancelled"
+                    if len(values) >= capacity:
+                        break # Stop reading; the rest of the file is never touched
+        except KeyError:
+            return False, f"Column '{column}' not found"
+        except IndexError:
+            return False, f"A row is missing the '{column}' column"
+        except (OSError, UnicodeDecodeError, csv.Error) as error:
+            return False, f"Could not read CSV: {error}"
+
+        before = self._state()
+        self.capacity, self.data_type = capacity, data_type or "String"
+        if self.keep_sorted:
+            values.sort()
+        old, self.array = self.array, new_storage(self.data_type, values, capacity, self.storage_kind)
+        self._release(old)
+        if self.value_index is not None:
+            self.value_index.invalidate()
+        self._record("reset")
+        self._journal("replace", before, self._state())
+        return True, f"Loaded {len(values):,} values"
+
+    # ---- Persistence (file layout documented at ARRAY_FILE_HEADER) ----
+
+    # Writes through a temporary file so a mapping of the old file stays valid
+    def save(self, path):
+        try:
+            buffers = self.array.buffers()
+        except OverflowError as error:
+            return False, str(error).capitalize()
+
+        header = ARRAY_FILE_HEADER.pack(ARRAY_FILE_MAGIC, ARRAY_FILE_VERSION, type_info(self.data_type).code,
+                                        sys.byteorder == "big", self.capacity, len(self.array))
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(header)
+                for buffer in buffers:
+                    f.write(buffer)
+            os.replace(temp_path, path)
+        except OSError as error:
+            return False, f"Could not save: {error.strerror}"
+        return True, f"Saved {len(self.array):,} elements"
+
+    # Maps the file instead of reading it; elements are decoded when accessed
+    def load(self, path):
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            return False, f"Could not open: {getattr(error, 'strerror', None) or error}"
+
+        is_valid, storage = map_array_file(mapped)
+        if not is_valid:
+            mapped.close()
+            return False, storage
+
+        group, before, old = self._begin_group(), self._state(), self.array
+        self.data_type, self.capacity, self.array = storage.data_type, storage.capacity, storage
+        if self.value_index is not None:
+            self.value_index.invalidate()
+        self._record("reset")
+        self._journal("replace", before, self._state())
+        if self.keep_sorted:
+            self.set_sorted(True) # Unsorted files get copied out of the mapping and sorted
+        self._end_group(group)
+        self._release(old)
+        return True, "Success"
+
+    # Replaces a file-backed storage, or one the journal still references, with a
+    # writable copy before the first edit
+    def _writable(self):
+        if isinstance(self.array, MappedStorage):
+            old, self.array = self.array, self.array.materialize(self.storage_kind)
+            self._release(old)
+        elif self.array is self.frozen:
+            self.array = self.array.copy()
+
+    # Unmaps a file-backed storage that was swapped out, unless the journal or a
+    # clone still reads from it (those copies are left to the garbage collector)
+    def _release(self, old):
+        if isinstance(old, MappedStorage) and old is not self.array and old is not self.frozen and self.history is None:
+            old.close()
+
+    # Check if array is full
+    def is_full(self):
+        return len(self.array) >= self.capacity
+
+    # Insert without resizing
+    def insert(self, item):
+        is_valid, converted = self.converter(item)
+        if not is_valid:
+            return False
+        self._place(converted)
+        return True
+
+    # Resize and insert (dynamic array behavior)
+    def resize_and_insert(self, item):
+        is_valid, converted = self.converter(item)
+        if not is_valid:
+            return False
+        
+        group = self._begin_group()
+        if self.is_full():
+            self._writable()
+            self._journal("capacity", self.capacity, self.next_capacity())
+            self.capacity = self.next_capacity()
+            self.array.reserve(self.capacity)
+            self._record("capacity", self.capacity)
+        self._place(converted)
+        self._end_group(group)
+        return True
+
+    # Capacity the next resize will grow to
+    def next_capacity(self):
+        return max(self.capacity + 1, math.ceil(self.capacity * self.growth_factor))
+
+    # Appends, or in sorted mode inserts after any equal elements
+    def _place(self, converted):
+        if self.keep_sorted:
+            self._insert_converted(self.array.bisect(converted, right=True), converted)
+        else:
+            self._append(converted)
+
+    def _insert_converted(self, index, converted):
+        if index == len(self.array):
+            self._append(converted)
+            return
+        self._writable()
+        self.array.insert(index, converted)
+        if self.value_index is not None:
+            self.value_index.invalidate()
+        self._record("shift", index, 1)
+        self._journal("insert", index, converted)
+
+    def _append(self, converted):
+        self._writable()
+        self.array.append(converted)
+        if self.value_index is not None:
+            self.value_index.appended(converted, len(self.array) - 1)
+        self._record("set", len(self.array) - 1)
+        self._journal("insert", len(self.array) - 1, converted)
+
+    # Accessors
+    def get_data(self):
+        return self.array.tolist()
+
+    # Elements at the given positions (each in range), in that order
+    def get_data_at(self, positions):
+        return self.array.take(positions)
+    
+    def get_capacity(self):
+        return self.capacity
+
+    # Reallocation counters of the slot buffer, for tuning the growth policy
+    def get_growth_stats(self):
+        return {
+            "capacity": self.capacity,
+            "slots": self.array.slots,
+            "reallocations": self.array.reallocations,
+            "bytes_moved": self.array.bytes_moved,
+        }
+    
+    def get_value_at(self, index):
+        return self.array[index] if 0 <= index < len(self.array) else None
+    
+    def get_first_value(self):
+        return self.array[0] if self.array else None
+    
+    def get_last_value(self):
+        return self.array[-1] if self.array else None
+    
+    def get_length(self): 
+        return len(self.array)
+    
+    def clear(self):
+        self._record("cleared", len(self.array))
+        before = self._state()
+        if isinstance(self.array, MappedStorage) or self.history is not None or self.array is self.frozen:
+            # Nothing worth copying; a journaled or shared storage stays as it is
+            old, self.array = self.array, new_storage(self.data_type, slots=self.capacity, kind=self.storage_kind)
+            self._release(old)
+        self.array.clear()
+        if self.value_index is not None:
+            self.value_index.reset()
+        self._journal("replace", before, self._state())
+
+    # Bytes held by the element storage
+    def get_memory_usage(self):
+        return self.array.nbytes()
+    
+    # Modify value at specific index
+    def modify_at_index(self, index, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid:
+            return "TYPE_ERROR"
+
+        if 0 <= index < len(self.array):
+            if self.keep_sorted and not self._fits_order(index, converted):
+                return "ORDER_ERROR"
+            self._writable()
+            if self.value_index is not None:
+                self.value_index.replaced(index, self.array[index], converted)
+            self._journal("modify", index, self.array[index], converted)
+            self.array[index] = converted
+            self._record("set", index)
+            return True
+        return "INDEX_ERROR"
+    
+    # Delete at specific index    
+    def delete_at_index(self, index):
+        if 0 <= index < len(self.array):
+            self._writable()
+            group = self._begin_group()
+            removed = self.array.pop(index)
+            if self.value_index is not None:
+                if index == len(self.array):
+                    self.value_index.removed_last(removed, index)
+                else:
+                    self.value_index.invalidate()
+            self._record("shift", index, -1)
+            self._journal("delete", index, removed)
+            self._maybe_shrink()
+            self._end_group(group)
+            return True
+        return "INDEX_ERROR"
+
+    # Gives slots back once the array drops below the shrink threshold
+    def _maybe_shrink(self):
+        if self.shrink_threshold and len(self.array) < self.capacity * self.shrink_threshold:
+            capacity = max(1, len(self.array), int(self.capacity / self.growth_factor))
+            self._journal("capacity", self.capacity, capacity)
+            self.capacity = capacity
+            self.array.reserve(self.capacity)
+            self._record("capacity", self.capacity)
+    
+    # Insert at specific index
+    def insert_at_specific_index(self, index, value):
+        if len(self.array) >= self.capacity:
+            return "FULL"
+        
+        is_valid, converted = self.converter(value)
+        if not is_valid:
+            return "TYPE_ERROR"
+
+        if not 0 <= index <= len(self.array):
+            return "INDEX_ERROR"
+        if self.keep_sorted and not self.array.bisect(converted) <= index <= self.array.bisect(converted, right=True):
+            return "ORDER_ERROR"
+        self._insert_converted(index, converted)
+        return True
+
+    # Whether converted can replace the element at index without breaking the order
+    def _fits_order(self, index, converted):
+        return ((index == 0 or self.array[index - 1] <= converted) and
+                (index == len(self.array) - 1 or converted <= self.array[index + 1]))
+    
+    # ---- Batch operations: everything is validated before anything changes ----
+
+    # Swaps in a rebuilt storage, keeping its growth counters
+    def _replace_items(self, items):
+        old = self.array
+        self.array = new_storage(self.data_type, items, self.capacity, self.storage_kind)
+        self.array.reallocations, self.array.bytes_moved = old.reallocations, old.bytes_moved
+        self._release(old)
+        if self.value_index is not None:
+            self.value_index.invalidate()
+
+    # Insert many (index, value) pairs; indices refer to positions before the batch
+    def insert_many(self, pairs):
+        pairs = list(pairs)
+        if len(self.array) + len(pairs) > self.capacity:
+            return "FULL"
+
+        converted_pairs = []
+        for index, value in pairs:
+            is_valid, converted = self.converter(value)
+            if not is_valid:
+                return "TYPE_ERROR"
+            if not 0 <= index <= len(self.array):
+                return "INDEX_ERROR"
+            converted_pairs.append((index, converted))
+
+        # Stable sort keeps pairs for the same index in the order given
+        converted_pairs.sort(key=lambda pair: pair[0])
+        merged = merge_inserts(self.array.tolist(), converted_pairs)
+        if self.keep_sorted and not is_ordered(merged):
+            return "ORDER_ERROR"
+        before = self._state()
+        self._replace_items(merged)
+        if converted_pairs:
+            self._record("shift", converted_pairs[0][0], len(converted_pairs))
+        self._journal("replace", before, self._state())
+        return True
+
+    # Delete every index in the batch (duplicates count once)
+    def delete_many(self, indices):
+        indices = sorted(set(indices))
+        if indices and not (0 <= indices[0] and indices[-1] < len(self.array)):
+            return "INDEX_ERROR"
+
+        group, before = self._begin_group(), self._state()
+        self._replace_items(drop_indices(self.array.tolist(), indices))
+        if indices:
+            self._record("shift", indices[0], -len(indices))
+        self._maybe_shrink()
+        self._journal("replace", before, self._state())
+        self._end_group(group)
+        return True
+
+    # Modify many (index, value) pairs in place; later pairs win on repeated indices
+    def modify_many(self, pairs):
+        converted_pairs = []
+        for index, value in pairs:
+            is_valid, converted = self.converter(value)
+            if not is_valid:
+                return "TYPE_ERROR"
+            if not 0 <= index < len(self.array):
+                return "INDEX_ERROR"
+            converted_pairs.append((index, converted))
+
+        if self.keep_sorted:
+            items = self.array.tolist()
+            for index, converted in converted_pairs:
+                items[index] = converted
+            if not is_ordered(items):
+                return "ORDER_ERROR"
+
+        self._writable()
+        group = self._begin_group()
+        for index, converted in converted_pairs:
+            if self.value_index is not None:
+                self.value_index.replaced(index, self.array[index], converted)
+            self._journal("modify", index, self.array[index], converted)
+            self.array[index] = converted
+            self._record("set", index)
+        self._end_group(group)
+        return True
+
+    # Search for value in the array
+    def search(self, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid: return -1
+        return self._find(converted)
+
+    def _find(self, converted):
+        if self.keep_sorted:
+            index = self.array.bisect(converted)
+            return index if index < len(self.array) and self.array[index] == converted else -1
+        if self.value_index is not None:
+            return self.value_index.lookup(self.array, converted)
+        try:
+            return self.array.index(converted)
+        except ValueError:
+            return -1
+
+    # ---- Sorted-mode queries (bounds need sorted mode and return -1 without it) ----
+
+    # First position where value could be inserted keeping the order
+    def lower_bound(self, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid or not self.keep_sorted:
+            return -1
+        return self.array.bisect(converted)
+
+    # Position just past the last element equal to value
+    def upper_bound(self, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid or not self.keep_sorted:
+            return -1
+        return self.array.bisect(converted, right=True)
+
+    # Occurrences of value (O(log n) when sorted, a scan otherwise)
+    def count(self, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid:
+            return 0
+        if self.keep_sorted:
+            return self.array.bisect(converted, right=True) - self.array.bisect(converted)
+        return self._scan("count", converted)
+
+    # Elements with low <= element <= high, in array order; None when a bound has the wrong type
+    def values_between(self, low, high):
+        low_valid, low = self.converter(low)
+        high_valid, high = self.converter(high)
+        if not (low_valid and high_valid):
+            return None
+        if self.keep_sorted:
+            start, stop = self.array.bisect(low), self.array.bisect(high, right=True)
+            return [self.array[i] for i in range(start, stop)]
+        return [item for item in self.array.tolist() if low <= item <= high]
+
+    # Slots a binary search for value compares against, in order (for animating the search)
+    def search_probes(self, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid or not self.keep_sorted:
+            return []
+        probes, low, high = [], 0, len(self.array)
+        while low < high:
+            middle = (low + high) // 2
+            probes.append(middle)
+            if self.array[middle] < converted:
+                low = middle + 1
+            else:
+                high = middle
+        return probes
+
+    # ---- Scans: find-all, count, min, max, sum and filter ----
+    # Typed arrays scan their stored numbers, split across worker processes once
+    # they reach PARALLEL_THRESHOLD elements (parallel_scan.py); other layouts
+    # scan a decoded list in process. Values go in and results come out through
+    # the type's encode/decode, so the workers only ever compare numbers.
+
+    def _scan(self, name, value=None, operator=None):
+        buffer = self.array.scan_buffer()
+        info = type_info(self.data_type)
+        coded = buffer is not None and info.encode is not None
+        if coded and value is not None:
+            value = info.encode(value)
+        argument = (operator, value) if operator else value
+        if buffer is None:
+            result = SCANS[name][0](self.array.tolist(), 0, argument)
+        else:
+            result = scan(name, buffer, len(self.array), argument, share=self.array.shared_buffer)
+        if coded and name == "filter":
+            return list(map(info.decode, result))
+        if coded and name in ("min", "max", "sum") and result is not None:
+            return info.decode(result)
+        return result
+
+    # Every position holding value, in order ([] when value has the wrong type)
+    def find_all(self, value):
+        is_valid, converted = self.converter(value)
+        if not is_valid:
+            return []
+        if self.keep_sorted:
+            return list(range(self.array.bisect(converted), self.array.bisect(converted, right=True)))
+        return self._scan("find_all", converted)
+
+    # Smallest element, None when the array is empty
+    def min_value(self):
+        if not len(self.array):
+            return None
+        return self.array[0] if self.keep_sorted else self._scan("min")
+
+    def max_value(self):
+        if not len(self.array):
+            return None
+        return self.array[-1] if self.keep_sorted else self._scan("max")
+
+    # Sum of the elements; None for types without a meaningful sum (see DataType.summable)
+    def sum_values(self):
+        if not type_info(self.data_type).summable:
+            return None
+        return self._scan("sum")
+
+    # Elements e with `e <operator> operand`, in array order, for an operator in
+    # SCAN_OPERATORS; None for an unknown operator or an operand of the wrong type
+    def filter_values(self, operator, operand):
+        is_valid, converted = self.converter(operand)
+        if operator not in SCAN_OPERATORS or not is_valid:
+            return None
+        return self._scan("filter", converted, operator)
+
+    # Positions of the elements filter_values would return; None in the same cases.
+    # With `positions`, only those are checked and the matching ones kept in their order.
+    def find_where(self, operator, operand, positions=None):
+        is_valid, converted = self.converter(operand)
+        if operator not in SCAN_OPERATORS or not is_valid:
+            return None
+        if positions is None:
+            return self._scan("where", converted, operator)
+        matches = map(SCAN_OPERATORS[operator], self.array.take(positions), repeat(converted))
+        return list(compress(positions, matches))
+
+# ==========================================
+#              WORKSPACE
+# ==========================================
+# Named arrays side by side, one of them in focus. clone() shares storage
+# copy-on-write, so duplicating even a large array is O(1) until either copy
+# is edited. Methods that can fail return (success, message) like create_array.
+class Workspace:
+    def __init__(self, setup=None):
+        self.arrays = {} # name -> MitaInABox, in creation order
+        self.active = None # Name of the array in focus
+        self.setup = setup # Called with each new (not cloned) array, e.g. to turn history on
+
+    def names(self):
+        return list(self.arrays)
+
+    def current(self):
+        return self.arrays.get(self.active)
+
+    # First free name among base, "base 2", "base 3", ...
+    def unique_name(self, base):
+        name, number = base, 1
+        while name in self.arrays:
+            number += 1
+            name = f"{base} {number}"
+        return name
+
+    def _check_name(self, name):
+        name = name.strip() if isinstance(name, str) else ""
+        if not name:
+            return False, "Name cannot be empty."
+        if name in self.arrays:
+            return False, f"'{name}' already exists."
+        return True, name
+
+    # Adds an empty array and focuses it
+    def add(self, name):
+        is_valid, name = self._check_name(name)
+        if not is_valid:
+            return False, name
+        box = MitaInABox()
+        if self.setup is not None:
+            self.setup(box)
+        self.arrays[name] = box
+        self.active = name
+        return True, name
+
+    def clone(self, source, name):
+        if source not in self.arrays:
+            return False, f"No array named '{source}'."
+        is_valid, name = self._check_name(name)
+        if not is_valid:
+            return False, name
+        self.arrays[name] = self.arrays[source].clone()
+        self.active = name
+        return True, name
+
+    def rename(self, old, new):
+        if old not in self.arrays:
+            return False, f"No array named '{old}'."
+        is_valid, new = self._check_name(new)
+        if not is_valid:
+            return False, new
+        self.arrays = {new if name == old else name: box for name, box in self.arrays.items()}
+        if self.active == old:
+            self.active = new
+        return True, new
+
+    # Focus moves to the neighbour of the removed array
+    def remove(self, name):
+        if name not in self.arrays:
+            return False, f"No array named '{name}'."
+        names = self.names()
+        position = names.index(name)
+        del self.arrays[name]
+        if self.active == name:
+            rest = names[:position] + names[position + 1:]
+            self.active = rest[min(position, len(rest) - 1)] if rest else None
+        return True, name
+
+    def focus(self, name):
+        if name not in self.arrays:
+            return False, f"No array named '{name}'."
+        self.active = name
+        return True, name
+
+    # Bytes held by element storage, counting storage shared by clones once
+    def get_memory_usage(self):
+        storages = {id(box.array): box.array for box in self.arrays.values()}
+        return sum(storage.nbytes() for storage in storages.values())
@@ -0,0 +1,138 @@
+import os
+import weakref
+from itertools import compress, repeat
+from operator import countOf, eq, ge, gt, le, lt, ne
+
+# ==========================================
+#        PARALLEL SCANS OVER SHARED MEMORY
+# ==========================================
+# Scans a typed buffer (array.array or a typed memoryview) with one kernel:
+#   scan("count", buffer, length, 7)
+#   scan("filter", buffer, length, (">=", 100))
+# Buffers of PARALLEL_THRESHOLD elements or more are copied into a SharedMemory
+# segment (a SharedBuffer) and split into one chunk per worker process; workers
+# attach to the segment by name and scan their chunk in place, so only the
+# chunk bounds and the partial results are pickled. Smaller buffers, and
+# machines with one core, run the same kernel in this process.
+# The copy is made once per version of the data, not once per scan: callers
+# pass `share`, which returns a SharedBuffer they keep until their next write
+# (SlotStorage.shared_buffer), so repeated scans go straight to the workers.
+# The pool uses the "spawn" start method, which is safe next to the Tk and
+# worker threads of the GUIs; it is started by the first parallel scan and
+# reused after that. multiprocessing is only imported then too (it costs
+# more than the rest of mita_backend), so the serial path stays cheap to load.
+
+PARALLEL_THRESHOLD = 1 << 21 # Elements; below this the copy and the dispatch cost more than they save
+PARALLEL_WORKERS = os.cpu_count() or 1
+
+SCAN_OPERATORS = {"==": eq, "!=": ne, "<": lt, "<=": le, ">": gt, ">=": ge}
+
+# ---- Kernels: (values, position of values[0], argument) -> partial result ----
+
+def find_all_chunk(values, start, value):
+    return list(compress(range(start, start + len(values)), map(eq, values, repeat(value))))
+
+def count_chunk(values, start, value):
+    return countOf(values, value)
+
+def min_chunk(values, start, argument):
+    return min(values, default=None)
+
+def max_chunk(values, start, argument):
+    return max(values, default=None)
+
+def sum_chunk(values, start, argument):
+    return sum(values)
+
+# argument is (operator name, operand); returns the matching values
+def filter_chunk(values, start, argument):
+    compare = SCAN_OPERATORS[argument[0]]
+    return list(compress(values, map(compare, values, repeat(argument[1]))))
+
+# Same argument as filter; returns the matching positions
+def where_chunk(values, start, argument):
+    compare = SCAN_OPERATORS[argument[0]]
+    return list(compress(range(start, start + len(values)), map(compare, values, repeat(argument[1]))))
+
+def concatenate(parts):
+    return [item for part in parts for item in part]
+
+def present(parts):
+    return [part for part in parts if part is not None]
+
+# name -> (kernel, merge of the partial results in chunk order)
+SCANS = {
+    "find_all": (find_all_chunk, concatenate),
+    "count": (count_chunk, sum),
+    "min": (min_chunk, lambda parts: min(present(parts), default=None)),
+    "max": (max_chunk, lambda parts: max(present(parts), default=None)),
+    "sum": (sum_chunk, sum),
+    "filter": (filter_chunk, concatenate),
+    "where": (where_chunk, concatenate),
+}
+
+pool = None
+
+def get_pool():
+    global pool
+    if pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+        pool = ProcessPoolExecutor(PARALLEL_WORKERS, mp_context=get_context("spawn"))
+    return pool
+
+# Splits [0, length) into `parts` contiguous ranges of near-equal size
+def chunk_bounds(length, parts):
+    step, extra = divmod(length, parts)
+    bounds, start = [], 0
+    for part in range(parts):
+        stop = start + step + (part < extra)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+# A SharedMemory copy of a buffer's first `length` items. The segment is
+# unlinked by release(), or when the SharedBuffer is garbage collected.
+class SharedBuffer:
+    def __init__(self, buffer, length):
+        from multiprocessing import shared_memory
+        with memoryview(buffer) as view, view.cast("B") as raw:
+            self.format, self.length = view.format, length
+            size = length * view.itemsize
+            self.segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            self.segment.buf[:size] = raw[:size]
+        self.release = weakref.finalize(self, release_segment, self.segment)
+
+def release_segment(segment):
+    segment.close()
+    segment.unlink()
+
+# Runs in a worker: attaches to the segment and scans [start, stop) without copying
+def scan_chunk(segment_name, typecode, start, stop, name, argument):
+    from multiprocessing import shared_memory
+    # Spawned workers share the parent's resource tracker, so the parent's unlink
+    # also covers the registration this attach makes
+    segment = shared_memory.SharedMemory(segment_name)
+    try:
+        with segment.buf.cast(typecode) as values, values[start:stop] as chunk:
+            return SCANS[name][0](chunk, start, argument)
+    finally:
+        segment.close()
+
+# `share`, when given, returns a SharedBuffer of the same `length` items to
+# reuse; without it the parallel path copies into a segment of its own per call
+def scan(name, buffer, length, argument=None, workers=None, share=None):
+    kernel, merge = SCANS[name]
+    workers = PARALLEL_WORKERS if workers is None else workers
+    if length < PARALLEL_THRESHOLD or workers < 2:
+        with memoryview(buffer) as view, view[:length] as values:
+            return kernel(values, 0, argument)
+
+    shared = share() if share is not None else SharedBuffer(buffer, length)
+    try:
+        futures = [get_pool().submit(scan_chunk, shared.segment.name, shared.format, start, stop, name, argument)
+                   for start, stop in chunk_bounds(length, workers)]
+        return merge([future.result() for future in futures])
+    finally:
+        if share is None:
+            shared.release()
@@ -0,0 +1,352 @@
+import json
+import math
+import threading
+import time
+import tracemalloc
+from functools import wraps
+
+from array_backend import ArrayBackend
+from mita_backend import MitaInABox
+
+# ==========================================
+#        PER-OPERATION PROFILING
+# ==========================================
+# Opt-in instrumentation for the backend classes:
+#   profiler = Profiler()
+#   profiler.attach(box)           (MitaInABox or ArrayBackend; label defaults to the class name)
+#   ... use box as usual ...
+#   profiler.to_json() / profiler.to_prometheus()
+#   profiler.detach(box)
+# attach() shadows the operations of that one instance with a timing
+# wrapper; detach() removes the wrappers again. A backend that was never
+# attached runs its plain methods, so profiling costs nothing when it is off.
+# Per operation it keeps the call count, a latency histogram (p50/p95/p99),
+# the elements touched (tail shifted by inserts and deletes, elements scanned
+# by searches, elements rebuilt by bulk edits), the storage reallocations and
+# bytes they copied and, with trace_allocations=True, the peak bytes Python
+# allocated during the call (tracemalloc, which slows every allocation down).
+# Operations calling other operations are counted once each, so the time of
+# ArrayBackend.insert includes its validate call.
+
+# Log-linear latency buckets: 8 per power of two, so a percentile is off by at
+# most one bucket (~9%) while the histogram stays a few dozen entries
+HISTOGRAM_SUB_BUCKETS = 8
+
+# Fixed "le" bounds (seconds) for the Prometheus export, so series line up between scrapes
+PROMETHEUS_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                      1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_PREFIX = "mita_operation"
+
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+# Latency histogram over nanosecond samples
+class Histogram:
+    def __init__(self):
+        self.counts = {} # bucket -> samples
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        mantissa, exponent = math.frexp(max(value, 1)) # value = mantissa * 2**exponent, mantissa in [0.5, 1)
+        bucket = exponent * HISTOGRAM_SUB_BUCKETS + int((mantissa - 0.5) * 2 * HISTOGRAM_SUB_BUCKETS)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    # Largest value that falls into bucket
+    @staticmethod
+    def upper_bound(bucket):
+        exponent, sub = divmod(bucket, HISTOGRAM_SUB_BUCKETS)
+        return math.ldexp(0.5 + (sub + 1) / (2 * HISTOGRAM_SUB_BUCKETS), exponent)
+
+    # Upper edge of the bucket holding the q-quantile (never above the largest sample)
+    def percentile(self, q):
+        if not self.count:
+            return 0
+        rank, seen = max(1, math.ceil(q * self.count)), 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+    # Cumulative sample counts at each bound (same unit as the samples)
+    def cumulative(self, bounds):
+        buckets = sorted(self.counts.items())
+        out, seen, position = [], 0, 0
+        for bound in bounds:
+            while position < len(buckets) and self.upper_bound(buckets[position][0]) <= bound:
+                seen += buckets[position][1]
+                position += 1
+            out.append(seen)
+        return out
+
+class OperationStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0 # Calls that raised
+        self.touched = 0
+        self.reallocations = 0
+        self.bytes_moved = 0
+        self.allocated_bytes = 0
+
+# ---- Elements touched per call ----
+# rule(backend, args, result, before) with before the probe taken just before the call:
+# (length, reallocations, bytes moved, search index state: "fresh", "stale" or None)
+
+def probe_mita(box):
+    index = box.value_index
+    state = None if index is None else "stale" if index.stale else "fresh"
+    return len(box.array), box.array.reallocations, box.array.bytes_moved, state
+
+def probe_array_backend(backend):
+    state = None if backend.idx is None else "stale" if backend.idx_stale else "fresh"
+    return len(backend.arr), backend.arr.copies, backend.arr.moved, state
+
+def length_of(backend):
+    return len(backend.array) if isinstance(backend, MitaInABox) else len(backend.arr)
+
+def touches_one(backend, args, result, before):
+    return 1
+
+def touches_after(backend, args, result, before):
+    return length_of(backend)
+
+def touches_before(backend, args, result, before):
+    return before[0]
+
+def touches_batch(backend, args, result, before):
+    return len(args[0]) if args and hasattr(args[0], "__len__") else 0
+
+# Bulk edits rebuild the whole array
+def touches_rebuild(backend, args, result, before):
+    return max(before[0], length_of(backend))
+
+# An append writes one slot; a sorted insert shifts the tail after the new element
+def touches_insert(backend, args, result, before):
+    length = length_of(backend)
+    if length <= before[0]:
+        return 0
+    if isinstance(backend, MitaInABox) and backend.keep_sorted:
+        return length - backend.array.bisect(backend.converter(args[0])[1], right=True) + 1
+    return 1
+
+def touches_insert_at(backend, args, result, before):
+    if length_of(backend) <= before[0]:
+        return 0
+    return before[0] - min(max(args[0], 0), before[0]) + 1
+
+def touches_delete(backend, args, result, before):
+    if length_of(backend) >= before[0]:
+        return 0
+    return before[0] - args[0]
+
+# Binary search probes in sorted mode, one lookup with a current index,
+# a full pass when the index has to be rebuilt, otherwise a linear scan
+def touches_search(backend, args, result, before):
+    length, state = before[0], before[3]
+    if isinstance(backend, MitaInABox) and backend.keep_sorted:
+        return length.bit_length()
+    if state == "fresh":
+        return 1
+    if state == "stale":
+        return length
+    return result + 1 if result >= 0 else length
+
+def touches_sorted_query(backend, args, result, before):
+    return before[0].bit_length() if backend.keep_sorted else before[0]
+
+def touches_values_between(backend, args, result, before):
+    if not backend.keep_sorted:
+        return before[0]
+    return 2 * before[0].bit_length() + len(result or ())
+
+# class -> (probe, {operation: touched rule or None for timing only}). Accessors
+# (get_*, is_full, display, ...) stay unwrapped: the operations call them
+# internally and wrapping them would mostly measure the wrappers
+PROFILED_CLASSES = {
+    MitaInABox: (probe_mita, {
+        "validate_and_convert": touches_one,
+        "validate_and_convert_many": touches_batch,
+        "create_array": touches_after,
+        "load_csv_column": touches_after,
+        "load": touches_after,
+        "save": touches_before,
+        "insert": touches_insert,
+        "resize_and_insert": touches_insert,
+        "insert_at_specific_index": touches_insert_at,
+        "modify_at_index": touches_one,
+        "delete_at_index": touches_delete,
+        "insert_many": touches_rebuild,
+        "delete_many": touches_rebuild,
+        "modify_many": touches_batch,
+        "clear": touches_before,
+        "search": touches_search,
+        "lower_bound": touches_sorted_query,
+        "upper_bound": touches_sorted_query,
+        "count": touches_sorted_query,
+        "values_between": touches_values_between,
+        "search_probes": touches_sorted_query,
+        "find_all": touches_sorted_query,
+        "min_value": touches_sorted_query,
+        "max_value": touches_sorted_query,
+        "sum_values": touches_before,
+        "filter_values": touches_before,
+        "undo": None,
+        "redo": None,
+        "revert_to": None,
+    }),
+    ArrayBackend: (probe_array_backend, {
+        "validate": touches_one,
+        "create": touches_after,
+        "insert": touches_insert,
+        "insert_at": touches_insert_at,
+        "modify": touches_one,
+        "delete": touches_delete,
+        "insert_many": touches_rebuild,
+        "delete_many": touches_rebuild,
+        "modify_many": touches_batch,
+        "clear": touches_before,
+        "search": touches_search,
+        "undo": None,
+        "redo": None,
+        "revert_to": None,
+    }),
+}
+
+# Escapes a Prometheus label value
+def label_value(text):
+    return str(text).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Profiler:
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.operations = {} # (label, method) -> OperationStats
+        self.attached = {} # id(backend) -> (backend, wrapped method names)
+        self.lock = threading.Lock() # Backends run on worker threads in the GUIs
+        self.started_tracing = False
+        self.last = None # (label, operation, seconds) of the most recent call
+
+    def attach(self, backend, label=None):
+        cls = next((cls for cls in PROFILED_CLASSES if isinstance(backend, cls)), None)
+        if cls is None:
+            raise TypeError(f"cannot profile {type(backend).__name__}")
+        if id(backend) in self.attached:
+            return
+        probe, rules = PROFILED_CLASSES[cls]
+        label = label or type(backend).__name__
+        names = list(rules)
+        for name in names:
+            setattr(backend, name, self._wrap(backend, label, name, getattr(backend, name), probe, rules[name]))
+        self.attached[id(backend)] = (backend, names)
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def detach(self, backend):
+        _, names = self.attached.pop(id(backend), (None, ()))
+        for name in names:
+            backend.__dict__.pop(name, None)
+        if not self.attached and self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def _wrap(self, backend, label, name, method, probe, rule):
+        clock = time.perf_counter_ns
+        stats = self.operations.setdefault((label, name), OperationStats())
+        lock, traced = self.lock, self.trace_allocations
+
+        @wraps(method)
+        def profiled(*args, **kwargs):
+            before = probe(backend)
+            if traced:
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+            start = clock()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                with lock:
+                    stats.latency.record(clock() - start)
+                    stats.errors += 1
+                raise
+            elapsed = clock() - start
+            allocated = max(0, tracemalloc.get_traced_memory()[1] - start_memory) if traced else 0
+            touched = rule(backend, args, result, before) if rule is not None else 0
+            after = probe(backend)
+            self.last = (label, name, elapsed / 1e9)
+            with lock:
+                stats.latency.record(elapsed)
+                stats.touched += touched
+                stats.reallocations += max(0, after[1] - before[1]) # A new array starts its counters over
+                stats.bytes_moved += max(0, after[2] - before[2])
+                stats.allocated_bytes += allocated
+            return result
+        return profiled
+
+    # Zeroes every counter; attached backends keep being profiled
+    def reset(self):
+        with self.lock:
+            for stats in self.operations.values():
+                stats.__init__()
+            self.last = None
+
+    # {label: {method: stats}}, latencies in microseconds; methods never called are left out
+    def snapshot(self):
+        out = {}
+        with self.lock:
+            for (label, name), stats in sorted(self.operations.items()):
+                latency = stats.latency
+                if not latency.count:
+                    continue
+                entry = {"calls": latency.count, "errors": stats.errors, "total_us": latency.total / 1000}
+                for key, q in PERCENTILES:
+                    entry[f"{key}_us"] = latency.percentile(q) / 1000
+                entry["max_us"] = latency.max / 1000
+                entry.update(elements_touched=stats.touched, reallocations=stats.reallocations,
+                             bytes_moved=stats.bytes_moved)
+                if self.trace_allocations:
+                    entry["allocated_bytes"] = stats.allocated_bytes
+                out.setdefault(label, {})[name] = entry
+        return out
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    # Prometheus text exposition format (histogram in seconds plus counters)
+    def to_prometheus(self):
+        with self.lock:
+            rows = [(label, name, stats) for (label, name), stats in sorted(self.operations.items())
+                    if stats.latency.count]
+            lines = [f"# HELP {PROMETHEUS_PREFIX}_seconds Backend operation latency.",
+                     f"# TYPE {PROMETHEUS_PREFIX}_seconds histogram"]
+            for label, name, stats in rows:
+                labels = f'backend="{label_value(label)}",operation="{label_value(name)}"'
+                bounds = [bound * 1e9 for bound in PROMETHEUS_BUCKETS]
+                for bound, seen in zip(PROMETHEUS_BUCKETS, stats.latency.cumulative(bounds)):
+                    lines.append(f'{PROMETHEUS_PREFIX}_seconds_bucket{{{labels},le="{bound:g}"}} {seen}')
+                lines.append(f'{PROMETHEUS_PREFIX}_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+                lines.append(f"{PROMETHEUS_PREFIX}_seconds_sum{{{labels}}} {stats.latency.total / 1e9:.9f}")
+                lines.append(f"{PROMETHEUS_PREFIX}_seconds_count{{{labels}}} {stats.latency.count}")
+            counters = [("errors", "Operations that raised.", "errors"),
+                        ("elements_touched", "Elements shifted, scanned or rebuilt.", "touched"),
+                        ("reallocations", "Storage reallocations.", "reallocations"),
+                        ("bytes_moved", "Bytes copied by storage reallocations.", "bytes_moved")]
+            if self.trace_allocations:
+                counters.append(("allocated_bytes", "Peak bytes allocated per call, summed.", "allocated_bytes"))
+            for metric, description, field in counters:
+                lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric}_total {description}")
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric}_total counter")
+                for label, name, stats in rows:
+                    labels = f'backend="{label_value(label)}",operation="{label_value(name)}"'
+                    lines.append(f"{PROMETHEUS_PREFIX}_{metric}_total{{{labels}}} {getattr(stats, field)}")
+        return "\n".join(lines) + "\n"
+
+    # Writes the snapshot to path: Prometheus text for .prom/.txt, JSON otherwise
+    def export(self, path):
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
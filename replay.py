@@ -0,0 +1,235 @@
+import argparse
+import json
+import sys
+import time
+
+from mita_backend import DATA_TYPES, STORAGE_KINDS, MitaInABox
+from profiling import Profiler
+
+# ==========================================
+#        HEADLESS OPERATION SCRIPTS
+# ==========================================
+# Replays a script of array operations against MitaInABox without Tk:
+#   python replay.py ops.txt                       (one operation per line)
+#   python replay.py ops.jsonl --results out.jsonl (also log every result)
+#   generate_ops | python replay.py -              (read the script from stdin)
+#   python replay.py ops.txt --profile ops.prom    (per-operation latency histograms, see profiling.py)
+# The script is streamed line by line, so millions of operations run in
+# constant memory. A line is either a JSON object or a DSL command:
+#   create 10 Integer 1,2,3   {"op": "create", "capacity": 10, "type": "Integer", "data": "1,2,3"}
+#   insert 7                  {"op": "insert", "value": "7"}
+#   resize_insert 7           {"op": "resize_insert", "value": "7"}   (grows when full)
+#   insert_at 0 7             {"op": "insert_at", "index": 0, "value": "7"}
+#   modify 2 9                {"op": "modify", "index": 2, "value": "9"}
+#   delete 0                  {"op": "delete", "index": 0}
+#   search 9                  {"op": "search", "value": "9"}
+#   clear                     {"op": "clear"}
+# In the DSL the last argument takes the rest of the line, so values may contain
+# spaces. Blank lines and lines starting with # are skipped.
+# Statuses are the backend's own ("OK" for success, "FULL", "INDEX_ERROR",
+# "TYPE_ERROR", "ORDER_ERROR"), plus "PARSE_ERROR" for lines that are not a valid
+# operation. The exit code is 1 when any operation did not return "OK".
+
+# Backend return value -> status (True means success, False a rejected value)
+def status_of(result):
+    if result is True:
+        return "OK"
+    return result or "TYPE_ERROR"
+
+def run_create(box, capacity, data_type, data=""):
+    if data_type not in DATA_TYPES:
+        return "PARSE_ERROR", f"unknown data type '{data_type}'"
+    is_valid, message = box.create_array(capacity, data, data_type, storage=box.storage_kind)
+    return ("OK", None) if is_valid else ("TYPE_ERROR", message)
+
+def run_insert(box, value):
+    if box.is_full():
+        return "FULL", None
+    return status_of(box.insert(value)), None
+
+def run_resize_insert(box, value):
+    return status_of(box.resize_and_insert(value)), None
+
+def run_insert_at(box, index, value):
+    return status_of(box.insert_at_specific_index(index, value)), None
+
+def run_modify(box, index, value):
+    return status_of(box.modify_at_index(index, value)), None
+
+def run_delete(box, index):
+    return status_of(box.delete_at_index(index)), None
+
+# Result is the index found, -1 when the value is absent
+def run_search(box, value):
+    if not box.converter(value)[0]:
+        return "TYPE_ERROR", None
+    return "OK", box.search(value)
+
+def run_clear(box):
+    box.clear()
+    return "OK", None
+
+# name -> (handler, argument names, how many are required); "index" and
+# "capacity" arguments are integers, the rest are passed through as given
+OPERATIONS = {
+    "create": (run_create, ("capacity", "type", "data"), 2),
+    "insert": (run_insert, ("value",), 1),
+    "resize_insert": (run_resize_insert, ("value",), 1),
+    "insert_at": (run_insert_at, ("index", "value"), 2),
+    "modify": (run_modify, ("index", "value"), 2),
+    "delete": (run_delete, ("index",), 1),
+    "search": (run_search, ("value",), 1),
+    "clear": (run_clear, (), 0),
+}
+INTEGER_ARGUMENTS = {"index", "capacity"}
+
+# Returns (operation name, handler, arguments); raises ValueError for a bad line
+def parse_line(line):
+    if line.startswith("{"):
+        try:
+            fields = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"invalid JSON: {error.msg}") from None
+        if not isinstance(fields, dict):
+            raise ValueError("expected a JSON object")
+        name = fields.get("op")
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}")
+        handler, names, required = OPERATIONS[name]
+        missing = [argument for argument in names[:required] if argument not in fields]
+        if missing:
+            raise ValueError(f"{name} needs {', '.join(missing)}")
+        arguments = [fields[argument] for argument in names if argument in fields]
+    else:
+        name = line.split(None, 1)[0]
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}")
+        handler, names, required = OPERATIONS[name]
+        arguments = line.split(None, len(names))[1:] # The last argument keeps its spaces
+        if len(arguments) < required:
+            raise ValueError(f"{name} needs {', '.join(names[len(arguments):required])}")
+
+    for position, argument in enumerate(names[:len(arguments)]):
+        if argument in INTEGER_ARGUMENTS:
+            value = arguments[position]
+            if isinstance(value, bool) or not isinstance(value, (int, str)):
+                raise ValueError(f"{argument} must be an integer")
+            try:
+                arguments[position] = int(value)
+            except ValueError:
+                raise ValueError(f"{argument} must be an integer, got {value!r}") from None
+    return name, handler, arguments
+
+# Per-operation counters: calls, seconds spent in the backend, {status: count}
+class Stats:
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+        self.statuses = {}
+        self.failures = 0
+
+    def add(self, name, status, elapsed):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+        statuses = self.statuses.setdefault(name, {})
+        statuses[status] = statuses.get(status, 0) + 1
+        if status != "OK":
+            self.failures += 1
+
+    def total(self):
+        return sum(self.calls.values())
+
+# Runs every line through the backend; report(number, name, status, result) sees each result
+def replay(lines, box, report=None, stop_on_error=False):
+    stats = Stats()
+    clock = time.perf_counter
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            name, handler, arguments = parse_line(line)
+        except ValueError as error:
+            name, status, result, elapsed = "invalid", "PARSE_ERROR", str(error), 0.0
+        else:
+            start = clock()
+            status, result = handler(box, *arguments)
+            elapsed = clock() - start
+        stats.add(name, status, elapsed)
+        if report is not None:
+            report(number, name, status, result)
+        if stop_on_error and status != "OK":
+            break
+    return stats
+
+def print_summary(stats, elapsed, out):
+    total = stats.total()
+    rate = f"{total / elapsed:,.1f} ops/s" if elapsed else "-"
+    print(f"Replayed {total:,} operations in {elapsed:.3f} s ({rate}), {stats.failures:,} not OK", file=out)
+    for name, calls in stats.calls.items():
+        seconds = stats.seconds[name]
+        backend_rate = f"{calls / seconds:>14,.1f}" if seconds else f"{'-':>14}"
+        statuses = ", ".join(f"{status} {count:,}" for status, count in stats.statuses[name].items())
+        print(f"{name:<14} {calls:>11,}  {backend_rate} ops/s  {statuses}", file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an operation script against MitaInABox without Tk.")
+    parser.add_argument("script", help="operation script (JSONL or DSL lines), - for stdin")
+    parser.add_argument("--results", help="write every result as JSONL to this file (- for stdout)")
+    parser.add_argument("--storage", choices=STORAGE_KINDS, default="contiguous", help="storage layout used by create")
+    parser.add_argument("--sorted", action="store_true", help="run the array in sorted mode")
+    parser.add_argument("--max-errors", type=int, default=10, help="failed operations echoed to stderr")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop at the first operation that is not OK")
+    parser.add_argument("--profile", help="write backend profiling data to this file (Prometheus text for .prom, JSON otherwise)")
+    args = parser.parse_args(argv)
+
+    box = MitaInABox()
+    box.storage_kind = args.storage
+    box.set_sorted(args.sorted)
+    profiler = None
+    if args.profile:
+        profiler = Profiler()
+        profiler.attach(box)
+    errors_shown = 0
+    results = None
+
+    def report(number, name, status, result):
+        nonlocal errors_shown
+        if results is not None:
+            results.write(json.dumps({"line": number, "op": name, "status": status, "result": result}) + "\n")
+        if status != "OK" and errors_shown < args.max_errors:
+            errors_shown += 1
+            detail = f" ({result})" if result is not None else ""
+            print(f"line {number}: {name} -> {status}{detail}", file=sys.stderr)
+
+    try:
+        script = sys.stdin if args.script == "-" else open(args.script, encoding="utf-8")
+    except OSError as error:
+        print(f"Could not open {args.script}: {error.strerror}", file=sys.stderr)
+        return 2
+    if args.results:
+        results = sys.stdout if args.results == "-" else open(args.results, "w", encoding="utf-8")
+
+    start = time.perf_counter()
+    try:
+        stats = replay(script, box, report, args.stop_on_error)
+    finally:
+        if script is not sys.stdin:
+            script.close()
+        if results is not None and results is not sys.stdout:
+            results.close()
+    elapsed = time.perf_counter() - start
+
+    if stats.failures > errors_shown:
+        print(f"... {stats.failures - errors_shown:,} more not OK", file=sys.stderr)
+    print_summary(stats, elapsed, sys.stderr if results is sys.stdout else sys.stdout)
+    if profiler is not None:
+        try:
+            profiler.export(args.profile)
+        except OSError as error:
+            print(f"Could not write {args.profile}: {error.strerror}", file=sys.stderr)
+            return 2
+    return 1 if stats.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import csv
+import math
+from collections import deque
+from itertools import islice
+
+from mita_backend import BULK_CHUNK, MitaInABox, infer_data_type, new_storage
+from parallel_scan import SCAN_OPERATORS
+
+# ==========================================
+#        COLUMNAR TABLE ENGINE
+# ==========================================
+# A Table is a set of named, typed MitaInABox columns sharing one row count.
+# Queries work column at a time instead of building a dict per row: filter
+# runs the parallel_scan kernels over each typed column buffer, sort and
+# group_by use C-level iteration (sorted keyed by list lookups, map):
+#
+#   pokemon = Table.from_csv("oldfilese/PokemonData.csv")
+#   pokemon.filter(("Generation", "<=", 3)).group_by("Type1", "Attack", "mean")
+#
+# filter, select and sort return a new Table and never modify the source.
+# A derived table only records the positions of its rows in the table that
+# owns the data; each column is materialized from there the first time a
+# later step reads it, and a projection shares the source columns outright.
+
+AGGREGATES = {
+    "count": len,
+    "sum": sum,
+    "mean": lambda values: math.fsum(values) / len(values),
+    "min": min,
+    "max": max,
+}
+
+# Wraps converted values in a MitaInABox sized exactly to them
+def make_column(data_type, values):
+    column = MitaInABox()
+    column.data_type = data_type
+    column.capacity = len(values)
+    column.array = new_storage(data_type, values, len(values))
+    return column
+
+# Consumes an iterator at C speed, for maps run only for their side effects
+def exhaust(iterator):
+    deque(iterator, maxlen=0)
+
+class Table:
+    def __init__(self):
+        self.types = {} # name -> data type, in column order
+        self.columns = {} # name -> MitaInABox, built on first use for derived tables
+        self.length = 0
+        self.source = None # (root table, row positions in it or None for all) for derived tables
+
+    # Builds a table from {name: (data_type, values)}; every list must be the same length
+    @classmethod
+    def from_lists(cls, columns):
+        table = cls()
+        for name, (data_type, values) in columns.items():
+            table.add_column(name, make_column(data_type, values))
+        return table
+
+    # Reads the whole file in one pass, BULK_CHUNK rows at a time. Column types are
+    # inferred from the first chunk unless given in `types`; `limit` caps the rows read.
+    @classmethod
+    def from_csv(cls, path, columns=None, types=None, limit=None):
+        types = dict(types or {})
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows = csv.reader(f)
+            header = [name.strip() for name in next(rows, [])]
+            names = list(columns or header)
+            missing = [name for name in names if name not in header]
+            if missing:
+                raise KeyError(f"columns not found: {', '.join(missing)}")
+            positions = [header.index(name) for name in names]
+            if limit is not None:
+                rows = islice(rows, limit)
+
+            values = {name: [] for name in names}
+            converter = MitaInABox()
+            while True:
+                chunk = list(islice(rows, BULK_CHUNK))
+                if not chunk:
+                    break
+                for name, position in zip(names, positions):
+                    tokens = [row[position].strip() for row in chunk]
+                    data_type = types.setdefault(name, infer_data_type(tokens))
+                    is_valid, result = converter.validate_and_convert_many(tokens, data_type)
+                    if not is_valid:
+                        row = len(values[name]) + result + 2 # Header is row 1
+                        raise ValueError(f"'{tokens[result]}' in row {row} of '{name}' is not a valid {data_type}")
+                    values[name] += result
+
+        return cls.from_lists({name: (types.get(name, "String"), values[name]) for name in names})
+
+    # Derived table holding rows[i] of parent as its row i (every row when rows is None).
+    # Positions are composed with the parent's own, so the source is always a root table.
+    @classmethod
+    def _derived(cls, parent, names, rows):
+        table = cls()
+        table.types = {name: parent.types[name] for name in names}
+        table.length = parent.length if rows is None else len(rows)
+        root, parent_rows = parent.source or (parent, None)
+        if parent_rows is not None and rows is not None:
+            rows = list(map(parent_rows.__getitem__, rows))
+        table.source = (root, parent_rows if rows is None else rows)
+        return table
+
+    def add_column(self, name, column):
+        if self.types and column.get_length() != self.length:
+            raise ValueError(f"column '{name}' has {column.get_length()} rows, expected {self.length}")
+        self.types[name] = column.data_type
+        self.columns[name] = column
+        self.length = column.get_length()
+
+    def column_names(self):
+        return list(self.types)
+
+    def data_type(self, name):
+        return self.types[name]
+
+    # The MitaInABox holding one column (shared with the source for projections; do not modify)
+    def column(self, name):
+        if name not in self.columns:
+            root, rows = self.source
+            self.columns[name] = root.column(name) if rows is None else make_column(self.types[name], self.values(name))
+        return self.columns[name]
+
+    # Decoded values of one column, as a new list; until the column is materialized
+    # they are gathered straight from the root's storage, decoding only the selected rows
+    # (or, when most rows are selected, decoding the column in order and picking from that)
+    def values(self, name):
+        if name not in self.columns and self.source and self.source[1] is not None:
+            root, rows = self.source
+            if 2 * len(rows) < root.length:
+                return root.column(name).get_data_at(rows)
+            values = root.values(name)
+            return list(map(values.__getitem__, rows))
+        return self.column(name).get_data()
+
+    def __len__(self):
+        return self.length
+
+    # First `limit` rows as tuples, in column order (for display)
+    def rows(self, limit=None):
+        stop = self.length if limit is None else min(limit, self.length)
+        return list(zip(*(self.values(name)[:stop] for name in self.types)))
+
+    # ---- Queries ----
+
+    # Keeps rows matching every (column, operator, value) condition
+    def filter(self, *conditions):
+        selected = None
+        for name, op, value in conditions:
+            if op not in SCAN_OPERATORS:
+                raise ValueError(f"unknown operator '{op}'")
+            # The first condition scans the whole column; later ones only check the rows still selected
+            selected = self.column(name).find_where(op, value, selected)
+            if selected is None:
+                raise ValueError(f"'{value}' is not a valid {self.types[name]} for '{name}'")
+        if selected is None:
+            return self.select(*self.types)
+        return Table._derived(self, self.types, selected)
+
+    # Projection: a table with only the named columns (nothing is copied)
+    def select(self, *names):
+        table = Table._derived(self, names, None)
+        for name in names:
+            if name in self.columns:
+                table.columns[name] = self.columns[name]
+        return table
+
+    # Stable sort by one column
+    def sort(self, name, descending=False):
+        values = self.values(name)
+        order = sorted(range(self.length), key=values.__getitem__, reverse=descending)
+        return Table._derived(self, self.types, order)
+
+    # Aggregates `column` per distinct value of `key`; returns {key: result} in key order
+    # (a dict rather than a Table since means have no array type to live in)
+    def group_by(self, key, column, aggregate="count"):
+        keys, values = self.values(key), self.values(column)
+        # One bucket per distinct key, filled by C-level list.append calls
+        buckets = {group: [] for group in sorted(dict.fromkeys(keys))}
+        exhaust(map(list.append, map(buckets.__getitem__, keys), values))
+        function = AGGREGATES[aggregate]
+        return {group: function(bucket) for group, bucket in buckets.items()}
@@ -1,175 +1,21 @@
-import customtkinter as ctk
-
-# ==========================================
-#            BACKEND ARRAY CLASS 
-# ==========================================
-
-class MitaInABox:
-    def __init__(self):
-        self.array = []
-        self.capacity = 0
-        self.data_type = "String" # Default data type
-
-    # Validates and converts input based on current data type
-    def validate_and_convert(self, value):
-        # Clean the input
-        value = str(value).strip()
-        
-        if self.data_type == "Integer":
-            # Check if it's a valid integer (handles negatives)
-            if value.lstrip('-').isdigit(): 
-                return True, int(value)
-            return False, None
-            
-        elif self.data_type == "Boolean":
-            val_lower = value.lower()
-            
-            # Define accepted True/False variations
-            true_values = {'true', '1', 'yes', 'on', 't', 'y'}
-            false_values = {'false', '0', 'no', 'off', 'f', 'n'}
-
-            if val_lower in true_values:
-                return True, True
-            if val_lower in false_values:
-                return True, False
-            
-            # If it doesn't match any known boolean flag
-            return False, None
-            
-        else: # String (Accepts anything)
-            return True, value
-
-    # Creates array with initial data and type validation
-    def create_array(self, capacity_input, raw_data_string, selected_type):
-        try:
-            self.capacity = int(capacity_input) if capacity_input else 1
-        except ValueError:
-            self.capacity = 1
+import time
+STARTUP_STARTED = time.perf_counter() # Before the other imports, so the startup report includes them
 
-        self.data_type = selected_type
-        self.array = []
-        
-        if raw_data_string and raw_data_string.strip():
-            raw_items = [x.strip() for x in raw_data_string.split(',')]
-            valid_items = []
-            
-            # Validate all initial items
-            for item in raw_items:
-                is_valid, converted = self.validate_and_convert(item)
-                if not is_valid:
-                    return False, f"'{item}' is not a valid {self.data_type}"
-                valid_items.append(converted)
-            
-            # Truncate if too long
-            self.array = valid_items[:self.capacity]
-            
-        return True, "Success"
-
-    # Check if array is full
-    def is_full(self):
-        return len(self.array) >= self.capacity
+import customtkinter as ctk
+import csv
+import heapq
+import os
+import queue
+import threading
+import tkinter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import filedialog
 
-    # Insert without resizing
-    def insert(self, item):
-        is_valid, converted = self.validate_and_convert(item)
-        if not is_valid:
-            return False
-        self.array.append(converted)
-        return True
+from mita_backend import DATA_TYPES, Workspace, csv_columns
+from profiling import Profiler
 
-    # Resize and insert (dynamic array behavior)
-    def resize_and_insert(self, item):
-        is_valid, converted = self.validate_and_convert(item)
-        if not is_valid:
-            return False
-        
-        self.capacity *= 2
-        self.array.append(converted)
-        return True
-
-    # Accessors
-    def get_data(self):
-        return self.array
-    
-    def get_capacity(self):
-        return self.capacity
-    
-    def get_value_at(self, index):
-        return self.array[index] if 0 <= index < len(self.array) else None
-    
-    def get_first_value(self):
-        return self.array[0] if self.array else None
-    
-    def get_last_value(self):
-        return self.array[-1] if self.array else None
-    
-    def get_length(self): 
-        return len(self.array)
-    
-    def clear(self):
-        self.array = []
-    
-    # Modify value at specific index
-    def modify_at_index(self, index, value):
-        is_valid, converted = self.validate_and_convert(value)
-        if not is_valid:
-            return "TYPE_ERROR"
-
-        if 0 <= index < len(self.array):
-            self.array[index] = converted
-            return True
-        return "INDEX_ERROR"
-    
-    # Delete at specific index    
-    def delete_at_index(self, index):
-        if 0 <= index < len(self.array):
-            self.array.pop(index)
-            return True
-        return "INDEX_ERROR"
-    
-    # Insert at specific index
-    def insert_at_specific_index(self, index, value):
-        if len(self.array) >= self.capacity:
-            return "FULL"
-        
-        is_valid, converted = self.validate_and_convert(value)
-        if not is_valid:
-            return "TYPE_ERROR"
-
-        if 0 <= index <= len(self.array):
-            self.array.insert(index, converted)
-            return True
-        return "INDEX_ERROR"
-    
-    # Search for value in the array
-    def search(self, value):
-        is_bool_mode = self.data_type == "Boolean" or (len(self.array) > 0 and isinstance(self.array[0], bool))
-
-        if is_bool_mode:
-            val_str = str(value).lower()
-            true_values = {'true', '1', 'yes', 'on', 't', 'y'}
-            false_values = {'false', '0', 'no', 'off', 'f', 'n'}
-
-            target = None
-            if val_str in true_values:
-                target = True
-            elif val_str in false_values:
-                target = False
-
-            if target is not None:
-                try:
-                    return self.array.index(target)
-                except ValueError:
-                    return -1
-            else:
-                return -1
-
-        is_valid, converted = self.validate_and_convert(value)
-        if not is_valid: return -1
-        try:
-            return self.array.index(converted)
-        except ValueError:
-            return -1
+STARTUP_IMPORTED = time.perf_counter() # Imports done (see report_startup)
 
 # ==========================================
 #        GUI CLASS (FRONTEND)
@@ -201,42 +47,593 @@ class ArrayCard(ctk.CTkFrame):
 
         super().configure(**kwargs)
 
+# Largest capacity the setup entry accepts (the grid only builds widgets for the viewport)
+MAX_CAPACITY = 1_000_000
+
+# Virtualized grid of ArrayCards: only the rows in the viewport own widgets,
+# and the same pool of cards is repainted as the user scrolls.
+class ArrayGrid(ctk.CTkFrame):
+    COLUMNS = 10
+    VISIBLE_ROWS = 4
+
+    FILLED_STYLE = {"fg_color": "#3B8ED0", "text_color": "white", "border_color": "#2c6e91"}
+    EMPTY_STYLE = {"fg_color": ("gray90", "#3A3A3A"), "text_color": ("gray60", "gray60"), "border_color": ("gray70", "#505050")}
+
+    def __init__(self, master, label_text="Current Array", **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.values = []
+        self.display = str # Formats a value for its card
+        self.capacity = 0
+        self.first_row = 0
+        self.overrides = {} # slot -> style layered over the base style (highlights, animations)
+        self.filled_color = None
+        self.pool = [] # [card, index label, slot shown, style applied]
+        self.held = False # While held, repaints collect until flush()
+        self.pending_slots = set()
+        self.pending_full = False
+
+        ctk.CTkLabel(self, text=label_text, font=("Arial", 12, "bold")).pack(anchor="center", pady=(0, 10))
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(anchor="center")
+        self.box_container = ctk.CTkFrame(body, fg_color="transparent")
+        self.box_container.pack(side="left")
+        self.scrollbar = ctk.CTkScrollbar(body, orientation="vertical", command=self._on_scrollbar)
+
+        # Same approach as CTkScrollableFrame: one global wheel binding filtered by widget
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind_all(sequence, self._on_wheel, add=True)
+
+    # Shows a new sequence (anything with len() and indexing) in `capacity` slots
+    def show(self, values, capacity, display=str):
+        self.values = values
+        self.display = display
+        self.overrides.clear()
+        self.filled_color = None
+        self.set_capacity(capacity)
+
+    # Changes the slot count while keeping values and highlights
+    def set_capacity(self, capacity):
+        self.capacity = capacity
+        if self._total_rows() > self.VISIBLE_ROWS:
+            self.scrollbar.pack(side="left", fill="y", padx=(10, 0))
+        else:
+            self.scrollbar.pack_forget()
+        self._scroll_to_row(self.first_row)
+
+    # Repaints the visible slots from the current values
+    def refresh(self):
+        for entry in self.pool:
+            entry[3] = None
+        self._repaint()
+
+    # Repaints visible slots in [start, stop); cards whose content is unchanged are skipped
+    def refresh_range(self, start, stop):
+        first_slot = self.first_row * self.COLUMNS
+        for slot in range(max(start, first_slot), min(stop, first_slot + len(self.pool), self.capacity)):
+            self._repaint_slot(slot)
+
+    def paint(self, slot, **style):
+        self.overrides[slot] = {**self.overrides.get(slot, {}), **style}
+        self._repaint_slot(slot)
+
+    def unpaint(self, slot):
+        if self.overrides.pop(slot, None) is not None:
+            self._repaint_slot(slot)
+
+    # Drops every highlight and animation color
+    def clear_highlights(self):
+        self.overrides.clear()
+        self.filled_color = None
+        self._repaint()
+
+    # Batches repaints: changes made while held reach the cards once, on flush
+    def hold(self):
+        self.held = True
+
+    def flush(self):
+        self.held = False
+        if self.pending_full:
+            self._repaint()
+        else:
+            for slot in self.pending_slots:
+                self._repaint_slot(slot)
+        self.pending_slots.clear()
+        self.pending_full = False
+
+    # Temporarily recolors every filled slot (None restores the default)
+    def highlight_filled(self, color):
+        self.filled_color = color
+        self._repaint()
+
+    # Scrolls just enough to bring a slot into the viewport
+    def scroll_to(self, slot):
+        row = slot // self.COLUMNS
+        if row < self.first_row:
+            self._scroll_to_row(row)
+        elif row >= self.first_row + self.VISIBLE_ROWS:
+            self._scroll_to_row(row - self.VISIBLE_ROWS + 1)
+
+    # Card currently showing a slot, or None when it is scrolled out of view
+    def card_at(self, slot):
+        k = slot - self.first_row * self.COLUMNS
+        if 0 <= slot < self.capacity and 0 <= k < len(self.pool):
+            return self.pool[k][0]
+        return None
+
+    # ---- internals ----
+    def _total_rows(self):
+        return -(-self.capacity // self.COLUMNS)
+
+    def _scroll_to_row(self, row):
+        total = self._total_rows()
+        visible = min(self.VISIBLE_ROWS, total)
+        self.first_row = max(0, min(row, total - visible))
+        if total:
+            self.scrollbar.set(self.first_row / total, (self.first_row + visible) / total)
+        self._repaint()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to_row(round(float(amount) * self._total_rows()))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self._scroll_to_row(self.first_row + int(amount) * step)
+
+    def _on_wheel(self, event):
+        own_path, widget_path = str(self), str(event.widget)
+        if not self.winfo_exists() or not (widget_path == own_path or widget_path.startswith(own_path + ".")):
+            return
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self._scroll_to_row(self.first_row + (-1 if up else 1))
+
+    def _ensure_pool(self, count):
+        while len(self.pool) < count:
+            k = len(self.pool)
+            card = ArrayCard(self.box_container, width=60, height=85, border_width=2, corner_radius=8)
+            idx_lbl = ctk.CTkLabel(self.box_container, text="", font=("Arial", 11, "bold"), text_color=("gray40", "gray80"))
+            self.pool.append([card, idx_lbl, None, None])
+            card.grid(row=k // self.COLUMNS, column=k % self.COLUMNS, padx=5, pady=(0, 30))
+            idx_lbl.place(in_=card, relx=0.5, rely=1.0, y=14, anchor="center")
+
+    def _style(self, slot):
+        if slot < len(self.values):
+            style = dict(self.FILLED_STYLE, text=self.display(self.values[slot]))
+            if self.filled_color:
+                style["fg_color"] = self.filled_color
+        else:
+            style = dict(self.EMPTY_STYLE, text="")
+        style.update(self.overrides.get(slot, {}))
+        return style
+
+    def _repaint(self):
+        if self.held:
+            self.pending_full = True
+            return
+        first_slot = self.first_row * self.COLUMNS
+        visible = min(self.capacity - first_slot, self.VISIBLE_ROWS * self.COLUMNS)
+        self._ensure_pool(visible)
+
+        for k, entry in enumerate(self.pool):
+            card, idx_lbl = entry[0], entry[1]
+            if k >= visible:
+                if entry[2] is not None:
+                    card.grid_remove()
+                    idx_lbl.place_forget()
+                    entry[2] = entry[3] = None
+                continue
+            if entry[2] is None:
+                card.grid()
+                idx_lbl.place(in_=card, relx=0.5, rely=1.0, y=14, anchor="center")
+            self._apply(entry, first_slot + k)
+
+    def _repaint_slot(self, slot):
+        if self.held:
+            self.pending_slots.add(slot)
+            return
+        k = slot - self.first_row * self.COLUMNS
+        if 0 <= slot < self.capacity and 0 <= k < len(self.pool) and self.pool[k][2] is not None:
+            self._apply(self.pool[k], slot)
+
+    # Configures a pooled card only when what it shows actually changed
+    def _apply(self, entry, slot):
+        style = self._style(slot)
+        if style != entry[3]:
+            entry[0].configure(**style)
+            entry[3] = style
+        if slot != entry[2]:
+            entry[1].configure(text=str(slot))
+            entry[2] = slot
+
+# Resize and search animations longer than this animate a sample, then jump to the result
+ANIMATION_SAMPLE = 12
+
+# One scheduler for every animation. A single per-frame tick runs all steps
+# that are due, and grid paints made within a frame are flushed as one update.
+class Animator:
+    FRAME_MS = 16
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.speed = 1.0
+        self.clock = 0.0 # Animation time in ms, advanced by ticks at `speed`
+        self.queue = [] # Heap of (due time, order, callback)
+        self.order = 0
+        self.grids = []
+        self.tick_id = None
+        self.last_tick = None
+
+    # Grids whose paints should be batched per frame
+    def attach(self, grid):
+        if grid not in self.grids:
+            self.grids.append(grid)
+
+    def schedule(self, delay_ms, callback):
+        heapq.heappush(self.queue, (self.clock + delay_ms, self.order, callback))
+        self.order += 1
+        if self.tick_id is None:
+            self.last_tick = time.perf_counter()
+            self.tick_id = self.widget.after(self.FRAME_MS, self._tick)
+
+    # Skip to end: run every pending step (and the steps they schedule) right away
+    def finish(self):
+        if self.tick_id is not None:
+            self.widget.after_cancel(self.tick_id)
+            self.tick_id = None
+        self._run_due(float("inf"))
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.clock += (now - self.last_tick) * 1000 * self.speed
+        self.last_tick = now
+        self._run_due(self.clock)
+        self.tick_id = self.widget.after(self.FRAME_MS, self._tick) if self.queue else None
+
+    def _run_due(self, until):
+        self.grids = [grid for grid in self.grids if grid.winfo_exists()]
+        held = list(self.grids)
+        for grid in held:
+            grid.hold()
+        try:
+            while self.queue and self.queue[0][0] <= until:
+                due, _, callback = heapq.heappop(self.queue)
+                self.clock = max(self.clock, due)
+                try:
+                    callback()
+                except tkinter.TclError:
+                    pass # A step on a destroyed widget must not stop the others
+        finally:
+            for grid in held:
+                if grid.winfo_exists():
+                    grid.flush()
+
+# Handle passed to background work: reports progress and carries the cancel flag
+class Task:
+    REPORT_INTERVAL = 0.05 # Seconds between progress events sent to the UI
+
+    def __init__(self, task_id, events):
+        self.task_id = task_id
+        self.events = events
+        self.cancelled = threading.Event()
+        self.last_report = 0.0
+
+    # Called on the worker thread; returns False once the task was cancelled
+    def report(self, done, total):
+        now = time.perf_counter()
+        if now - self.last_report >= self.REPORT_INTERVAL or done >= total:
+            self.last_report = now
+            self.events.put((self.task_id, "progress", done / total if total else 1.0))
+        return not self.cancelled.is_set()
+
+    def cancel(self):
+        self.cancelled.set()
+
+# Runs backend work on a worker pool. Results and progress come back through a
+# thread-safe queue that the Tk loop drains, so callbacks always run on the UI thread.
+# One worker by default: the backends are not thread-safe, so operations stay serialized.
+class TaskRunner:
+    POLL_MS = 30
+
+    def __init__(self, widget, max_workers=1):
+        self.widget = widget
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="backend")
+        self.events = queue.Queue()
+        self.tasks = {} # task id -> (Task, callbacks)
+        self.next_id = 0
+        self.poll_id = None
+
+    # work(task) runs on the worker; the callbacks run on the Tk thread
+    def submit(self, work, on_done, on_error=None, on_cancel=None, on_progress=None):
+        task = Task(self.next_id, self.events)
+        self.next_id += 1
+        self.tasks[task.task_id] = (task, on_done, on_error, on_cancel, on_progress)
+
+        def run():
+            if task.cancelled.is_set():
+                self.events.put((task.task_id, "cancelled", None))
+                return
+            try:
+                self.events.put((task.task_id, "done", work(task)))
+            except Exception as error:
+                self.events.put((task.task_id, "error", error))
+
+        self.pool.submit(run)
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(self.POLL_MS, self._poll)
+        return task
+
+    def busy(self):
+        return bool(self.tasks)
+
+    def cancel_all(self):
+        for task, *_ in self.tasks.values():
+            task.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        while True:
+            try:
+                task_id, kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if task_id not in self.tasks:
+                continue
+            task, on_done, on_error, on_cancel, on_progress = self.tasks[task_id]
+            if kind == "progress":
+                if on_progress: on_progress(payload)
+                continue
+
+            del self.tasks[task_id]
+            if kind == "done":
+                on_done(payload)
+            elif kind == "error" and on_error:
+                on_error(payload)
+            elif kind == "cancelled" and on_cancel:
+                on_cancel()
+        self.poll_id = self.widget.after(self.POLL_MS, self._poll) if self.tasks else None
+
+# Widget churn sampled by walking the widget tree on every overlay refresh: the
+# widgets that appeared or went away since the previous walk. Nothing in tkinter
+# is patched, so a widget created and destroyed between two walks is not seen.
+class WidgetCounter:
+    def __init__(self):
+        self.created = 0
+        self.destroyed = 0
+        self.seen = set()
+
+    def reset(self, root):
+        self.created = self.destroyed = 0
+        self.seen = live_widgets(root)
+
+    # Updates the churn counts and returns how many widgets are alive
+    def sample(self, root):
+        live = live_widgets(root)
+        self.created += len(live - self.seen)
+        self.destroyed += len(self.seen - live)
+        self.seen = live
+        return len(live)
+
+# Every widget under a widget (itself included), via winfo_children
+def live_widgets(widget):
+    found, pending = set(), [widget]
+    while pending:
+        widget = pending.pop()
+        found.add(widget)
+        pending.extend(widget.winfo_children())
+    return found
+
+# Toggleable overlay for spotting regressions while using the tool: the last
+# backend operation and its time, the last repaint, widget churn and the
+# event-loop lag measured by an `after` probe. The profiler, the widget counter
+# and the probe only run while it is shown.
+class PerformanceOverlay(ctk.CTkFrame):
+    REFRESH_MS = 500
+    PROBE_MS = 50
+    LAG_WINDOW = 40 # Probes the max lag is taken over (about 2 s)
+
+    def __init__(self, master, visualizer):
+        super().__init__(master, fg_color=("gray85", "gray17"), corner_radius=8)
+        self.visualizer = visualizer
+        self.backend = None # Backend the profiler is attached to while shown
+        self.profiler = Profiler()
+        self.widgets = WidgetCounter()
+        self.lags = deque(maxlen=self.LAG_WINDOW)
+        self.probe_due = 0.0
+        self.refresh_id = self.probe_id = None
+        self.label = ctk.CTkLabel(self, text="", font=("Courier", 12), justify="left", anchor="w")
+        self.label.pack(padx=10, pady=6)
+
+    def start(self):
+        if self.refresh_id is not None:
+            return
+        self.profiler.reset()
+        self.backend = self.visualizer.backend
+        self.profiler.attach(self.backend)
+        self.widgets.reset(self.winfo_toplevel())
+        self.lags.clear()
+        self.place(relx=1.0, x=-10, y=10, anchor="ne")
+        self.lift()
+        self.probe_due = time.perf_counter() + self.PROBE_MS / 1000
+        self.probe_id = self.after(self.PROBE_MS, self._probe)
+        self._refresh()
+
+    def stop(self):
+        for after_id in (self.refresh_id, self.probe_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.refresh_id = self.probe_id = None
+        if self.backend is not None:
+            self.profiler.detach(self.backend)
+            self.backend = None
+        self.widgets.seen = set() # Drops the references to widgets that are gone
+        self.place_forget()
+
+    def destroy(self):
+        self.stop()
+        super().destroy()
+
+    # Moves the profiler to the array that took the focus
+    def follow(self, backend):
+        if self.backend is not None:
+            self.profiler.detach(self.backend)
+            self.backend = backend
+            self.profiler.attach(backend)
+
+    # How late the loop ran a callback that was due PROBE_MS after the previous one
+    def _probe(self):
+        now = time.perf_counter()
+        self.lags.append(max(0.0, now - self.probe_due))
+        self.probe_due = now + self.PROBE_MS / 1000
+        self.probe_id = self.after(self.PROBE_MS, self._probe)
+
+    def _refresh(self):
+        last = self.profiler.last
+        backend = f"{last[1]} {last[2] * 1000:.2f} ms" if last else "-"
+        render = self.visualizer.last_render
+        lag = f"{self.lags[-1] * 1000:.0f} ms (max {max(self.lags) * 1000:.0f} ms)" if self.lags else "-"
+        live = self.widgets.sample(self.winfo_toplevel())
+        self.label.configure(text="\n".join((
+            f"Backend   {backend}",
+            f"Render    {render * 1000:.2f} ms" if render is not None else "Render    -",
+            f"Widgets   {live:,} live",
+            f"Churn     +{self.widgets.created:,} / -{self.widgets.destroyed:,} since shown",
+            f"Loop lag  {lag}",
+        )))
+        self.refresh_id = self.after(self.REFRESH_MS, self._refresh)
+
+# One long-lived notification bar instead of a popup window per message. The
+# status line is reconfigured in place and the history (bounded, scrollable)
+# is only built when opened. Messages arriving within MIN_INTERVAL_MS of the
+# last update are shown together on the next one, and a message repeating the
+# previous one only bumps its count.
+class Notifier(ctk.CTkFrame):
+    MIN_INTERVAL_MS = 150
+    FADE_MS = 4000 # The status line dims once a message has been up this long
+    HISTORY = 200
+    COLORS = {False: "#2CC985", True: "#FF5555"} # Success / error
+    FADED_COLOR = ("gray50", "gray60")
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.history = deque(maxlen=self.HISTORY) # [time, title, message, is_error, count]
+        self.batch = [] # History entries added or repeated since the last update
+        self.last_update = 0.0
+        self.update_id = self.fade_id = None
+        self.history_box = None
+
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x")
+        self.label = ctk.CTkLabel(bar, text="", font=("Arial", 14, "bold"), anchor="w")
+        self.label.pack(side="left", fill="x", expand=True)
+        self.history_btn = ctk.CTkButton(bar, text="History ▸", command=self.toggle_history, fg_color="#7F8C8D", width=90)
+        self.history_btn.pack(side="right")
+
+    def notify(self, title, message, is_error=False):
+        last = self.history[-1] if self.history else None
+        if last is not None and last[1:4] == [title, message, is_error]:
+            last[0] = time.time()
+            last[4] += 1
+            if last not in self.batch:
+                self.batch.append(last)
+        else:
+            self.history.append([time.time(), title, message, is_error, 1])
+            self.batch.append(self.history[-1])
+        if self.update_id is None:
+            wait = self.last_update + self.MIN_INTERVAL_MS / 1000 - time.perf_counter()
+            self.update_id = self.after(max(0, int(wait * 1000)), self._update)
+
+    # Shows the newest error of the batch (or its newest message) and how many more arrived
+    def _update(self):
+        self.update_id = None
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        entry = next((entry for entry in reversed(batch) if entry[3]), batch[-1])
+        text = f"{entry[1]} — {entry[2]}".replace("\n", " ")
+        if entry[4] > 1:
+            text += f" (×{entry[4]})"
+        if len(batch) > 1:
+            text += f"   +{len(batch) - 1} more"
+        self.label.configure(text=text, text_color=self.COLORS[entry[3]])
+        self.last_update = time.perf_counter()
+        if self.fade_id is not None:
+            self.after_cancel(self.fade_id)
+        self.fade_id = self.after(self.FADE_MS, self._fade)
+        if self.history_box is not None and self.history_box.winfo_manager():
+            self._fill_history()
+
+    def _fade(self):
+        self.fade_id = None
+        self.label.configure(text_color=self.FADED_COLOR)
+
+    def toggle_history(self):
+        if self.history_box is None:
+            self.history_box = ctk.CTkTextbox(self, height=120, font=("Courier", 12), state="disabled")
+        if self.history_box.winfo_manager():
+            self.history_box.pack_forget()
+            self.history_btn.configure(text="History ▸")
+        else:
+            self._fill_history()
+            self.history_box.pack(fill="x", pady=(5, 0))
+            self.history_btn.configure(text="History ▾")
+
+    def _fill_history(self):
+        lines = []
+        for stamp, title, message, is_error, count in self.history:
+            repeat = f" (×{count})" if count > 1 else ""
+            lines.append(f"{time.strftime('%H:%M:%S', time.localtime(stamp))} {'!' if is_error else ' '} "
+                         f"{title} — {message}{repeat}".replace("\n", " "))
+        box = self.history_box
+        box.configure(state="normal")
+        box.delete("1.0", "end")
+        box.insert("end", "\n".join(lines))
+        box.configure(state="disabled")
+        box.see("end")
+
+    def destroy(self):
+        for after_id in (self.update_id, self.fade_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        super().destroy()
+
 class MitaVisualizer(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         
-        self.backend = MitaInABox()
-        self.current_box_objects = [] 
+        # Every array lives in the workspace; self.backend is the one in focus and
+        # the only one drawn (the grid is reused, other arrays own no widgets)
+        self.workspace = Workspace(setup=self._setup_backend)
+        self.workspace.add("Array")
+        self.backend = self.workspace.current()
+        self.array_grid = None # Built on the first render
+        self.last_render = None # Seconds the last apply_changes took
+        self.overlay = None # PerformanceOverlay, built when first shown
+        self.animator = Animator(self)
+        self.tasks = TaskRunner(self)
 
         self._setup_layout()
 
-    # --- NEW: CUSTOM POPUP FUNCTION ---
-    def show_popup(self, title, message, is_error=False):
-        # Create a Toplevel window (popup)
-        popup = ctk.CTkToplevel(self)
-        popup.title(title)
-        popup.geometry("350x180")
-        popup.resizable(False, False)
-        
-        # Ensure it stays on top and grabs focus (Modal)
-        popup.attributes("-topmost", True)
-        popup.grab_set() 
-        
-        # Determine text color based on error state
-        msg_color = "#FF5555" if is_error else "#2CC985" # Red or Green
-        
-        # Message Label
-        label = ctk.CTkLabel(popup, text=message, font=("Arial", 16, "bold"), 
-                             wraplength=300, text_color=msg_color)
-        label.pack(expand=True, padx=20, pady=20)
-        
-        # OK Button
-        btn = ctk.CTkButton(popup, text="OK", command=popup.destroy, width=100, fg_color=msg_color, text_color="white")
-        btn.pack(pady=(0, 20))
+    # Messages go to the notification bar; nothing waits for the user to close them
+    def notify(self, title, message, is_error=False):
+        self.notifier.notify(title, message, is_error)
+
+    @staticmethod
+    def _setup_backend(box):
+        box.track_changes(True)
+        box.set_history(True)
+
+    def destroy(self):
+        self.tasks.shutdown()
+        if self.overlay is not None:
+            self.overlay.stop()
+        super().destroy()
 
     def _setup_layout(self):
         controls_frame = ctk.CTkFrame(self, fg_color="transparent")
         controls_frame.pack(anchor="n", padx=20, pady=10, fill="x")
+        self.controls_frame = controls_frame
 
         # 1. LEFT FRAME (Setup)
         left_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
@@ -244,15 +641,24 @@ class MitaVisualizer(ctk.CTkFrame):
 
         ctk.CTkLabel(left_frame, text="Setup Array", font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w")
 
+        # Workspace: pick the array in focus, add an empty one, clone or remove it
+        self.array_menu = ctk.CTkOptionMenu(left_frame, values=self.workspace.names(), command=self.switch_array, width=140)
+        self.array_menu.pack(anchor="w", pady=(5, 0))
+        workspace_frame = ctk.CTkFrame(left_frame, fg_color="transparent")
+        workspace_frame.pack(anchor="w", pady=(4, 0))
+        ctk.CTkButton(workspace_frame, text="New", command=self.new_array, fg_color="#16A085", width=44).pack(side="left")
+        ctk.CTkButton(workspace_frame, text="Clone", command=self.clone_array, fg_color="#16A085", width=44).pack(side="left", padx=4)
+        ctk.CTkButton(workspace_frame, text="Remove", command=self.remove_array, fg_color="#C0392B", width=44).pack(side="left")
+
         def arrlength_validation(P):
-            return P == "" or (P.isdigit() and 1 <= int(P) <= 10)
+            return P == "" or (P.isdigit() and 1 <= int(P) <= MAX_CAPACITY)
         vcmd = (self.register(arrlength_validation), '%P')
         self.array_length_var = ctk.StringVar(value="5")
 
-        ctk.CTkLabel(left_frame, text="Capacity (1-10):").pack(anchor="w", pady=(5,0))
+        ctk.CTkLabel(left_frame, text=f"Capacity (1-{MAX_CAPACITY:,}):").pack(anchor="w", pady=(5,0))
         ctk.CTkEntry(left_frame, width=140, validate="key", validatecommand=vcmd, textvariable=self.array_length_var).pack(anchor="w")
 
-        self.data_type_menu = ctk.CTkOptionMenu(left_frame, values=["String", "Integer", "Boolean"])
+        self.data_type_menu = ctk.CTkOptionMenu(left_frame, values=list(DATA_TYPES))
         self.data_type_menu.set("String")
         self.data_type_menu.pack(anchor="w", pady=(5, 0))
 
@@ -262,6 +668,15 @@ class MitaVisualizer(ctk.CTkFrame):
 
         ctk.CTkButton(left_frame, text="Create / Reset", command=self.create_array, fg_color="green").pack(anchor="w", pady=(15, 0))
 
+        # Less-used options live in a panel that is only built when first opened;
+        # their variables exist from the start so the handlers can always read them
+        self.storage_var = ctk.StringVar(value="Contiguous")
+        self.sorted_var = ctk.BooleanVar(value=False)
+        self.overlay_var = ctk.BooleanVar(value=False)
+        self.options_frame = None
+        self.options_btn = ctk.CTkButton(left_frame, text="More Options ▸", command=self.toggle_options, fg_color="#7F8C8D", width=140)
+        self.options_btn.pack(anchor="w", pady=(5, 0))
+
         ctk.CTkFrame(controls_frame, width=2, fg_color="gray80").pack(side="left", fill="y", padx=20, pady=10)
 
         # 2. MIDDLE FRAME
@@ -290,6 +705,18 @@ class MitaVisualizer(ctk.CTkFrame):
         ctk.CTkButton(modify_frame, text="Delete Index", command=self.delete_index, fg_color="#C0392B", width=120).pack(pady=2)
         ctk.CTkButton(modify_frame, text="Clear Elements", command=self.clear_elements, fg_color="#7F8C8D", width=120).pack(pady=2)
 
+        history_frame = ctk.CTkFrame(modify_frame, fg_color="transparent")
+        history_frame.pack(pady=2)
+        self.undo_btn = ctk.CTkButton(history_frame, text="Undo", command=self.undo, fg_color="#34495E", width=58)
+        self.undo_btn.pack(side="left")
+        self.redo_btn = ctk.CTkButton(history_frame, text="Redo", command=self.redo, fg_color="#34495E", width=58)
+        self.redo_btn.pack(side="left", padx=(4, 0))
+        # Shortcuts go through the buttons so they are ignored while the controls are locked
+        top = self.winfo_toplevel()
+        for sequence, button in (("<Control-z>", self.undo_btn), ("<Control-y>", self.redo_btn), ("<Control-Z>", self.redo_btn)):
+            top.bind(sequence, lambda event, button=button: button.invoke(), add=True)
+        top.bind("<F12>", lambda event: (self.overlay_var.set(not self.overlay_var.get()), self.toggle_overlay()), add=True)
+
         ctk.CTkFrame(controls_frame, width=2, fg_color="gray80").pack(side="left", fill="y", padx=20, pady=10)
 
         # 3. RIGHT FRAME
@@ -306,167 +733,391 @@ class MitaVisualizer(ctk.CTkFrame):
         self.insert_btn = ctk.CTkButton(right_frame, text="Append Element", command=self.insert_element)
         self.insert_btn.pack(anchor="w", pady=(10,0))
 
-        # 4. VISUALIZATION FRAME AREA 
+        ctk.CTkLabel(right_frame, text="Animation Speed:").pack(anchor="w", pady=(10,0))
+        speed_menu = ctk.CTkOptionMenu(right_frame, values=["0.5x", "1x", "2x", "4x"], width=140, command=self.set_animation_speed)
+        speed_menu.set("1x")
+        speed_menu.pack(anchor="w")
+        ctk.CTkButton(right_frame, text="Skip Animation", command=self.animator.finish, fg_color="#7F8C8D", width=140).pack(anchor="w", pady=(5,0))
+
+        # 4. NOTIFICATIONS (packed before the visual frame so it keeps its row at the bottom)
+        self.notifier = Notifier(self)
+        self.notifier.pack(side="bottom", fill="x", padx=20, pady=(0, 10))
+
+        # 5. VISUALIZATION FRAME AREA 
         self.visual_frame = ctk.CTkFrame(self, fg_color=("white", "#2B2B2B"), corner_radius=10)
         self.visual_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
         # REMOVED: self.status_label
 
+        self.busy_frame = None # Progress indicator, built by the first background operation
+
         self.visual_inner_frame = ctk.CTkFrame(self.visual_frame, fg_color="transparent")
         self.visual_inner_frame.pack(fill="x", padx=20, pady=20)
 
 
-    # VISUAL FUNCTIONS
-    def render_array(self, target_frame, data_list, capacity, label_text="Current Array"):
-        for widget in target_frame.winfo_children():
-            widget.destroy()
-
-        lbl = ctk.CTkLabel(target_frame, text=label_text, font=("Arial", 12, "bold"))
-        lbl.pack(anchor="center", pady=(0, 10))
-
-        box_container = ctk.CTkFrame(target_frame, fg_color="transparent")
-        box_container.pack(anchor="center")
+    # BACKGROUND OPERATIONS
+    # Runs work(task) on the worker while the controls are locked; on_done gets its result.
+    # Only for slow work (create, save, CSV load, search); single edits stay on the UI thread.
+    def run_backend(self, label, work, on_done):
+        self.animator.finish() # Animations read the backend, so let them complete first
+        self._set_busy(label)
+
+        def done(result):
+            self._set_busy(None)
+            on_done(result)
+
+        # The work may have changed the backend before it stopped, so redraw what it recorded
+        def failed(error):
+            self._set_busy(None)
+            self.apply_changes()
+            self.notify("Error", f"{label} failed: {error}", is_error=True)
+
+        def cancelled():
+            self._set_busy(None)
+            self.apply_changes()
+            self.notify("Cancelled", f"{label} cancelled.", is_error=True)
+
+        self.tasks.submit(work, done, failed, cancelled, self.progress_bar.set)
+
+    # Storage layout, sorted mode and file operations
+    def _build_options(self):
+        options_frame = ctk.CTkFrame(self.options_btn.master, fg_color="transparent")
+
+        # Storage layout: compact contiguous slots, or a gap buffer for edits around one spot
+        ctk.CTkOptionMenu(options_frame, values=["Contiguous", "Gap Buffer"], variable=self.storage_var).pack(anchor="w", pady=(5, 0))
+        ctk.CTkSwitch(options_frame, text="Keep Sorted", variable=self.sorted_var, command=self.toggle_sorted).pack(anchor="w", pady=(10, 0))
+        ctk.CTkSwitch(options_frame, text="Perf Overlay (F12)", variable=self.overlay_var, command=self.toggle_overlay).pack(anchor="w", pady=(5, 0))
+
+        file_frame = ctk.CTkFrame(options_frame, fg_color="transparent")
+        file_frame.pack(anchor="w", pady=(10, 0))
+        ctk.CTkButton(file_frame, text="Save", command=self.save_array, fg_color="#2980B9", width=68).pack(side="left")
+        ctk.CTkButton(file_frame, text="Load", command=self.load_array, fg_color="#2980B9", width=68).pack(side="left", padx=(4, 0))
+        ctk.CTkButton(options_frame, text="Load CSV Column", command=self.load_csv, fg_color="#2980B9", width=140).pack(anchor="w", pady=(5, 0))
+        return options_frame
+
+    def toggle_options(self):
+        if self.options_frame is None:
+            self.options_frame = self._build_options()
+        if self.options_frame.winfo_manager():
+            self.options_frame.pack_forget()
+            self.options_btn.configure(text="More Options ▸")
+        else:
+            self.options_frame.pack(anchor="w", after=self.options_btn)
+            self.options_btn.configure(text="More Options ▾")
+
+    # The profiler wraps backend methods, so it is only attached or detached between tasks
+    def toggle_overlay(self):
+        if self.tasks.busy():
+            self.overlay_var.set(not self.overlay_var.get()) # Undo the switch / F12 flip
+            self.notify("Busy", "Toggle the overlay once the current operation finishes.", is_error=True)
+            return
+        if self.overlay_var.get():
+            if self.overlay is None:
+                self.overlay = PerformanceOverlay(self.visual_frame, self)
+            self.overlay.start()
+        elif self.overlay is not None:
+            self.overlay.stop()
+
+    def _build_busy_frame(self):
+        self.busy_frame = ctk.CTkFrame(self.visual_frame, fg_color="transparent")
+        self.busy_label = ctk.CTkLabel(self.busy_frame, text="", font=("Arial", 12, "bold"))
+        self.busy_label.pack(side="left", padx=(0, 10))
+        self.progress_bar = ctk.CTkProgressBar(self.busy_frame, width=250)
+        self.progress_bar.pack(side="left")
+        ctk.CTkButton(self.busy_frame, text="Cancel", command=self.tasks.cancel_all, fg_color="#C0392B", width=80).pack(side="left", padx=10)
+
+    def _set_busy(self, label):
+        if self.busy_frame is None:
+            self._build_busy_frame()
+        if label:
+            self.busy_label.configure(text=f"{label}...")
+            self.progress_bar.set(0)
+            self.busy_frame.pack(before=self.visual_inner_frame, pady=(15, 0))
+        else:
+            self.busy_frame.pack_forget()
+        self._set_controls_state("disabled" if label else "normal")
+        # The worker may be changing the backend, so scrolling must not read it until the task ends
+        if self.array_grid is not None:
+            if label:
+                self.array_grid.hold()
+            else:
+                self.array_grid.values = self.backend.array # A storage the task swapped out may be unmapped
+                self.array_grid.flush()
+
+    def _set_controls_state(self, state):
+        pending = [self.controls_frame]
+        while pending:
+            widget = pending.pop()
+            if isinstance(widget, (ctk.CTkButton, ctk.CTkEntry, ctk.CTkOptionMenu, ctk.CTkSwitch)):
+                widget.configure(state=state)
+            else:
+                pending.extend(widget.winfo_children())
 
-        created_boxes = [] 
-        MAX_COLS = 10 
+    # VISUAL FUNCTIONS
+    def render_array(self):
+        if self.array_grid is None:
+            self.array_grid = ArrayGrid(self.visual_inner_frame, "Current Array")
+            self.array_grid.pack(anchor="center")
+        self.array_grid.show(self.backend.array, self.backend.get_capacity(), self.backend.display)
+
+    # Patches only the slots named by the backend's change records
+    def apply_changes(self):
+        start = time.perf_counter()
+        self._patch_grid()
+        self.last_render = time.perf_counter() - start
+
+    def _patch_grid(self):
+        grid = self.array_grid
+        changes = self.backend.pop_changes()
+        if grid is None or any(change[0] == "reset" for change in changes):
+            self.render_array()
+            return
 
-        for i in range(capacity):
-            row_num = i // MAX_COLS
-            col_num = i % MAX_COLS
-            is_filled = i < len(data_list)
-            
-            if is_filled:
-                box_color = "#3B8ED0" 
-                text_val = str(data_list[i])
-                text_color = "white"
-                border_color = "#2c6e91"
-            else:
-                box_color = ("gray90", "#3A3A3A") 
-                text_val = ""
-                text_color = ("gray60", "gray60") 
-                border_color = ("gray70", "#505050")
-
-            card = ArrayCard(
-                box_container, text=text_val, width=60, height=85,      
-                fg_color=box_color, border_width=2, border_color=border_color,
-                corner_radius=8, text_color=text_color, text_color_disabled=text_color 
-            )
-            card.grid(row=row_num, column=col_num, padx=5, pady=(0, 30)) 
-            created_boxes.append(card)
-            
-            idx_color = ("gray40", "gray80")
-            idx_lbl = ctk.CTkLabel(box_container, text=str(i), font=("Arial", 11, "bold"), text_color=idx_color)
-            idx_lbl.place(in_=card, relx=0.5, rely=1.0, y=14, anchor="center")
-            
-        return created_boxes
+        grid.values = self.backend.array # Batch edits swap in a rebuilt storage
+        length = self.backend.get_length()
+        for change in changes:
+            kind = change[0]
+            if kind == "set":
+                grid.refresh_range(change[1], change[1] + 1)
+            elif kind == "shift":
+                grid.refresh_range(change[1], length + max(0, -change[2]))
+            elif kind == "capacity":
+                grid.set_capacity(change[1])
+            elif kind == "cleared":
+                grid.refresh_range(0, change[1])
+
+    def set_animation_speed(self, choice):
+        self.animator.speed = float(choice.rstrip("x"))
 
     def highlight_box(self, index, color="#F1C40F"):
-        if index is not None and 0 <= index < len(self.current_box_objects):
-            target_box = self.current_box_objects[index]
-            target_box.configure(fg_color=color)
-            self.after(1000, lambda: target_box.configure(fg_color="#3B8ED0"))
+        grid = self.array_grid
+        if index is not None and grid is not None and 0 <= index < grid.capacity:
+            grid.scroll_to(index)
+            grid.paint(index, fg_color=color)
+            self.animator.schedule(1000, lambda: grid.unpaint(index))
 
     def animate_resize(self, new_item):
-        is_valid, _ = self.backend.validate_and_convert(new_item)
+        is_valid, converted = self.backend.validate_and_convert(new_item)
         if not is_valid:
-            self.show_popup("Error", f"Invalid {self.backend.data_type} format.", is_error=True)
+            self.notify("Error", f"Invalid {self.backend.data_type} format.", is_error=True)
             return
 
         self.insert_btn.configure(state="disabled")
         # Notify user (Optional: could be a popup but might be annoying)
-        # self.show_popup("Resizing", "Array Full! Resizing started...")
+        # self.notify("Resizing", "Array Full! Resizing started...")
         
-        current_data = self.backend.get_data()
+        values = self.backend.array
+        length = self.backend.get_length()
         current_cap = self.backend.get_capacity()
-        new_capacity = current_cap * 2
+        new_capacity = self.backend.next_capacity()
         
         resize_frame = ctk.CTkFrame(self.visual_frame, fg_color="transparent")
         resize_frame.pack(pady=20, fill="x")
         
-        new_box_objects = self.render_array(resize_frame, [], new_capacity, "New Array (Resized)")
-        old_box_objects = list(self.current_box_objects)
-
-        def copy_step(index):
+        new_grid = ArrayGrid(resize_frame, "New Array (Resized)")
+        new_grid.pack(anchor="center")
+        new_grid.show([], new_capacity)
+        old_grid = self.array_grid
+        anim = self.animator
+        anim.attach(old_grid)
+        anim.attach(new_grid)
+
+        def mark_old(index):
+            # Visual Only (No Text Update)
+            old_grid.scroll_to(index)
+            old_grid.paint(index, fg_color="#E5AA00")
+
+        def fill_new(index):
+            new_grid.scroll_to(index)
+            new_grid.paint(index, fg_color="#3B8ED0", text=self.backend.display(values[index]), text_color="white")
+            old_grid.paint(index, fg_color="gray90")
+
+        # Copy element by element; long arrays animate a sample and jump to the copied result
+        t = 0
+        for index in range(min(length, ANIMATION_SAMPLE)):
+            anim.schedule(t, lambda i=index: mark_old(i))
+            anim.schedule(t + 600, lambda i=index: fill_new(i))
+            t += 1200
+
+        def show_copied():
+            old_grid.highlight_filled("gray90")
+            new_grid.show(values, new_capacity, self.backend.display)
+        if length > ANIMATION_SAMPLE:
+            anim.schedule(t, show_copied)
+
+        def place_new_item():
+            if length < new_capacity:
+                new_grid.scroll_to(length)
+                new_grid.paint(length, fg_color="#2CC985", text=self.backend.display(converted), text_color="white")
+        anim.schedule(t, place_new_item)
+
+        def finalize():
             try:
-                if index < len(current_data):
-                    # Visual Only (No Text Update)
-                    if index < len(old_box_objects) and old_box_objects[index].winfo_exists():
-                        old_box_objects[index].configure(fg_color="#E5AA00") 
-                    
-                    def fill_new_box():
-                        try:
-                            val_to_copy = current_data[index]
-                            if index < len(new_box_objects) and new_box_objects[index].winfo_exists():
-                                new_box_objects[index].configure(fg_color="#3B8ED0", text=str(val_to_copy), text_color_disabled="white")
-                            if index < len(old_box_objects) and old_box_objects[index].winfo_exists():
-                                old_box_objects[index].configure(fg_color="gray90")
-                            self.after(600, lambda: copy_step(index + 1))
-                        except Exception:
-                            self.insert_btn.configure(state="normal")
-                    self.after(600, fill_new_box)
-                else:
-                    if len(current_data) < len(new_box_objects):
-                        target_box = new_box_objects[len(current_data)]
-                        target_box.configure(fg_color="#2CC985", text=str(new_item), text_color_disabled="white")
-                    
-                    def finalize():
-                        try:
-                            self.backend.resize_and_insert(new_item)
-                            if resize_frame.winfo_exists(): resize_frame.destroy()
-                            self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
-                            self.show_popup("Success", "Resizing Complete.\nCapacity Doubled.")
-                            self.insert_btn.configure(state="normal")
-                        except Exception: pass
-                    self.after(1200, finalize)
-            except Exception:
+                self.backend.resize_and_insert(new_item)
+                if resize_frame.winfo_exists(): resize_frame.destroy()
+                self.apply_changes()
+                self.array_grid.clear_highlights()
+                self.notify("Success", f"Resizing Complete.\nCapacity {current_cap} -> {new_capacity}.")
+            finally:
                 self.insert_btn.configure(state="normal")
-
-        copy_step(0)
+        anim.schedule(t + 1200, finalize)
 
     # ==========================================
     #        LOGIC FOR BUTTON ACTIONS
     # ==========================================
 
+    # WORKSPACE: switching only swaps self.backend and repaints the one grid
+    def switch_array(self, name):
+        self.animator.finish()
+        self.workspace.focus(name)
+        self._show_current()
+
+    def new_array(self):
+        self.animator.finish()
+        _, name = self.workspace.add(self.workspace.unique_name("Array"))
+        self._show_current()
+        self.notify("Workspace", f"Added '{name}'. Create it to start.")
+
+    # O(1): the copy shares storage with the original until one of them is edited
+    def clone_array(self):
+        self.animator.finish()
+        source = self.workspace.active
+        _, name = self.workspace.clone(source, self.workspace.unique_name(f"{source} copy"))
+        self._show_current()
+        self.notify("Workspace", f"Cloned '{source}' as '{name}'.")
+
+    def remove_array(self):
+        if len(self.workspace.arrays) == 1:
+            self.notify("Error", "The workspace needs at least one array.", is_error=True)
+            return
+        self.animator.finish()
+        _, name = self.workspace.remove(self.workspace.active)
+        self._show_current()
+        self.notify("Workspace", f"Removed '{name}'.")
+
+    # Points the controls, the overlay and the grid at the array in focus
+    def _show_current(self):
+        self.backend = self.workspace.current()
+        self.array_menu.configure(values=self.workspace.names())
+        self.array_menu.set(self.workspace.active)
+        self.sorted_var.set(self.backend.keep_sorted)
+        self.storage_var.set("Gap Buffer" if self.backend.storage_kind == "gap" else "Contiguous")
+        if self.backend.get_capacity():
+            self.array_length_var.set(str(self.backend.get_capacity()))
+            self.data_type_menu.set(self.backend.data_type)
+        if self.overlay is not None:
+            self.overlay.follow(self.backend)
+        self.backend.pop_changes() # Drawn in full below
+        self.render_array()
+
     def create_array(self):
         selected_type = self.data_type_menu.get()
-        success, message = self.backend.create_array(self.array_length_var.get(), self.data_entry.get(), selected_type)
-        
+        capacity, raw_data = self.array_length_var.get(), self.data_entry.get()
+        storage = "gap" if self.storage_var.get() == "Gap Buffer" else "contiguous"
+
+        def done(result):
+            success, message = result
+            if success:
+                self.apply_changes()
+                self.notify("Success", f"Created {selected_type} Array.")
+            else:
+                self.apply_changes() # A failed create has still replaced the array
+                self.notify("Error", message, is_error=True)
+
+        self.run_backend("Creating array", lambda task: self.backend.create_array(capacity, raw_data, selected_type, task.report, storage), done)
+
+    def save_array(self):
+        if self.backend.get_capacity() == 0:
+            self.notify("Error", "Create array first!", is_error=True)
+            return
+        path = filedialog.asksaveasfilename(title="Save Array", defaultextension=".mita", filetypes=[("Mita arrays", "*.mita")])
+        if not path: return
+
+        def done(result):
+            success, message = result
+            self.notify("Success" if success else "Error", message, is_error=not success)
+
+        self.run_backend("Saving", lambda task: self.backend.save(path), done)
+
+    # Loading only maps the file, so even huge arrays open without a worker
+    def load_array(self):
+        path = filedialog.askopenfilename(title="Load Array", filetypes=[("Mita arrays", "*.mita"), ("All files", "*")])
+        if not path: return
+
+        self.animator.finish()
+        success, message = self.backend.load(path)
         if success:
-            self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
-            self.show_popup("Success", f"Created {selected_type} Array.")
+            self.array_length_var.set(str(self.backend.get_capacity()))
+            self.data_type_menu.set(self.backend.data_type)
+            self.apply_changes()
+            self.notify("Success", f"Loaded {self.backend.get_length():,} {self.backend.data_type} elements.")
         else:
-            self.show_popup("Error", message, is_error=True)
+            self.notify("Error", message, is_error=True)
+
+    def toggle_sorted(self):
+        self.animator.finish()
+        self.backend.set_sorted(self.sorted_var.get())
+        self.apply_changes()
+        if self.sorted_var.get():
+            self.notify("Sorted Mode", "Elements are kept in ascending order; searches use binary search.")
+
+    # Streams one column of a CSV file into the array (capacity caps the rows read)
+    def load_csv(self):
+        path = filedialog.askopenfilename(title="Load CSV Column", filetypes=[("CSV files", "*.csv"), ("All files", "*")])
+        if not path: return
+        try:
+            columns = csv_columns(path)
+        except (OSError, UnicodeDecodeError, csv.Error) as error:
+            self.notify("Error", f"Could not read CSV: {error}", is_error=True)
+            return
+
+        dialog = ctk.CTkInputDialog(text=f"Column ({', '.join(columns)}):", title="Load CSV Column")
+        column = dialog.get_input()
+        if not column: return
+        capacity = self.array_length_var.get()
+
+        def done(result):
+            success, message = result
+            if success:
+                self.data_type_menu.set(self.backend.data_type)
+                self.apply_changes()
+                self.notify("Success", f"{message} from '{column}' as {self.backend.data_type}.")
+            else:
+                self.notify("Error", message, is_error=True)
+
+        self.run_backend("Loading CSV", lambda task: self.backend.load_csv_column(path, column, capacity, progress=task.report), done)
 
     def insert_element(self):
         val = self.insert_entry.get()
         if not val: return
 
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
 
+        self.animator.finish()
         if self.backend.is_full():
             if self.resize_toggle_var.get():
                 self.animate_resize(val)
             else:
-                self.show_popup("Error", "Array is full!", is_error=True)
+                self.notify("Error", "Array is full!", is_error=True)
         else:
             success = self.backend.insert(val)
             if success:
-                self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
-                self.show_popup("Success", f"Inserted '{val}'")
+                self.apply_changes()
+                self.notify("Success", f"Inserted '{val}'")
             else:
-                self.show_popup("Error", f"Invalid {self.backend.data_type} format.", is_error=True)
+                self.notify("Error", f"Invalid {self.backend.data_type} format.", is_error=True)
         
         self.insert_entry.delete(0, 'end')
 
     def access(self):
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
             
         if self.backend.get_length() == 0:
-            self.show_popup("Error", "Array is empty!", is_error=True)
+            self.notify("Error", "Array is empty!", is_error=True)
             return
         
         dialog = ctk.CTkInputDialog(text="Enter index to access:", title="Access Index")
@@ -474,52 +1125,51 @@ class MitaVisualizer(ctk.CTkFrame):
         if not s: return
             
         if not s.lstrip('-').isdigit():
-            self.show_popup("Error", "Please enter a valid integer.", is_error=True)
+            self.notify("Error", "Please enter a valid integer.", is_error=True)
             return
             
         idx = int(s)
         val = self.backend.get_value_at(idx)
         if val is not None:
             self.highlight_box(idx, "#F1C40F")
-            self.show_popup("Success", f"Value at {idx} is '{val}'")
+            self.notify("Success", f"Value at {idx} is '{val}'")
         else:
-            self.show_popup("Error", f"Index {idx} out of bounds.", is_error=True)
+            self.notify("Error", f"Index {idx} out of bounds.", is_error=True)
 
     def get_first(self):
         val = self.backend.get_first_value()
         if val is not None:
             self.highlight_box(0, "#2CC985")
-            self.show_popup("Success", f"First Value: '{val}'")
+            self.notify("Success", f"First Value: '{val}'")
         else:
-            self.show_popup("Error", "Array empty.", is_error=True)
+            self.notify("Error", "Array empty.", is_error=True)
 
     def get_last(self):
         val = self.backend.get_last_value()
         if val is not None:
-            idx = len(self.backend.get_data()) - 1
+            idx = self.backend.get_length() - 1
             self.highlight_box(idx, "#9B59B6")
-            self.show_popup("Success", f"Last Value: '{val}'")
+            self.notify("Success", f"Last Value: '{val}'")
         else:
-            self.show_popup("Error", "Array empty.", is_error=True)
+            self.notify("Error", "Array empty.", is_error=True)
 
     def get_arr_length(self):
         l = self.backend.get_length()
         # Highlight all
-        for i in range(l):
-            if i < len(self.current_box_objects):
-                b = self.current_box_objects[i]
-                b.configure(fg_color="#1ABC9C")
-                self.after(1000, lambda box=b: box.configure(fg_color="#3B8ED0"))
+        grid = self.array_grid
+        if grid is not None:
+            grid.highlight_filled("#1ABC9C")
+            self.animator.schedule(1000, lambda: grid.highlight_filled(None))
         
-        self.show_popup("Info", f"Current Length: {l}")
+        self.notify("Info", f"Current Length: {l}")
 
     def search_value(self):
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
             
         if self.backend.get_length() == 0:
-            self.show_popup("Error", "Array is empty!", is_error=True)
+            self.notify("Error", "Array is empty!", is_error=True)
             return
         
         dialog = ctk.CTkInputDialog(text=f"Search Value ({self.backend.data_type}):", title="Search")
@@ -528,57 +1178,75 @@ class MitaVisualizer(ctk.CTkFrame):
         
         is_valid, converted = self.backend.validate_and_convert(target)
         if not is_valid:
-            self.show_popup("Error", f"'{target}' is not a valid {self.backend.data_type}.", is_error=True)
+            self.notify("Error", f"'{target}' is not a valid {self.backend.data_type}.", is_error=True)
             return
         
-        # 1. GET RESULT FROM BACKEND
-        found_idx = self.backend.search(target)
+        # 1. GET RESULT FROM BACKEND (on the worker)
+        work = lambda task: (self.backend.search(target), self.backend.search_probes(target))
+        self.run_backend("Searching", work, lambda result: self.animate_search(target, *result))
 
+    # Sorted arrays animate the binary-search probes; otherwise the scan runs left to right
+    def animate_search(self, target, found_idx, binary_probes=()):
         self.search_btn.configure(state="disabled")
-        data = self.backend.get_data()
+        length = self.backend.get_length()
+        grid = self.array_grid
         
-        # 2. VISUAL ANIMATION
-        def scan(i):
-            if i < len(data):
-                if i < len(self.current_box_objects):
-                    self.current_box_objects[i].configure(fg_color="#E67E22")
-                    # No text update, just visual color
-                    
-                def next_step():
-                    if i != found_idx and i < len(self.current_box_objects):
-                        self.current_box_objects[i].configure(fg_color="#3B8ED0")
-                    
-                    if i == found_idx: 
-                        if i < len(self.current_box_objects):
-                            self.current_box_objects[i].configure(fg_color="#2ECC71")
-                        
-                        # Show Popup Result
-                        self.show_popup("Found!", f"'{target}' found at index {i}.")
-                        
-                        self.after(2000, lambda: self.current_box_objects[i].configure(fg_color="#3B8ED0") if i < len(self.current_box_objects) else None)
-                        self.search_btn.configure(state="normal")
-                    else:
-                        scan(i + 1)
-
-                self.after(400, next_step)
-            else:
-                self.show_popup("Not Found", f"'{target}' not found.", is_error=True)
-                self.search_btn.configure(state="normal")
+        anim = self.animator
+        anim.attach(grid)
         
-        scan(0)
+        # 2. VISUAL ANIMATION (long scans show a sample of probes, then jump to the result)
+        if binary_probes:
+            probes = binary_probes # At most log2(n) + 1 of them, so all are shown
+        else:
+            probes = range(min(found_idx + 1 if found_idx != -1 else length, ANIMATION_SAMPLE))
+        t = 0
+        for i in probes:
+            anim.schedule(t, lambda i=i: (grid.scroll_to(i), grid.paint(i, fg_color="#E67E22")))
+            if i != found_idx:
+                anim.schedule(t + 400, lambda i=i: grid.unpaint(i))
+            t += 400
+
+        def finish_scan():
+            if found_idx != -1:
+                grid.scroll_to(found_idx)
+                grid.paint(found_idx, fg_color="#2ECC71")
+                
+                # Show Popup Result
+                self.notify("Found!", f"'{target}' found at index {found_idx}.")
+                anim.schedule(2000, lambda: grid.unpaint(found_idx))
+            else:
+                self.notify("Not Found", f"'{target}' not found.", is_error=True)
+            self.search_btn.configure(state="normal")
+        anim.schedule(t, finish_scan)
+
+    # UNDO / REDO: steps through the backend's edit journal
+    def undo(self):
+        self._step_history(self.backend.undo, "Nothing to undo.")
+
+    def redo(self):
+        self._step_history(self.backend.redo, "Nothing to redo.")
+
+    def _step_history(self, step, empty_message):
+        self.animator.finish()
+        if not step():
+            self.notify("History", empty_message, is_error=True)
+            return
+        self.sorted_var.set(self.backend.keep_sorted) # Undoing a sort also undoes the mode switch
+        self.apply_changes()
 
     def clear_elements(self):
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
             
+        self.animator.finish()
         self.backend.clear()
-        self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
-        self.show_popup("Success", "Array cleared.")
+        self.apply_changes()
+        self.notify("Success", "Array cleared.")
 
     def delete_index(self):
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
             
         dialog = ctk.CTkInputDialog(text="Index to delete:", title="Delete")
@@ -586,27 +1254,29 @@ class MitaVisualizer(ctk.CTkFrame):
         if not s: return
             
         if not s.lstrip('-').isdigit():
-            self.show_popup("Error", "Please enter a valid number.", is_error=True)
+            self.notify("Error", "Please enter a valid number.", is_error=True)
             return
             
         idx = int(s)
+
+        self.animator.finish()
         result = self.backend.delete_at_index(idx)
-        
+
         if result == True:
-            self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
-            self.show_popup("Success", f"Deleted element at index {idx}.")
+            self.apply_changes()
+            self.notify("Success", f"Deleted element at index {idx}.")
         elif result == "INDEX_ERROR":
-            self.show_popup("Error", f"Index {idx} out of bounds.", is_error=True)
+            self.notify("Error", f"Index {idx} out of bounds.", is_error=True)
         else:
-            self.show_popup("Error", "Unable to delete.", is_error=True)
+            self.notify("Error", "Unable to delete.", is_error=True)
         
     def insert_at_idx(self):
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
         
-        if len(self.backend.get_data()) >= self.backend.get_capacity():
-            self.show_popup("Error", "Array is full!", is_error=True)
+        if self.backend.get_length() >= self.backend.get_capacity():
+            self.notify("Error", "Array is full!", is_error=True)
             return
             
         dialog = ctk.CTkInputDialog(text="Index to insert at:", title="Insert Index")
@@ -614,40 +1284,43 @@ class MitaVisualizer(ctk.CTkFrame):
         if not s: return
             
         if not s.lstrip('-').isdigit():
-            self.show_popup("Error", "Please enter a valid number.", is_error=True)
+            self.notify("Error", "Please enter a valid number.", is_error=True)
             return
             
         idx = int(s)
-        if not (0 <= idx <= len(self.backend.get_data())):
-            self.show_popup("Error", f"Index {idx} out of bounds.", is_error=True)
+        if not (0 <= idx <= self.backend.get_length()):
+            self.notify("Error", f"Index {idx} out of bounds.", is_error=True)
             return
         
         dialog2 = ctk.CTkInputDialog(text=f"Value for index {idx}:", title="Insert Value")
         val = dialog2.get_input()
         if not val: return
 
+        self.animator.finish()
         result = self.backend.insert_at_specific_index(idx, val)
-        
+
         if result == True:
-            self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
+            self.apply_changes()
             self.highlight_box(idx, "#2CC985")
-            self.show_popup("Success", f"Inserted '{val}' at index {idx}.")
+            self.notify("Success", f"Inserted '{val}' at index {idx}.")
         elif result == "TYPE_ERROR":
-            self.show_popup("Error", f"'{val}' is not a valid {self.backend.data_type}.", is_error=True)
+            self.notify("Error", f"'{val}' is not a valid {self.backend.data_type}.", is_error=True)
         elif result == "FULL":
-            self.show_popup("Error", "Array is full!", is_error=True)
+            self.notify("Error", "Array is full!", is_error=True)
         elif result == "INDEX_ERROR":
-            self.show_popup("Error", f"Index {idx} out of bounds.", is_error=True)
+            self.notify("Error", f"Index {idx} out of bounds.", is_error=True)
+        elif result == "ORDER_ERROR":
+            self.notify("Error", f"'{val}' at index {idx} would break the sorted order.", is_error=True)
         else:
-            self.show_popup("Error", "Unable to insert.", is_error=True)
+            self.notify("Error", "Unable to insert.", is_error=True)
 
     def modify_idx(self):
         if self.backend.get_capacity() == 0:
-            self.show_popup("Error", "Create array first!", is_error=True)
+            self.notify("Error", "Create array first!", is_error=True)
             return
             
         if self.backend.get_length() == 0:
-            self.show_popup("Error", "Array is empty!", is_error=True)
+            self.notify("Error", "Array is empty!", is_error=True)
             return
         
         idx_dialog = ctk.CTkInputDialog(text="Enter Index to modify:", title="Modify Index")
@@ -655,35 +1328,45 @@ class MitaVisualizer(ctk.CTkFrame):
         if not idx_str: return
             
         if not idx_str.lstrip('-').isdigit():
-            self.show_popup("Error", "Please enter a valid number.", is_error=True)
+            self.notify("Error", "Please enter a valid number.", is_error=True)
             return
             
         idx = int(idx_str)
-        if not (0 <= idx < len(self.backend.get_data())):
-            self.show_popup("Error", f"Index {idx} out of bounds.", is_error=True)
+        if not (0 <= idx < self.backend.get_length()):
+            self.notify("Error", f"Index {idx} out of bounds.", is_error=True)
             return
 
         val_dialog = ctk.CTkInputDialog(text=f"Enter New Value for index {idx}:", title="Modify Value")
         val = val_dialog.get_input()
         if not val: return
 
+        self.animator.finish()
         result = self.backend.modify_at_index(idx, val)
         
         if result == True:
-            self.current_box_objects = self.render_array(self.visual_inner_frame, self.backend.get_data(), self.backend.get_capacity())
+            self.apply_changes()
             self.highlight_box(idx, "#F39C12") 
-            self.show_popup("Success", f"Modified index {idx} to '{val}'.")
+            self.notify("Success", f"Modified index {idx} to '{val}'.")
         elif result == "TYPE_ERROR":
-            self.show_popup("Error", f"'{val}' is not a valid {self.backend.data_type}.", is_error=True)
+            self.notify("Error", f"'{val}' is not a valid {self.backend.data_type}.", is_error=True)
         elif result == "INDEX_ERROR":
-            self.show_popup("Error", f"Index {idx} out of bounds.", is_error=True)
+            self.notify("Error", f"Index {idx} out of bounds.", is_error=True)
+        elif result == "ORDER_ERROR":
+            self.notify("Error", f"'{val}' at index {idx} would break the sorted order.", is_error=True)
         else:
-            self.show_popup("Error", "Unable to modify.", is_error=True)
+            self.notify("Error", "Unable to modify.", is_error=True)
             
 # ==========================================
 #           WINDOW EXECUTION
 # ==========================================
 
+# Only with MITA_STARTUP_TIMING set: prints how long the imports took and when Tk went
+# idle, i.e. after the first frame is drawn (bench.py --startup times the imports alone)
+def report_startup(root):
+    if os.environ.get("MITA_STARTUP_TIMING"):
+        root.after_idle(lambda: print(f"Startup: imports {(STARTUP_IMPORTED - STARTUP_STARTED) * 1000:.0f} ms, "
+                                      f"window ready {(time.perf_counter() - STARTUP_STARTED) * 1000:.0f} ms"))
+
 if __name__ == "__main__":
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
@@ -695,4 +1378,5 @@ if __name__ == "__main__":
     app_instance = MitaVisualizer(master=root)
     app_instance.pack(fill="both", expand=True)
 
+    report_startup(root)
     root.mainloop()
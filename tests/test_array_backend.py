@@ -0,0 +1,179 @@
+import random
+from datetime import date
+
+import pytest
+
+from array_backend import GROWTH, ArrayBackend, SlotBuffer
+
+def backend_of(cap, data="", dtype="Integer"):
+    backend = ArrayBackend()
+    assert backend.create(cap, data, dtype) == (True, "Success")
+    return backend
+
+def test_slot_buffer_fills_slots_and_grows():
+    buffer = SlotBuffer(2)
+    buffer.append("a")
+    buffer.insert(0, "b")
+    assert list(buffer) == ["b", "a"] and buffer.capacity == 2 and buffer.copies == 0
+    buffer.insert(-1, "c") # Negative positions count from the end, like list.insert
+    assert list(buffer) == ["b", "c", "a"]
+    assert buffer.capacity == 4 and buffer.copies == 1 and buffer.moved == 16
+    assert buffer[-1] == "a" and buffer.index("c") == 1
+    with pytest.raises(IndexError):
+        buffer[3]
+    with pytest.raises(ValueError):
+        buffer.index(None) # Empty slots are not searched
+
+def test_slot_buffer_pop_and_shrink():
+    buffer = SlotBuffer(8, growth="2x", shrink_at=0.25)
+    for value in range(3):
+        buffer.append(value)
+    assert buffer.pop(0) == 0 and buffer.capacity == 8
+    assert buffer.pop() == 2 and buffer.capacity == 4 # One item is under a quarter of 8
+    assert list(buffer) == [1] and buffer.slots[1:] == [None] * 3
+
+def test_slot_buffer_copy_and_assign():
+    buffer = SlotBuffer(4)
+    buffer.assign([1, 2])
+    twin = buffer.copy()
+    twin[0] = 9
+    assert list(buffer) == [1, 2] and list(twin) == [9, 2] and twin.capacity == 4
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.capacity == 4
+
+@pytest.mark.parametrize("growth, capacity", [("2x", 8), ("1.5x", 6), ("golden", 7), (3, 12)])
+def test_growth_factors(growth, capacity):
+    backend = backend_of(4, "1,2,3,4")
+    backend.set_growth(growth)
+    assert backend.insert("5", resize=True) == (True, "Success")
+    assert backend.growth_stats() == {"capacity": capacity, "reallocations": 1, "bytes_moved": 32}
+    assert backend.cap == max(5, -(-4 * GROWTH.get(growth, growth) // 1))
+
+def test_create_parses_and_truncates():
+    backend = backend_of(2, " 1, 2 ,3")
+    assert list(backend.arr) == [1, 2] and backend.cap == 2
+    assert backend_of("x").cap == 1 # Unparseable capacities fall back to 1
+    assert backend_of("").cap == 1
+    dates = backend_of(3, "2024-01-02", "Date")
+    assert list(dates.arr) == [date(2024, 1, 2)] and dates.show(dates.arr[0]) == "2024-01-02"
+
+def test_create_rejects_bad_items():
+    backend = backend_of(3, "1")
+    assert backend.create(3, "1, x", "Integer") == (False, "'x' invalid for Integer")
+    assert list(backend.arr) == [] and backend.cap == 3
+
+def test_create_reports_progress_and_cancels():
+    calls = []
+    backend = ArrayBackend()
+    assert backend.create(5, "1,2", "Integer", lambda n, total: calls.append((n, total))) == (True, "Success")
+    assert calls == [(0, 2)]
+    assert backend.create(5, "1,2", "Integer", lambda n, total: False) == (False, "Cancelled")
+    assert list(backend.arr) == []
+
+def test_insert_statuses():
+    backend = backend_of(2, "1")
+    assert backend.insert("x") == (False, "TYPE_ERROR")
+    assert backend.insert("2") == (True, "Success")
+    assert backend.insert("3") == (False, "FULL")
+    assert list(backend.arr) == [1, 2] and backend.cap == 2
+
+def test_insert_at_statuses():
+    backend = backend_of(4, "1,2")
+    assert backend.insert_at(0, "0") is True
+    assert backend.insert_at(3, "9") is True # Past the end appends
+    assert list(backend.arr) == [0, 1, 2, 9]
+    assert backend.insert_at(0, "5") == "FULL"
+    backend.delete(3)
+    assert backend.insert_at(4, "5") == "INDEX_ERROR"
+    assert backend.insert_at(-1, "5") == "INDEX_ERROR"
+    assert backend.insert_at(0, "y") == "TYPE_ERROR"
+
+def test_modify_and_delete_statuses():
+    backend = backend_of(3, "1,2")
+    assert backend.modify(2, "5") == "INDEX_ERROR"
+    assert backend.modify(0, "z") == "TYPE_ERROR"
+    assert backend.modify(0, "5") is True
+    assert backend.delete(2) is False and backend.delete(-1) is False
+    assert backend.delete(0) is True
+    assert list(backend.arr) == [2]
+
+def test_clear_keeps_capacity():
+    backend = backend_of(3, "1,2")
+    backend.clear()
+    assert list(backend.arr) == [] and backend.cap == 3
+
+def test_search():
+    backend = backend_of(5, "4,7,4")
+    assert backend.search("4") == 0 and backend.search("7") == 1
+    assert backend.search("8") == -1 and backend.search("x") == -1
+
+def test_change_records():
+    backend = backend_of(3, "1")
+    backend.track_changes()
+    backend.insert("2")
+    backend.insert_at(0, "0")
+    backend.modify(2, "9")
+    backend.insert("4", resize=True)
+    backend.delete(0)
+    backend.clear()
+    assert backend.pop_changes() == [("set", 1), ("shift", 0, 1), ("set", 2), ("capacity", 6), ("set", 3),
+                                     ("shift", 0, -1), ("cleared", 3)]
+    assert backend.pop_changes() == []
+    backend.track_changes(False)
+    backend.insert("1")
+    assert backend.pop_changes() == []
+
+def test_change_log_collapses_to_reset():
+    backend = backend_of(2000)
+    backend.track_changes()
+    for value in range(1001):
+        backend.insert(str(value))
+    assert backend.pop_changes() == [("reset",), ("set", 1000)]
+
+def test_shrinking_delete_records_capacity():
+    backend = ArrayBackend()
+    backend.set_growth("2x", shrink_at=0.5)
+    backend.create(4, "1,2", "Integer")
+    backend.track_changes()
+    backend.delete(0)
+    assert backend.cap == 2
+    assert backend.pop_changes() == [("shift", 0, -1), ("capacity", 2)]
+
+# Random edits with the index and history on, checked against a list; undoing
+# every step must then lead back to the empty array
+def test_random_edits_match_a_list_and_undo():
+    rng, model = random.Random(9), []
+    backend = backend_of(6)
+    backend.use_index()
+    backend.use_history(every=8)
+    for _ in range(500):
+        op, value = rng.randrange(7), rng.randrange(10)
+        if op == 0:
+            backend.insert(str(value), resize=True)
+            model.append(value)
+        elif op == 1 and len(model) < backend.cap:
+            position = rng.randrange(len(model) + 1)
+            assert backend.insert_at(position, str(value)) is True
+            model.insert(position, value)
+        elif op == 2 and model:
+            position = rng.randrange(len(model))
+            assert backend.delete(position) is True
+            del model[position]
+        elif op == 3 and model:
+            position = rng.randrange(len(model))
+            assert backend.modify(position, str(value)) is True
+            model[position] = value
+        elif op == 4 and model:
+            pairs = [(rng.randrange(len(model)), value), (rng.randrange(len(model)), value + 1)]
+            assert backend.modify_many([(index, str(new)) for index, new in pairs]) is True
+            for index, new in pairs:
+                model[index] = new
+        elif op == 5 and rng.random() < 0.05:
+            backend.clear()
+            model.clear()
+        assert list(backend.arr) == model
+        probe = rng.randrange(11)
+        assert backend.search(str(probe)) == (model.index(probe) if probe in model else -1)
+    while backend.undo():
+        pass
+    assert list(backend.arr) == []
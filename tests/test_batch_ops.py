@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from array_backend import ArrayBackend
+from mita_backend import MitaInABox
+
+# Reference: values for index i go right before the original item i, in the order given
+def model_insert_many(items, pairs):
+    out = []
+    for position in range(len(items) + 1):
+        out += [value for index, value in pairs if index == position]
+        if position < len(items):
+            out.append(items[position])
+    return out
+
+def make(capacity, data, storage="contiguous"):
+    box = MitaInABox()
+    box.create_array(capacity, data, "Integer", storage=storage)
+    return box
+
+@pytest.fixture(params=("contiguous", "gap"))
+def storage(request):
+    return request.param
+
+def test_insert_many(storage):
+    box = make(10, "1,2,3", storage)
+    assert box.insert_many([(3, "9"), (0, "7"), (1, "8"), (0, "6")]) is True
+    assert box.get_data() == [7, 6, 1, 8, 2, 3, 9]
+
+def test_insert_many_rejects_the_whole_batch(storage):
+    box = make(5, "1,2,3", storage)
+    assert box.insert_many([(0, "4"), (1, "5"), (2, "6")]) == "FULL"
+    assert box.insert_many([(0, "4"), (1, "x")]) == "TYPE_ERROR"
+    assert box.insert_many([(0, "4"), (4, "5")]) == "INDEX_ERROR"
+    assert box.insert_many([(-1, "4")]) == "INDEX_ERROR"
+    assert box.get_data() == [1, 2, 3]
+
+def test_insert_many_sorted_mode():
+    box = make(10, "1,5,9")
+    box.set_sorted(True)
+    assert box.insert_many([(1, "2"), (2, "6")]) is True
+    assert box.insert_many([(0, "7")]) == "ORDER_ERROR"
+    assert box.get_data() == [1, 2, 5, 6, 9]
+
+def test_delete_many(storage):
+    box = make(10, "0,1,2,3,4,5", storage)
+    assert box.delete_many([4, 0, 4, 2]) is True
+    assert box.get_data() == [1, 3, 5]
+    assert box.delete_many([]) is True
+    assert box.delete_many([1, 3]) == "INDEX_ERROR"
+    assert box.delete_many([-1]) == "INDEX_ERROR"
+    assert box.get_data() == [1, 3, 5]
+
+def test_modify_many(storage):
+    box = make(10, "0,1,2", storage)
+    assert box.modify_many([(0, "5"), (2, "6"), (0, "7")]) is True # Later pairs win
+    assert box.get_data() == [7, 1, 6]
+    assert box.modify_many([(0, "1"), (3, "1")]) == "INDEX_ERROR"
+    assert box.modify_many([(0, "1"), (1, "y")]) == "TYPE_ERROR"
+    assert box.get_data() == [7, 1, 6]
+
+def test_batches_undo_as_one_step():
+    box = make(10, "1,2,3")
+    box.set_history(True)
+    box.insert_many([(0, "0"), (3, "4")])
+    box.modify_many([(0, "9"), (1, "8")])
+    box.delete_many([0, 1])
+    box.undo()
+    assert box.get_data() == [9, 8, 2, 3, 4]
+    box.undo()
+    assert box.get_data() == [0, 1, 2, 3, 4]
+    box.undo()
+    assert box.get_data() == [1, 2, 3]
+
+def test_random_batches_match_a_list(storage):
+    rng, model = random.Random(11), []
+    box = make(60, "", storage)
+    for _ in range(400):
+        op = rng.randrange(3)
+        if op == 0:
+            count = rng.randrange(min(4, 60 - len(model)) + 1)
+            pairs = [(rng.randrange(len(model) + 1), rng.randrange(100)) for _ in range(count)]
+            assert box.insert_many([(index, str(value)) for index, value in pairs]) is True
+            model = model_insert_many(model, sorted(pairs, key=lambda pair: pair[0]))
+        elif op == 1 and model:
+            indices = [rng.randrange(len(model)) for _ in range(rng.randrange(4))]
+            assert box.delete_many(indices) is True
+            model = [value for position, value in enumerate(model) if position not in indices]
+        elif op == 2 and model:
+            pairs = [(rng.randrange(len(model)), rng.randrange(100)) for _ in range(3)]
+            assert box.modify_many([(index, str(value)) for index, value in pairs]) is True
+            for index, value in pairs:
+                model[index] = value
+        assert box.get_data() == model
+
+def test_backend_batches():
+    backend = ArrayBackend()
+    backend.create(8, "1,2,3", "Integer")
+    assert backend.insert_many([(0, "0"), (7, "9")]) is True # Past the end appends
+    assert list(backend.arr) == [0, 1, 2, 3, 9]
+    assert backend.insert_many([(8, "5")]) == "INDEX_ERROR"
+    assert backend.insert_many([(0, "q")]) == "TYPE_ERROR"
+    assert backend.insert_many([(0, "1")] * 4) == "FULL"
+    assert backend.modify_many([(1, "7"), (1, "6")]) is True
+    assert backend.modify_many([(5, "1")]) == "INDEX_ERROR"
+    assert backend.delete_many([0, 4, 0]) is True
+    assert backend.delete_many([3]) is False
+    assert list(backend.arr) == [6, 2, 3]
@@ -0,0 +1,87 @@
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+import mita_backend
+from mita_backend import ArrayStorage, MitaInABox
+
+def box_of(data_type):
+    box = MitaInABox()
+    box.create_array(1, "", data_type)
+    return box
+
+@pytest.mark.parametrize("data_type, payload, expected", [
+    ("Integer", " 1, -2 ,30", [1, -2, 30]),
+    ("Boolean", "true, F,Yes,0", [True, False, True, False]),
+    ("String", " a , b c,", ["a", "b c", ""]),
+    ("Float", "1.5, -2", [1.5, -2.0]),
+    ("Decimal", "1.25,3", [Decimal("1.25"), Decimal("3")]),
+    ("Date", "2024-02-29, 1999-01-01", [date(2024, 2, 29), date(1999, 1, 1)]),
+])
+def test_parse_bulk_converts_every_type(data_type, payload, expected):
+    assert box_of(data_type).parse_bulk(payload, 10) == (True, expected)
+
+@pytest.mark.parametrize("data_type, payload, position", [
+    ("Integer", "1,2,x,4", 2),
+    ("Integer", "+1", 0), # int() takes these, the single-value converter does not
+    ("Integer", "1,2_000", 1),
+    ("Integer", "1, ", 1),
+    ("Boolean", "true,maybe", 1),
+    ("Float", "1,inf", 1),
+    ("Date", "2024-13-01", 0),
+])
+def test_parse_bulk_reports_first_bad_token(data_type, payload, position):
+    is_valid, message = box_of(data_type).parse_bulk(payload, 10)
+    assert not is_valid
+    assert f"at index {position} is not a valid {data_type}" in message
+
+def test_parse_bulk_rejects_integers_past_the_digit_limit():
+    huge = "9" * (sys.get_int_max_str_digits() + 1)
+    is_valid, message = box_of("Integer").parse_bulk(f"1,{huge}", 10)
+    assert not is_valid
+    assert "at index 1 is not a valid Integer" in message
+
+def test_parse_bulk_stops_at_the_limit():
+    box = box_of("Integer")
+    assert box.parse_bulk("1,2,3,x", 3) == (True, [1, 2, 3]) # The bad token is past capacity
+    assert box.parse_bulk("1,2", 0) == (True, [])
+
+def test_parse_bulk_spans_chunks(monkeypatch):
+    monkeypatch.setattr(mita_backend, "BULK_CHUNK", 4)
+    box = box_of("Integer")
+    assert box.parse_bulk(",".join(map(str, range(10))), 10) == (True, list(range(10)))
+    is_valid, message = box.parse_bulk("0,1,2,3,4,5,z", 10)
+    assert not is_valid and "at index 6" in message
+
+def test_parse_bulk_reports_progress_and_cancels(monkeypatch):
+    monkeypatch.setattr(mita_backend, "BULK_CHUNK", 2)
+    calls = []
+    progress = lambda done, total: calls.append((done, total)) or done < 4
+    assert box_of("Integer").parse_bulk("1,2,3,4,5,6", 6, progress) == (False, "Cancelled")
+    assert calls == [(2, 6), (4, 6)]
+
+def test_validate_and_convert_many():
+    box = box_of("Integer")
+    assert box.validate_and_convert_many([1, " 2", "3 "]) == (True, [1, 2, 3])
+    assert box.validate_and_convert_many(["1", "a"]) == (False, 1)
+    assert box.validate_and_convert_many(["yes", "no"], "Boolean") == (True, [True, False])
+
+def test_single_value_integer_past_the_digit_limit():
+    assert box_of("Integer").validate_and_convert("9" * (sys.get_int_max_str_digits() + 1)) == (False, None)
+
+def test_create_array_truncates_to_capacity():
+    box = MitaInABox()
+    assert box.create_array(2, "5,6,7", "Integer") == (True, "Success")
+    assert box.get_data() == [5, 6]
+
+def test_create_array_keeps_big_integers():
+    box = MitaInABox()
+    assert box.create_array(3, f"1,{2 ** 70}", "Integer") == (True, "Success")
+    assert box.get_data() == [1, 2 ** 70]
+
+def test_array_storage_overflow_from_an_iterator():
+    storage = ArrayStorage("q", iter([1, 2 ** 70, 3]), 4)
+    assert storage.tolist() == [1, 2 ** 70, 3]
+    assert storage.slots == 4
@@ -0,0 +1,66 @@
+from array_backend import ArrayBackend
+from mita_backend import MitaInABox
+
+def tracked(capacity, data, data_type="Integer"):
+    box = MitaInABox()
+    box.create_array(capacity, data, data_type)
+    box.track_changes(True)
+    return box
+
+def test_untracked_returns_nothing():
+    box = MitaInABox()
+    box.create_array(3, "1,2", "Integer")
+    box.insert("3")
+    assert box.pop_changes() == []
+
+def test_pop_forgets_records():
+    box = tracked(5, "1,2")
+    box.insert("3")
+    assert box.pop_changes() == [("set", 2)]
+    assert box.pop_changes() == []
+
+def test_edit_records():
+    box = tracked(6, "1,2,3")
+    box.modify_at_index(1, "9")
+    box.insert_at_specific_index(0, "0")
+    box.insert_at_specific_index(4, "4") # At the end: only the new slot changes
+    box.delete_at_index(2)
+    assert box.pop_changes() == [("set", 1), ("shift", 0, 1), ("set", 4), ("shift", 2, -1)]
+
+def test_failed_edits_record_nothing():
+    box = tracked(3, "1,2,3")
+    box.insert_at_specific_index(0, "4")
+    box.delete_at_index(7)
+    box.modify_at_index(0, "x")
+    assert box.pop_changes() == []
+
+def test_resize_records_capacity():
+    box = tracked(2, "1,2")
+    box.resize_and_insert("3")
+    assert box.pop_changes() == [("capacity", box.get_capacity()), ("set", 2)]
+
+def test_clear_records_old_length():
+    box = tracked(5, "1,2,3")
+    box.clear()
+    assert box.pop_changes() == [("cleared", 3)]
+
+def test_create_records_reset():
+    box = tracked(5, "1,2")
+    box.create_array(8, "4,5", "Integer")
+    assert box.pop_changes() == [("reset",)]
+
+def test_failed_create_still_records_reset():
+    box = tracked(5, "a,b,c", "String")
+    success, _ = box.create_array(8, "1,2,x", "Integer")
+    assert not success
+    assert box.get_capacity() == 8 and box.get_data() == []
+    assert box.pop_changes() == [("reset",)]
+
+def test_backend_failed_create_records_reset():
+    backend = ArrayBackend()
+    backend.create(3, "a,b,c", "String")
+    backend.track_changes()
+    success, _ = backend.create(3, "1,x", "Integer")
+    assert not success
+    assert list(backend.arr) == [] # Like a cancelled create, nothing of the bad payload is kept
+    assert backend.pop_changes() == [("reset",)]
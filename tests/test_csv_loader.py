@@ -0,0 +1,109 @@
+from datetime import date
+from functools import partial
+
+import pytest
+
+import mita_backend
+from mita_backend import MitaInABox, csv_columns, infer_data_type, iter_csv_column
+
+def write_csv(tmp_path, text, name="data.csv", encoding="utf-8"):
+    path = tmp_path / name
+    path.write_text(text, encoding=encoding)
+    return str(path)
+
+# The loader reads iter_csv_column's default chunk size, bound at import
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(mita_backend, "iter_csv_column", partial(iter_csv_column, chunk_size=2))
+
+def test_csv_columns_strips_names_and_bom(tmp_path):
+    path = write_csv(tmp_path, " id , Name\n1,a\n", encoding="utf-8-sig")
+    assert csv_columns(path) == ["id", "Name"]
+    assert csv_columns(write_csv(tmp_path, "", "empty.csv")) == []
+
+def test_iter_csv_column_chunks_and_matches_names_loosely(tmp_path):
+    path = write_csv(tmp_path, "id,Name\n" + "".join(f"{i}, v{i} \n" for i in range(5)))
+    assert list(iter_csv_column(path, " name ", chunk_size=2)) == [["v0", "v1"], ["v2", "v3"], ["v4"]]
+    with pytest.raises(KeyError):
+        next(iter_csv_column(path, "missing"))
+
+@pytest.mark.parametrize("tokens, expected", [
+    (["1", "-2", "30"], "Integer"),
+    (["1", "2.5"], "Float"),
+    (["true", "no"], "Boolean"),
+    (["2024-01-31"], "Date"),
+    (["1", "x"], "String"),
+    ([], "String"),
+])
+def test_infer_data_type(tokens, expected):
+    assert infer_data_type(tokens) == expected
+
+def test_load_infers_the_type(tmp_path):
+    path = write_csv(tmp_path, "when,score\n2024-01-01,3\n2024-02-29,4\n")
+    box = MitaInABox()
+    assert box.load_csv_column(path, "when", 10) == (True, "Loaded 2 values")
+    assert box.data_type == "Date" and box.get_capacity() == 10
+    assert box.get_data() == [date(2024, 1, 1), date(2024, 2, 29)]
+
+def test_load_with_an_explicit_type(tmp_path):
+    path = write_csv(tmp_path, "score\n3\n4\n")
+    box = MitaInABox()
+    assert box.load_csv_column(path, "score", 5, "String")[0]
+    assert box.get_data() == ["3", "4"]
+
+def test_load_stops_at_capacity(tmp_path, monkeypatch):
+    small_chunks(monkeypatch)
+    path = write_csv(tmp_path, "n\n" + "".join(f"{i}\n" for i in range(7)) + "bad\n")
+    box = MitaInABox()
+    assert box.load_csv_column(path, "n", 5) == (True, "Loaded 5 values") # The bad row is never read
+    assert box.get_data() == [0, 1, 2, 3, 4]
+
+def test_load_reports_the_spreadsheet_row(tmp_path, monkeypatch):
+    small_chunks(monkeypatch)
+    path = write_csv(tmp_path, "n\n1\n2\n3\nx\n")
+    box = MitaInABox()
+    box.create_array(3, "9", "Integer")
+    assert box.load_csv_column(path, "n", 10) == (False, "'x' in row 5 is not a valid Integer")
+    assert box.get_data() == [9] # Failed loads leave the array alone
+
+@pytest.mark.parametrize("text, column, message", [
+    ("a,b\n1,2\n", "c", "Column 'c' not found"),
+    ("a,b\n1,2\n3\n", "b", "A row is missing the 'b' column"),
+])
+def test_load_errors(tmp_path, text, column, message):
+    assert MitaInABox().load_csv_column(write_csv(tmp_path, text), column, 5) == (False, message)
+
+def test_load_unreadable_files(tmp_path):
+    box = MitaInABox()
+    is_valid, message = box.load_csv_column(str(tmp_path / "nope.csv"), "a", 5)
+    assert not is_valid and message.startswith("Could not read CSV")
+    path = tmp_path / "latin1.csv"
+    path.write_bytes(b"a\n\xe9\n")
+    is_valid, message = box.load_csv_column(str(path), "a", 5)
+    assert not is_valid and message.startswith("Could not read CSV")
+
+def test_load_cancels_between_chunks(tmp_path, monkeypatch):
+    small_chunks(monkeypatch)
+    path = write_csv(tmp_path, "n\n1\n2\n3\n4\n5\n")
+    calls = []
+    progress = lambda done, total: calls.append((done, total)) or done < 4
+    box = MitaInABox()
+    assert box.load_csv_column(path, "n", 10, progress=progress) == (False, "Cancelled")
+    assert calls == [(2, 10), (4, 10)]
+    assert box.get_data() == []
+
+def test_load_sorted_and_undo(tmp_path):
+    path = write_csv(tmp_path, "n\n3\n1\n2\n")
+    box = MitaInABox()
+    box.create_array(2, "7", "Integer")
+    box.set_history(True)
+    box.set_sorted(True)
+    assert box.load_csv_column(path, "n", 5)[0]
+    assert box.get_data() == [1, 2, 3]
+    box.undo()
+    assert box.get_data() == [7] and box.get_capacity() == 2
+
+def test_load_records_reset(tmp_path):
+    box = MitaInABox()
+    box.track_changes(True)
+    box.load_csv_column(write_csv(tmp_path, "n\n1\n"), "n", 5)
+    assert box.pop_changes() == [("reset",)]
@@ -0,0 +1,188 @@
+import random
+
+import pytest
+
+from array_backend import ArrayBackend
+from mita_backend import History, MitaInABox
+
+def test_history_undo_redo_and_fork():
+    history = History(limit=10_000, snapshot_every=0)
+    for step in range(3):
+        history.record(("step", step), 10)
+    assert history.undo() == ("step", 2)
+    assert history.undo() == ("step", 1)
+    assert history.redo() == ("step", 1)
+    history.record(("fork",), 10) # Drops ("step", 2) from the redo tail
+    assert history.redo() is None
+    assert history.entries == [("step", 0), ("step", 1), ("fork",)]
+    assert history.bytes == 30 and history.position == 3
+
+def test_history_stops_at_both_ends():
+    history = History()
+    assert history.undo() is None and history.redo() is None
+
+def test_history_evicts_the_oldest_entries():
+    history = History(limit=100, snapshot_every=0)
+    for step in range(11):
+        history.record(("step", step), 10)
+    # Past the limit it frees down to three quarters of it
+    assert history.bytes == 70
+    assert history.first() == 4 and history.last() == 11 and history.position == 11
+    assert history.entries[0] == ("step", 4)
+
+def test_history_never_evicts_the_redo_tail():
+    history = History(limit=100, snapshot_every=0)
+    for step in range(5):
+        history.record(("step", step), 20)
+    for _ in range(3):
+        history.undo()
+    assert history.add_snapshot("state", 25) # Over the limit, but only two entries lie behind the cursor
+    assert history.entries == [("step", 2), ("step", 3), ("step", 4)]
+    assert history.first() == 2 and 2 in history.snapshots
+    assert history.redo() == ("step", 2)
+
+def test_snapshots_are_skipped_when_too_large():
+    history = History(limit=100, snapshot_every=1)
+    history.record(("step",), 1)
+    assert history.snapshot_due()
+    assert not history.add_snapshot("state", 26)
+    assert history.add_snapshot("state", 25)
+    assert not history.snapshot_due()
+
+def test_drop_snapshots_policy_keeps_entries():
+    history = History(limit=100, policy="drop-snapshots", snapshot_every=1)
+    for step in range(5):
+        history.record(("step", step), 5)
+        history.add_snapshot(f"state {step}", 20)
+    assert history.bytes <= 100
+    assert len(history.entries) == 5 and history.first() == 0 # Only snapshots were dropped
+    assert sorted(history.snapshots) == [3, 4, 5]
+
+def test_drop_oldest_policy_drops_snapshots_with_their_entries():
+    history = History(limit=100, snapshot_every=1)
+    for step in range(5):
+        history.record(("step", step), 5)
+        history.add_snapshot(f"state {step}", 20)
+    assert history.first() > 0
+    assert all(position >= history.first() for position in history.snapshots)
+
+def test_route_picks_the_closer_start():
+    history = History(snapshot_every=0)
+    for step in range(10):
+        history.record(("step", step), 1)
+    history.snapshots[2] = ("state at 2", 0)
+    assert history.route(3) == ("state at 2", 2) # 1 entry from the snapshot, 7 from the cursor
+    assert history.route(9) == (None, 10)
+    assert history.route(1) == (None, 10) # No snapshot at or before 1
+
+def test_set_history_rejects_unknown_policies():
+    box = MitaInABox()
+    assert not box.set_history(True, policy="drop-everything")
+    assert box.history is None
+    assert not box.undo() and not box.redo() and not box.revert_to(0)
+
+def edit(box, rng, model):
+    op = rng.randrange(6)
+    value = rng.randrange(100)
+    if op == 0:
+        box.resize_and_insert(str(value))
+    elif op == 1 and model:
+        box.insert_at_specific_index(rng.randrange(len(model)), str(value))
+    elif op == 2 and model:
+        box.delete_at_index(rng.randrange(len(model)))
+    elif op == 3 and model:
+        box.modify_at_index(rng.randrange(len(model)), str(value))
+    elif op == 4 and model:
+        box.delete_many(rng.sample(range(len(model)), min(2, len(model))))
+    elif op == 5 and rng.random() < 0.1:
+        box.clear()
+
+def state(box):
+    return box.get_data(), box.get_capacity()
+
+@pytest.mark.parametrize("storage", ["contiguous", "gap"])
+@pytest.mark.parametrize("snapshot_every", [0, 4])
+def test_revert_to_every_position(storage, snapshot_every):
+    rng = random.Random(7)
+    box = MitaInABox()
+    box.create_array(4, "1,2,3", "Integer", storage=storage)
+    box.set_history(True, snapshot_every=snapshot_every)
+    states = {0: state(box)}
+    for _ in range(60):
+        edit(box, rng, box.get_data())
+        states[box.get_history_info()["position"]] = state(box)
+    if snapshot_every:
+        assert box.get_history_info()["snapshots"] > 0
+    positions = list(states)
+    rng.shuffle(positions)
+    for position in positions:
+        assert box.revert_to(position)
+        assert state(box) == states[position]
+    assert not box.revert_to(max(states) + 1)
+
+def test_undo_redo_walks_back_and_forth():
+    box = MitaInABox()
+    box.create_array(2, "1", "Integer")
+    box.set_history(True)
+    box.resize_and_insert("2")
+    box.resize_and_insert("3") # Grows the capacity as part of the same step
+    box.modify_at_index(0, "9")
+    assert box.undo() and box.get_data() == [1, 2, 3]
+    assert box.undo() and state(box) == ([1, 2], 2)
+    assert box.redo() and state(box) == ([1, 2, 3], 4)
+    assert box.redo() and box.get_data() == [9, 2, 3]
+    assert not box.redo()
+
+def test_undo_bulk_replacements():
+    box = MitaInABox()
+    box.set_history(True)
+    box.create_array(3, "a,b", "String")
+    box.create_array(5, "1,2,3", "Integer")
+    box.set_sorted(True)
+    box.insert("0")
+    assert box.get_data() == [0, 1, 2, 3]
+    box.undo()
+    box.undo()
+    assert box.data_type == "Integer" and box.get_data() == [1, 2, 3]
+    box.undo()
+    assert box.data_type == "String" and state(box) == (["a", "b"], 3)
+
+def test_undo_does_not_see_later_edits_of_the_same_storage():
+    box = MitaInABox()
+    box.create_array(4, "1,2", "Integer")
+    box.set_history(True)
+    box.clear()
+    box.insert("5") # Must not write into the storage the "clear" entry keeps
+    box.undo()
+    box.undo()
+    assert box.get_data() == [1, 2]
+
+def test_eviction_limits_how_far_back_undo_goes():
+    box = MitaInABox()
+    box.create_array(1000, "", "Integer")
+    box.set_history(True, limit=2000, snapshot_every=0)
+    for value in range(50):
+        box.insert(str(value))
+    info = box.get_history_info()
+    assert info["bytes"] <= 2000 and info["first"] > 0
+    assert not box.revert_to(info["first"] - 1)
+    assert box.revert_to(info["first"])
+    assert box.get_data() == list(range(info["first"]))
+
+def test_backend_history():
+    backend = ArrayBackend()
+    backend.create(2, "1", "Integer")
+    assert not backend.use_history(True, policy="nope")
+    assert backend.use_history(True, every=2)
+    backend.insert("2")
+    backend.insert("3", True) # Resizes
+    backend.modify(0, "7")
+    backend.delete(1)
+    assert list(backend.arr) == [7, 3]
+    assert backend.undo() and list(backend.arr) == [7, 2, 3]
+    assert backend.revert_to(1) and list(backend.arr) == [1, 2] and backend.cap == 2
+    assert backend.redo() and list(backend.arr) == [1, 2, 3]
+    assert backend.revert_to(4) and list(backend.arr) == [7, 3]
+    assert not backend.revert_to(5)
+    backend.create(3, "x", "String")
+    assert backend.undo() and backend.type == "Integer" and list(backend.arr) == [7, 3]
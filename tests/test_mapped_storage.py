@@ -0,0 +1,76 @@
+import pytest
+
+from mita_backend import MitaInABox
+
+def loaded(tmp_path, data_type, data):
+    box = MitaInABox()
+    assert box.create_array(10, data, data_type)[0]
+    path = str(tmp_path / "array.mita")
+    assert box.save(path)[0]
+    mapped = MitaInABox()
+    assert mapped.load(path)[0]
+    return box, mapped
+
+# Values the typecode cannot hold are simply absent, as in the in-memory storage
+@pytest.mark.parametrize("value", [str(2 ** 70), str(-2 ** 70), str(2 ** 63)])
+def test_search_outside_int64_returns_minus_one(tmp_path, value):
+    box, mapped = loaded(tmp_path, "Integer", "1,2,3")
+    assert box.search(value) == -1
+    assert mapped.search(value) == -1
+
+def test_search_loaded_array_finds_values(tmp_path):
+    _, mapped = loaded(tmp_path, "Integer", "5,-7,9")
+    assert mapped.search("-7") == 1
+    assert mapped.search("8") == -1
+
+def test_search_loaded_date_outside_range_returns_minus_one(tmp_path):
+    _, mapped = loaded(tmp_path, "Date", "2024-01-01,2024-02-01")
+    assert mapped.search("2024-02-01") == 1
+    assert mapped.search("9999-12-31") == -1
+
+# Records every mapping load() opens, so the tests can check it was closed
+@pytest.fixture
+def mappings(monkeypatch):
+    import mita_backend
+    opened, real_mmap = [], mita_backend.mmap.mmap
+    def tracking_mmap(*args, **kwargs):
+        opened.append(real_mmap(*args, **kwargs))
+        return opened[-1]
+    monkeypatch.setattr(mita_backend.mmap, "mmap", tracking_mmap)
+    return opened
+
+@pytest.mark.parametrize("cut", [
+    lambda data: b"NOPE" + data[4:], # Bad magic
+    lambda data: data[:10], # Short header
+    lambda data: data[:-3], # Heap cut short after the offsets were mapped
+])
+def test_failed_load_closes_the_mapping(tmp_path, mappings, cut):
+    box = MitaInABox()
+    box.create_array(4, "alpha,beta", "String")
+    path = tmp_path / "array.mita"
+    box.save(str(path))
+    path.write_bytes(cut(path.read_bytes()))
+    assert not box.load(str(path))[0]
+    assert [mapped.closed for mapped in mappings] == [True]
+    assert box.get_data() == ["alpha", "beta"]
+
+def test_replaced_mapping_is_closed(tmp_path, mappings):
+    box, mapped = loaded(tmp_path, "Integer", "1,2,3")
+    mapped.create_array(3, "4", "Integer")
+    assert mappings[0].closed
+    assert mapped.load(str(tmp_path / "array.mita"))[0]
+    mapped.insert("8") # The first edit copies the elements out of the file
+    assert mappings[1].closed
+    assert mapped.get_data() == [1, 2, 3, 8]
+
+def test_mapping_kept_while_undo_or_a_clone_needs_it(tmp_path, mappings):
+    _, mapped = loaded(tmp_path, "Integer", "1,2,3")
+    twin = mapped.clone()
+    mapped.create_array(3, "4", "Integer")
+    assert not mappings[0].closed and twin.get_data() == [1, 2, 3]
+
+    mapped.set_history(True)
+    assert mapped.load(str(tmp_path / "array.mita"))[0]
+    mapped.clear()
+    mapped.undo()
+    assert not mappings[1].closed and mapped.get_data() == [1, 2, 3]
@@ -0,0 +1,131 @@
+import gc
+import os
+import random
+from array import array
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+import parallel_scan
+from mita_backend import MitaInABox
+from parallel_scan import SCANS, SharedBuffer, chunk_bounds, scan
+
+ARGUMENTS = {
+    "find_all": 3,
+    "count": 3,
+    "min": None,
+    "max": None,
+    "sum": None,
+    "filter": (">=", 5),
+    "where": ("!=", 3),
+}
+
+def segment_exists(shared):
+    return os.path.exists(f"/dev/shm/{shared.segment.name.lstrip('/')}")
+
+# Every scan goes through the worker pool, even on a one-core machine
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(parallel_scan, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(parallel_scan, "PARALLEL_WORKERS", 3)
+
+# The tests share one pool; it is stopped once they are done
+@pytest.fixture(autouse=True, scope="module")
+def stop_pool():
+    yield
+    if parallel_scan.pool is not None:
+        parallel_scan.pool.shutdown()
+        parallel_scan.pool = None
+
+def test_every_scan_has_an_argument():
+    assert set(ARGUMENTS) == set(SCANS)
+
+@pytest.mark.parametrize("length, parts", [(10, 3), (2, 4), (0, 2), (9, 3)])
+def test_chunk_bounds_cover_the_range(length, parts):
+    bounds = chunk_bounds(length, parts)
+    assert len(bounds) == parts and bounds[0][0] == 0 and bounds[-1][1] == length
+    assert all(previous[1] == following[0] for previous, following in zip(bounds, bounds[1:]))
+    sizes = [stop - start for start, stop in bounds]
+    assert max(sizes) - min(sizes) <= 1
+
+@pytest.mark.parametrize("name", sorted(SCANS))
+def test_parallel_matches_serial(parallel, name):
+    rng = random.Random(len(name))
+    values = array("q", [rng.randrange(10) for _ in range(1001)])
+    length = 997 # Only the first `length` items are scanned
+    expected = SCANS[name][0](values[:length], 0, ARGUMENTS[name])
+    assert scan(name, values, length, ARGUMENTS[name], workers=1) == expected # Serial path
+    assert scan(name, values, length, ARGUMENTS[name], workers=3) == expected
+
+@pytest.mark.parametrize("name", ["min", "max", "sum", "find_all", "where"])
+def test_parallel_scan_of_few_items(parallel, name):
+    values = array("d", [2.5])
+    assert scan(name, values, 1, ARGUMENTS[name], workers=3) == SCANS[name][0](values, 0, ARGUMENTS[name])
+    assert scan(name, values, 0, ARGUMENTS[name], workers=3) == SCANS[name][0](values[:0], 0, ARGUMENTS[name])
+
+def test_scan_releases_its_own_segment(parallel, monkeypatch):
+    made = []
+    class Recording(SharedBuffer):
+        def __init__(self, buffer, length):
+            super().__init__(buffer, length)
+            made.append(self)
+    monkeypatch.setattr(parallel_scan, "SharedBuffer", Recording)
+    assert scan("count", array("i", [1, 2, 1]), 3, 1, workers=2) == 2
+    assert len(made) == 1 and not made[0].release.alive and not segment_exists(made[0])
+
+def test_shared_buffer_is_reused_until_released(parallel):
+    values = array("q", range(100))
+    shared = SharedBuffer(values, 100)
+    assert segment_exists(shared)
+    assert scan("sum", values, 100, workers=2, share=lambda: shared) == sum(range(100))
+    assert shared.release.alive # Still owned by the caller
+    shared.release()
+    assert not segment_exists(shared)
+
+def test_shared_buffer_is_released_when_collected():
+    shared = SharedBuffer(array("q", [1, 2]), 2)
+    release = shared.release
+    del shared
+    gc.collect()
+    assert not release.alive
+
+def test_box_scans_through_the_pool(parallel):
+    rng = random.Random(1)
+    data = [rng.randrange(-50, 50) for _ in range(500)]
+    box = MitaInABox()
+    box.create_array(600, ",".join(map(str, data)), "Integer")
+    assert box.find_all("7") == [position for position, value in enumerate(data) if value == 7]
+    assert box.min_value() == min(data) and box.max_value() == max(data)
+    assert box.sum_values() == sum(data)
+    assert box.filter_values("<", "-40") == [value for value in data if value < -40]
+    assert box.find_where(">", "45") == [position for position, value in enumerate(data) if value > 45]
+
+def test_coded_types_scan_through_the_pool(parallel):
+    box = MitaInABox()
+    box.create_array(5, "2024-03-01,2023-01-01,2025-06-30", "Date")
+    assert box.min_value() == date(2023, 1, 1)
+    assert box.filter_values(">", "2024-01-01") == [date(2024, 3, 1), date(2025, 6, 30)]
+    box.create_array(5, "1.25,2.5", "Decimal")
+    assert box.sum_values() == Decimal("3.75")
+
+def test_storage_drops_its_segment_on_write(parallel):
+    box = MitaInABox()
+    box.create_array(10, "1,2,3", "Integer")
+    assert box.sum_values() == 6
+    shared = box.array.shared
+    assert shared is not None and segment_exists(shared)
+    assert box.sum_values() == 6 and box.array.shared is shared # Reused while unchanged
+    box.insert("4")
+    assert box.array.shared is None and not segment_exists(shared)
+    assert box.sum_values() == 10
+
+def test_replaced_file_mapping_drops_its_segment(parallel, tmp_path):
+    box = MitaInABox()
+    box.create_array(10, "1,2,3", "Integer")
+    box.save(str(tmp_path / "array.mita"))
+    assert box.load(str(tmp_path / "array.mita"))[0]
+    assert box.sum_values() == 6
+    shared = box.array.shared
+    box.create_array(3, "", "Integer") # Closes the mapping, and with it the segment
+    assert not segment_exists(shared)
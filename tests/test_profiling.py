@@ -0,0 +1,154 @@
+import json
+import math
+import random
+import re
+import tracemalloc
+
+import pytest
+
+from array_backend import ArrayBackend
+from mita_backend import MitaInABox
+from profiling import HISTOGRAM_SUB_BUCKETS, PROMETHEUS_BUCKETS, Histogram, Profiler, label_value
+
+def exact_percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+def test_empty_histogram():
+    histogram = Histogram()
+    assert histogram.percentile(0.5) == 0
+    assert histogram.cumulative([1, 10]) == [0, 0]
+
+@pytest.mark.parametrize("q", [0.01, 0.5, 0.95, 0.99, 1.0])
+def test_percentiles_are_within_one_bucket(q):
+    rng = random.Random(4)
+    samples = [int(rng.lognormvariate(10, 2)) for _ in range(5000)]
+    histogram = Histogram()
+    for sample in samples:
+        histogram.record(sample)
+    exact = exact_percentile(samples, q)
+    estimate = histogram.percentile(q)
+    # The estimate is the upper edge of the exact value's bucket, capped at the largest sample
+    assert exact <= estimate <= max(samples)
+    assert estimate <= max(exact, 1) * (1 + 1 / HISTOGRAM_SUB_BUCKETS)
+    assert histogram.count == 5000 and histogram.total == sum(samples) and histogram.max == max(samples)
+
+def test_bucket_edges():
+    histogram = Histogram()
+    for value in (0, 1, 1000, 1000):
+        histogram.record(value)
+    assert histogram.percentile(0.25) == 1.125 # Zero lands in the bucket of 1 ns, which ends at 1.125
+    assert histogram.percentile(0.75) == 1000 # Capped at the largest sample
+    bucket = max(histogram.counts)
+    assert Histogram.upper_bound(bucket - 1) < 1000 <= Histogram.upper_bound(bucket)
+
+def test_cumulative_counts():
+    histogram = Histogram()
+    for value in (5, 50, 500, 5000):
+        histogram.record(value)
+    assert histogram.cumulative([1, 100, 1000, 10_000]) == [0, 2, 3, 4]
+
+def test_attach_wraps_only_that_instance():
+    profiler, box, other = Profiler(), MitaInABox(), MitaInABox()
+    profiler.attach(box)
+    profiler.attach(box) # Attaching twice is a no-op
+    assert "insert" in box.__dict__ and "insert" not in other.__dict__
+    profiler.detach(box)
+    assert "insert" not in box.__dict__
+    with pytest.raises(TypeError, match="cannot profile list"):
+        profiler.attach([])
+
+def test_snapshot_counts_calls_and_elements():
+    profiler, box = Profiler(), MitaInABox()
+    profiler.attach(box, label="box")
+    box.create_array(4, "1,2,3", "Integer")
+    box.insert_at_specific_index(0, "0") # Shifts the three existing elements
+    box.delete_at_index(1)
+    box.search("3")
+    box.resize_and_insert("4")
+    box.resize_and_insert("5") # Grows the storage
+    stats = profiler.snapshot()["box"]
+    assert stats["create_array"]["elements_touched"] == 3
+    assert stats["insert_at_specific_index"]["elements_touched"] == 4
+    assert stats["delete_at_index"]["elements_touched"] == 3
+    assert stats["search"]["elements_touched"] == 3
+    assert stats["resize_and_insert"]["calls"] == 2
+    assert stats["resize_and_insert"]["reallocations"] == 1
+    assert "undo" not in stats # Never called
+    entry = stats["search"]
+    assert entry["p50_us"] <= entry["p95_us"] <= entry["p99_us"] <= entry["max_us"]
+    assert profiler.last[:2] == ("box", "resize_and_insert")
+    assert json.loads(profiler.to_json()) == profiler.snapshot()
+
+def test_errors_are_counted_and_raised():
+    profiler, backend = Profiler(), ArrayBackend()
+    backend.search = lambda value: 1 // 0
+    profiler.attach(backend)
+    with pytest.raises(ZeroDivisionError):
+        backend.search("1")
+    assert profiler.snapshot()["ArrayBackend"]["search"]["errors"] == 1
+
+def test_reset_keeps_profiling():
+    profiler, backend = Profiler(), ArrayBackend()
+    profiler.attach(backend)
+    backend.create(3, "1", "Integer")
+    profiler.reset()
+    assert profiler.snapshot() == {} and profiler.last is None
+    backend.insert("2")
+    assert profiler.snapshot()["ArrayBackend"]["insert"]["calls"] == 1
+
+def test_label_value_escaping():
+    assert label_value('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+SAMPLE = re.compile(r'^(\w+)\{backend="((?:[^"\\]|\\.)*)",operation="(\w+)"(?:,le="([^"]+)")?\} (\S+)$')
+
+def test_prometheus_export():
+    profiler, backend = Profiler(), ArrayBackend()
+    profiler.attach(backend, label='ui "main"')
+    backend.create(3, "1,2", "Integer")
+    for _ in range(5):
+        backend.search("2")
+    text = profiler.to_prometheus()
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# TYPE mita_operation_seconds histogram" in lines
+    assert "# TYPE mita_operation_errors_total counter" in lines
+    assert "mita_operation_allocated_bytes_total" not in text # Only with trace_allocations
+
+    buckets, values = {}, {}
+    for line in lines:
+        if line.startswith("#"):
+            continue
+        metric, backend_label, operation, bound, value = SAMPLE.match(line).groups()
+        assert backend_label == 'ui \\"main\\"'
+        if bound is None:
+            values[metric, operation] = float(value)
+        else:
+            buckets.setdefault(operation, []).append((bound, int(value)))
+    search = buckets["search"]
+    assert [bound for bound, _ in search] == [f"{bound:g}" for bound in PROMETHEUS_BUCKETS] + ["+Inf"]
+    counts = [count for _, count in search]
+    assert counts == sorted(counts) and counts[-1] == 5
+    assert values["mita_operation_seconds_count", "search"] == 5
+    assert values["mita_operation_seconds_sum", "search"] > 0
+    assert values["mita_operation_elements_touched_total", "search"] == 10 # Found at index 1, five times
+    assert values["mita_operation_errors_total", "create"] == 0
+
+def test_export_picks_the_format(tmp_path):
+    profiler, box = Profiler(), MitaInABox()
+    profiler.attach(box)
+    box.create_array(2, "1", "Integer")
+    profiler.export(str(tmp_path / "out.prom"))
+    profiler.export(str(tmp_path / "out.json"))
+    assert (tmp_path / "out.prom").read_text().startswith("# HELP")
+    assert "create_array" in json.loads((tmp_path / "out.json").read_text())["MitaInABox"]
+
+def test_trace_allocations_starts_and_stops_tracemalloc():
+    profiler, box = Profiler(trace_allocations=True), MitaInABox()
+    profiler.attach(box)
+    assert tracemalloc.is_tracing()
+    box.create_array(100, ",".join(map(str, range(100))), "Integer")
+    assert profiler.snapshot()["MitaInABox"]["create_array"]["allocated_bytes"] > 0
+    assert "mita_operation_allocated_bytes_total" in profiler.to_prometheus()
+    profiler.detach(box)
+    assert not tracemalloc.is_tracing()
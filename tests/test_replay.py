@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+import replay
+from mita_backend import MitaInABox
+from replay import parse_line, run_create, status_of
+
+def test_status_of():
+    assert status_of(True) == "OK"
+    assert status_of(False) == "TYPE_ERROR"
+    assert status_of("INDEX_ERROR") == "INDEX_ERROR"
+
+@pytest.mark.parametrize("line, name, arguments", [
+    ("create 10 Integer 1,2,3", "create", [10, "Integer", "1,2,3"]),
+    ("create 10 String", "create", [10, "String"]),
+    ("insert hello world", "insert", ["hello world"]), # The last argument keeps its spaces
+    ("insert_at 0 a b", "insert_at", [0, "a b"]),
+    ("modify -1 9", "modify", [-1, "9"]),
+    ("clear", "clear", []),
+    ('{"op": "insert_at", "index": "2", "value": "x y"}', "insert_at", [2, "x y"]),
+    ('{"op": "create", "capacity": 4, "type": "Date"}', "create", [4, "Date"]),
+    ('{"op": "search", "value": 7, "extra": true}', "search", [7]),
+])
+def test_parse_line(line, name, arguments):
+    parsed_name, handler, parsed_arguments = parse_line(line)
+    assert (parsed_name, parsed_arguments) == (name, arguments)
+    assert handler is replay.OPERATIONS[name][0]
+
+@pytest.mark.parametrize("line, message", [
+    ("push 1", "unknown operation 'push'"),
+    ("insert_at 1", "insert_at needs value"),
+    ("create", "create needs capacity, type"),
+    ("delete one", "index must be an integer, got 'one'"),
+    ('{"op": "delete"}', "delete needs index"),
+    ('{"op": "delete", "index": true}', "index must be an integer"),
+    ('{"op": "delete", "index": 1.5}', "index must be an integer"),
+    ('{"op": "nope"}', "unknown operation 'nope'"),
+    ('{"op": ', "invalid JSON"),
+    ('{"op": "clear"} trailing', "invalid JSON"),
+])
+def test_parse_line_errors(line, message):
+    with pytest.raises(ValueError, match=message):
+        parse_line(line)
+
+def run(script, box=None, **options):
+    box = box or MitaInABox()
+    seen = []
+    stats = replay.replay(script.splitlines(), box, lambda *record: seen.append(record), **options)
+    return stats, seen, box
+
+def test_statuses():
+    script = """
+        # Comments and blank lines are skipped
+
+        create 2 Integer 1
+        insert 2
+        insert 3
+        resize_insert 3
+        insert_at 9 4
+        modify 0 x
+        delete 5
+        search 3
+        search 8
+        search q
+        bogus
+        create 2 Color
+        clear
+    """
+    stats, seen, box = run(script)
+    assert [(name, status, result) for _, name, status, result in seen] == [
+        ("create", "OK", None),
+        ("insert", "OK", None),
+        ("insert", "FULL", None),
+        ("resize_insert", "OK", None),
+        ("insert_at", "INDEX_ERROR", None),
+        ("modify", "TYPE_ERROR", None),
+        ("delete", "INDEX_ERROR", None),
+        ("search", "OK", 2),
+        ("search", "OK", -1),
+        ("search", "TYPE_ERROR", None),
+        ("invalid", "PARSE_ERROR", "unknown operation 'bogus'"),
+        ("create", "PARSE_ERROR", "unknown data type 'Color'"),
+        ("clear", "OK", None),
+    ]
+    assert seen[0][0] == 4 # Line numbers count skipped lines
+    assert stats.total() == 13 and stats.failures == 7
+    assert stats.statuses["insert"] == {"OK": 1, "FULL": 1}
+    assert box.get_data() == []
+
+def test_sorted_mode_reports_order_errors():
+    box = MitaInABox()
+    box.set_sorted(True)
+    stats, seen, _ = run("create 5 Integer 1,5\ninsert_at 0 9\ninsert_at 1 3", box)
+    assert [status for _, _, status, _ in seen] == ["OK", "ORDER_ERROR", "OK"]
+    assert box.get_data() == [1, 3, 5]
+
+def test_create_reports_bad_data():
+    status, message = run_create(MitaInABox(), 3, "Integer", "1,x")
+    assert status == "TYPE_ERROR" and "at index 1" in message
+
+def test_stop_on_error():
+    stats, seen, box = run("create 3 Integer\ninsert x\ninsert 1", stop_on_error=True)
+    assert len(seen) == 2 and box.get_data() == []
+
+def test_main_writes_results_and_exit_code(tmp_path, capsys):
+    script = tmp_path / "ops.txt"
+    script.write_text('create 3 Integer 1\n{"op": "insert", "value": "2"}\ndelete 7\n', encoding="utf-8")
+    results = tmp_path / "out.jsonl"
+    assert replay.main([str(script), "--results", str(results), "--storage", "gap"]) == 1
+    records = [json.loads(line) for line in results.read_text(encoding="utf-8").splitlines()]
+    assert [(record["line"], record["op"], record["status"]) for record in records] == [
+        (1, "create", "OK"), (2, "insert", "OK"), (3, "delete", "INDEX_ERROR")]
+    captured = capsys.readouterr()
+    assert "line 3: delete -> INDEX_ERROR" in captured.err
+    assert "Replayed 3 operations" in captured.out
+
+def test_main_all_ok_and_missing_script(tmp_path, capsys):
+    script = tmp_path / "ops.txt"
+    script.write_text("create 3 String a\nsearch a\n", encoding="utf-8")
+    assert replay.main([str(script)]) == 0
+    assert replay.main([str(tmp_path / "missing.txt")]) == 2
+    assert "Could not open" in capsys.readouterr().err
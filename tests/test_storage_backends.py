@@ -0,0 +1,149 @@
+import pytest
+
+from mita_backend import GapStorage, MitaInABox
+
+# Every check runs against both layouts create_array accepts
+@pytest.fixture(params=("contiguous", "gap"))
+def storage(request):
+    return request.param
+
+def make(storage, capacity, data, data_type="Integer"):
+    box = MitaInABox()
+    assert box.create_array(capacity, data, data_type, storage=storage) == (True, "Success")
+    return box
+
+def test_create_picks_the_storage(storage):
+    box = make(storage, 5, "1, 2,3")
+    assert isinstance(box.array, GapStorage) == (storage == "gap")
+    assert box.get_data() == [1, 2, 3]
+    assert box.get_length() == 3
+    assert box.get_capacity() == 5
+
+def test_create_rejects_wrong_type(storage):
+    box = MitaInABox()
+    success, message = box.create_array(5, "1,x", "Integer", storage=storage)
+    assert not success
+    assert "'x'" in message
+
+def test_create_keeps_only_capacity_items(storage):
+    box = make(storage, 2, "1,2,3")
+    assert box.get_data() == [1, 2]
+
+def test_create_strings(storage):
+    box = make(storage, 3, "a, b", "String")
+    assert box.get_data() == ["a", "b"]
+
+def test_insert(storage):
+    box = make(storage, 3, "1")
+    assert box.insert("2") is True
+    assert box.insert("x") is False
+    assert box.get_data() == [1, 2]
+    assert box.insert("3") is True
+    assert box.is_full()
+
+def test_insert_at(storage):
+    box = make(storage, 6, "1,2,3")
+    assert box.insert_at_specific_index(0, "0") is True
+    assert box.insert_at_specific_index(2, "9") is True
+    assert box.insert_at_specific_index(5, "4") is True # At the end appends
+    assert box.get_data() == [0, 1, 9, 2, 3, 4]
+
+@pytest.mark.parametrize("index", [-1, 7, 99])
+def test_insert_at_out_of_range(storage, index):
+    box = make(storage, 6, "1,2,3")
+    assert box.insert_at_specific_index(index, "5") == "INDEX_ERROR"
+    assert box.get_data() == [1, 2, 3]
+
+def test_insert_at_wrong_type(storage):
+    box = make(storage, 6, "1,2,3")
+    assert box.insert_at_specific_index(1, "z") == "TYPE_ERROR"
+    assert box.get_data() == [1, 2, 3]
+
+def test_insert_at_full(storage):
+    box = make(storage, 2, "1,2")
+    assert box.insert_at_specific_index(0, "5") == "FULL"
+    assert box.get_data() == [1, 2]
+
+def test_delete(storage):
+    box = make(storage, 5, "1,2,3,4")
+    assert box.delete_at_index(1) is True
+    assert box.delete_at_index(2) is True # Last element
+    assert box.delete_at_index(0) is True
+    assert box.get_data() == [3]
+
+@pytest.mark.parametrize("index", [-1, 4, 99])
+def test_delete_out_of_range(storage, index):
+    box = make(storage, 5, "1,2,3,4")
+    assert box.delete_at_index(index) == "INDEX_ERROR"
+    assert box.get_data() == [1, 2, 3, 4]
+
+def test_modify(storage):
+    box = make(storage, 5, "1,2,3")
+    assert box.modify_at_index(1, "7") is True
+    assert box.get_data() == [1, 7, 3]
+
+@pytest.mark.parametrize("index", [-1, 3, 99])
+def test_modify_out_of_range(storage, index):
+    box = make(storage, 5, "1,2,3")
+    assert box.modify_at_index(index, "7") == "INDEX_ERROR"
+    assert box.get_data() == [1, 2, 3]
+
+def test_modify_wrong_type(storage):
+    box = make(storage, 5, "1,2,3")
+    assert box.modify_at_index(0, "q") == "TYPE_ERROR"
+    assert box.get_data() == [1, 2, 3]
+
+def test_search(storage):
+    box = make(storage, 5, "4,8,4")
+    assert box.search("4") == 0 # First occurrence
+    assert box.search("8") == 1
+    assert box.search("5") == -1
+    assert box.search("abc") == -1 # Wrong type
+
+def test_search_after_edits(storage):
+    box = make(storage, 8, "1,2,3")
+    box.insert_at_specific_index(0, "9")
+    box.delete_at_index(2)
+    assert box.get_data() == [9, 1, 3]
+    assert box.search("3") == 2
+    assert box.search("2") == -1
+
+def test_resize_and_insert(storage):
+    box = make(storage, 3, "1,2,3")
+    assert box.resize_and_insert("4") is True
+    assert box.get_capacity() == 6
+    assert box.get_data() == [1, 2, 3, 4]
+    assert box.get_growth_stats()["reallocations"] >= 1
+
+def test_resize_and_insert_wrong_type(storage):
+    box = make(storage, 3, "1,2,3")
+    assert box.resize_and_insert("y") is False
+    assert box.get_capacity() == 3
+    assert box.get_data() == [1, 2, 3]
+
+def test_resize_keeps_growing(storage):
+    box = make(storage, 1, "")
+    for value in range(100):
+        assert box.resize_and_insert(str(value)) is True
+    assert box.get_data() == list(range(100))
+    assert box.get_capacity() >= 100
+
+def test_clear(storage):
+    box = make(storage, 5, "1,2,3")
+    box.clear()
+    assert box.get_data() == []
+    assert box.get_length() == 0
+    assert box.get_capacity() == 5
+    assert box.search("1") == -1
+    assert box.insert("4") is True
+    assert box.get_data() == [4]
+
+def test_storages_agree_on_edit_sequence():
+    boxes = [make(kind, 20, "5,3,8") for kind in ("contiguous", "gap")]
+    for box in boxes:
+        box.insert("1")
+        box.insert_at_specific_index(2, "6")
+        box.delete_at_index(0)
+        box.modify_at_index(1, "2")
+        box.resize_and_insert("7")
+    assert boxes[0].get_data() == boxes[1].get_data() == [3, 2, 8, 1, 7]
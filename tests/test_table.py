@@ -0,0 +1,54 @@
+import pytest
+
+from table import Table
+
+def people():
+    return Table.from_lists({
+        "name": ("String", ["ann", "bob", "cy", "dee", "eve"]),
+        "age": ("Integer", [31, 25, 40, 25, 52]),
+        "team": ("String", ["x", "y", "x", "x", "y"]),
+    })
+
+def test_filter_uses_every_condition():
+    result = people().filter(("age", ">=", 30), ("team", "==", "x"))
+    assert result.rows() == [("ann", 31, "x"), ("cy", 40, "x")]
+    assert len(result) == 2
+
+def test_filter_accepts_text_operands():
+    assert people().filter(("age", "<", "30")).values("name") == ["bob", "dee"]
+
+def test_filter_without_conditions_keeps_every_row():
+    assert people().filter().rows() == people().rows()
+
+def test_filter_rejects_bad_conditions():
+    with pytest.raises(ValueError):
+        people().filter(("age", ">", "old"))
+    with pytest.raises(ValueError):
+        people().filter(("age", "~", 3))
+
+def test_chained_queries_select_from_the_root():
+    table = people()
+    result = table.sort("age", descending=True).filter(("team", "==", "x")).select("name")
+    assert result.source[0] is table
+    assert result.rows() == [("cy",), ("ann",), ("dee",)]
+
+def test_filter_on_a_materialized_column():
+    older = people().filter(("age", ">", 26))
+    assert older.column("age").get_data() == [31, 40, 52]
+    assert older.filter(("age", "<", 50)).values("name") == ["ann", "cy"]
+
+def test_select_shares_columns():
+    table = people()
+    assert table.select("age").column("age") is table.column("age")
+
+def test_group_by_after_filter():
+    result = people().filter(("age", "<", 50)).group_by("team", "age", "mean")
+    assert result == {"x": 32.0, "y": 25.0}
+
+def test_from_csv_reports_bad_values(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,x\n2,y\n", encoding="utf-8")
+    table = Table.from_csv(path, types={"a": "Integer"})
+    assert table.values("a") == [1, 2]
+    with pytest.raises(ValueError, match="row 2"):
+        Table.from_csv(path, types={"a": "Integer", "b": "Boolean"})
@@ -0,0 +1,96 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+import mita_backend
+from array_backend import ArrayBackend
+from mita_backend import DATA_TYPES, DataType, MitaInABox, fixed_bytes_type, register_type, type_info
+
+SAMPLES = {
+    "String": "a,héllo,",
+    "Integer": f"0,-5,{2 ** 62}",
+    "Boolean": "true,false,true",
+    "Float": "1.5,-0.25",
+    "Decimal": "1.25,-3",
+    "Date": "2024-02-29,1970-01-01",
+    "Bytes16": "abc,0123456789abcdef",
+}
+
+# Registers types for one test and drops them again, so the registry stays as shipped
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(mita_backend, "DATA_TYPES", dict(DATA_TYPES))
+    return mita_backend.DATA_TYPES
+
+def test_every_registered_type_has_a_sample():
+    assert set(SAMPLES) == set(DATA_TYPES)
+
+def test_unknown_names_fall_back_to_string():
+    assert type_info("Nope") is DATA_TYPES["String"]
+
+def test_codes_are_unique(registry):
+    with pytest.raises(ValueError, match="already used by Integer"):
+        register_type(DataType("Other", 0, str, "heap"))
+    register_type(DataType("Integer", 0, DATA_TYPES["Integer"].parse, "array", typecode="q")) # Re-registering is fine
+    assert "Other" not in registry
+
+@pytest.mark.parametrize("kind", ["contiguous", "gap"])
+@pytest.mark.parametrize("data_type", sorted(SAMPLES))
+def test_save_and_load_round_trip(tmp_path, data_type, kind):
+    box = MitaInABox()
+    assert box.create_array(5, SAMPLES[data_type], data_type, storage=kind)[0]
+    path = str(tmp_path / "array.mita")
+    assert box.save(path)[0]
+    loaded = MitaInABox()
+    assert loaded.load(path) == (True, "Success")
+    assert loaded.data_type == data_type and loaded.get_capacity() == 5
+    assert loaded.get_data() == box.get_data()
+    assert [loaded.display(value) for value in loaded.get_data()] == [box.display(value) for value in box.get_data()]
+
+def test_displayed_values():
+    assert type_info("Float").display(0.1) == "0.1"
+    assert type_info("Date").display(date(2024, 1, 2)) == "2024-01-02"
+    assert type_info("Bytes16").display(b"a\xff") == "a\\xff"
+    assert type_info("Decimal").parse("1.5") == (True, Decimal("1.5"))
+
+def test_registered_type_round_trips(tmp_path, registry):
+    # Whole cents kept as integers, shown as money
+    def parse(value):
+        try:
+            return True, Decimal(str(value).strip()).quantize(Decimal("0.01"))
+        except ArithmeticError:
+            return False, None
+    register_type(DataType("Money", 40, parse, "array", typecode="q", display=lambda value: f"${value}",
+                           encode=lambda value: int(value * 100), decode=lambda cents: Decimal(cents) / 100))
+    register_type(fixed_bytes_type(4, 41))
+    assert list(registry)[-2:] == ["Money", "Bytes4"]
+
+    box = MitaInABox()
+    assert box.create_array(4, "1.5,2.25", "Money")[0]
+    assert box.display(box.get_data()[1]) == "$2.25"
+    path = str(tmp_path / "money.mita")
+    box.save(path)
+    loaded = MitaInABox()
+    assert loaded.load(path)[0]
+    assert loaded.data_type == "Money" and loaded.get_data() == [Decimal("1.50"), Decimal("2.25")]
+    assert loaded.search("2.25") == 1
+
+    assert not box.create_array(2, "abcde", "Bytes4")[0] # Wider than the type
+    assert box.create_array(2, "ab", "Bytes4")[0] and box.get_data() == [b"ab"]
+
+def test_load_rejects_unregistered_codes(tmp_path, registry):
+    register_type(fixed_bytes_type(4, 41))
+    box = MitaInABox()
+    box.create_array(2, "ab", "Bytes4")
+    path = str(tmp_path / "array.mita")
+    box.save(path)
+    del registry["Bytes4"]
+    assert MitaInABox().load(path) == (False, "Unknown data type code 41")
+
+def test_array_backend_uses_the_registry():
+    backend = ArrayBackend()
+    assert backend.create(3, "2024-01-02", "Date")[0]
+    assert backend.show(backend.arr[0]) == "2024-01-02"
+    assert backend.create(3, "0.1", "Float")[0]
+    assert backend.show(backend.arr[0]) == "0.1"
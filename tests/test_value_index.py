@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from array_backend import ArrayBackend
+from mita_backend import ArrayStorage, MitaInABox, ValueIndex
+
+def first(values, value):
+    return values.index(value) if value in values else -1
+
+def test_value_index_builds_first_positions():
+    index = ValueIndex()
+    storage = ArrayStorage("q", [4, 7, 4, 9])
+    assert index.lookup(storage, 4) == 0
+    assert index.lookup(storage, 9) == 3
+    assert index.lookup(storage, 5) == -1
+    assert not index.stale
+
+def test_value_index_updates_in_place():
+    index = ValueIndex()
+    storage = ArrayStorage("q", [1, 2])
+    index.lookup(storage, 1)
+    index.appended(1, 2) # A later duplicate keeps the first position
+    index.appended(3, 2)
+    assert index.positions == {1: 0, 2: 1, 3: 2}
+    index.replaced(1, 2, 0) # 2 had only this slot: needs a rescan
+    assert index.stale
+
+def test_value_index_replace_keeps_earlier_occurrence():
+    index = ValueIndex()
+    index.lookup(ArrayStorage("q", [5, 6, 5]), 5)
+    index.replaced(2, 5, 8) # Slot 2 was not the first 5
+    assert not index.stale
+    assert index.positions == {5: 0, 6: 1, 8: 2}
+
+def test_value_index_removed_last():
+    index = ValueIndex()
+    index.lookup(ArrayStorage("q", [1, 2, 3]), 1)
+    index.removed_last(3, 2)
+    index.removed_last(1, 5) # Not its first position: kept
+    assert index.positions == {1: 0, 2: 1}
+
+# Random edits with the index on, checked against list.index after each step
+def mita_steps(box, rng, model):
+    op = rng.randrange(5)
+    value = rng.randrange(6)
+    if op == 0 and len(model) < box.get_capacity():
+        box.insert(str(value))
+        model.append(value)
+    elif op == 1 and len(model) < box.get_capacity():
+        position = rng.randrange(len(model) + 1)
+        box.insert_at_specific_index(position, str(value))
+        model.insert(position, value)
+    elif op == 2 and model:
+        position = rng.randrange(len(model))
+        box.delete_at_index(position)
+        del model[position]
+    elif op == 3 and model:
+        position = rng.randrange(len(model))
+        box.modify_at_index(position, str(value))
+        model[position] = value
+    elif op == 4 and rng.random() < 0.05:
+        box.clear()
+        model.clear()
+
+@pytest.mark.parametrize("storage", ["contiguous", "gap"])
+def test_mita_search_with_index_matches_a_list(storage):
+    rng, model = random.Random(3), []
+    box = MitaInABox()
+    box.create_array(40, "", "Integer", storage=storage)
+    box.set_indexing(True)
+    for _ in range(2000):
+        mita_steps(box, rng, model)
+        probe = rng.randrange(7)
+        assert box.search(str(probe)) == first(model, probe)
+
+def test_mita_search_after_create_and_undo():
+    box = MitaInABox()
+    box.set_indexing(True)
+    box.set_history(True)
+    box.create_array(5, "3,1,3", "Integer")
+    assert box.search("3") == 0
+    box.delete_at_index(0)
+    assert box.search("3") == 1
+    box.undo()
+    assert box.search("3") == 0
+    box.create_array(5, "9", "Integer")
+    assert box.search("3") == -1 and box.search("9") == 0
+
+def backend_steps(backend, rng, model):
+    op = rng.randrange(6)
+    value = rng.randrange(6)
+    if op == 0 and len(model) < backend.cap:
+        backend.insert(str(value))
+        model.append(value)
+    elif op == 1 and len(model) < backend.cap:
+        position = rng.randrange(len(model) + 1)
+        backend.insert_at(position, str(value))
+        model.insert(position, value)
+    elif op == 2 and model:
+        position = rng.randrange(len(model))
+        backend.delete(position)
+        del model[position]
+    elif op == 3 and model:
+        position = rng.randrange(len(model))
+        backend.modify(position, str(value))
+        model[position] = value
+    elif op == 4 and model:
+        positions = rng.sample(range(len(model)), min(2, len(model)))
+        backend.delete_many(positions)
+        for position in sorted(positions, reverse=True):
+            del model[position]
+    elif op == 5 and rng.random() < 0.05:
+        backend.clear()
+        model.clear()
+
+def test_backend_search_with_index_matches_a_list():
+    rng, model = random.Random(5), []
+    backend = ArrayBackend()
+    backend.create(40, "", "Integer")
+    backend.use_index()
+    for _ in range(2000):
+        backend_steps(backend, rng, model)
+        probe = rng.randrange(7)
+        assert backend.search(str(probe)) == first(model, probe)
+
+def test_backend_search_rejects_wrong_type():
+    backend = ArrayBackend()
+    backend.create(3, "1,2", "Integer")
+    backend.use_index()
+    assert backend.search("x") == -1
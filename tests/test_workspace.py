@@ -0,0 +1,127 @@
+import pytest
+
+from mita_backend import MitaInABox, Workspace
+
+def workspace_with(data="1,2,3", storage="contiguous"):
+    workspace = Workspace()
+    workspace.add("a")
+    workspace.current().create_array(5, data, "Integer", storage=storage)
+    return workspace
+
+def test_add_names_and_focus():
+    seen = []
+    workspace = Workspace(setup=seen.append)
+    assert workspace.add("  a ") == (True, "a")
+    assert workspace.add("a") == (False, "'a' already exists.")
+    assert workspace.add(" ") == (False, "Name cannot be empty.")
+    assert workspace.add(None) == (False, "Name cannot be empty.")
+    assert workspace.unique_name("a") == "a 2"
+    workspace.add(workspace.unique_name("a"))
+    assert workspace.names() == ["a", "a 2"] and workspace.active == "a 2"
+    assert len(seen) == 2 and seen[1] is workspace.current()
+    assert workspace.focus("a") == (True, "a") and workspace.current() is seen[0]
+    assert workspace.focus("b") == (False, "No array named 'b'.")
+
+@pytest.mark.parametrize("storage", ["contiguous", "gap"])
+def test_clone_is_isolated_both_ways(storage):
+    workspace = workspace_with(storage=storage)
+    original = workspace.current()
+    assert workspace.clone("a", "b") == (True, "b")
+    twin = workspace.current()
+    assert twin is not original and twin.array is original.array # Shared until the first edit
+    assert workspace.get_memory_usage() == original.get_memory_usage()
+
+    twin.insert("4")
+    twin.modify_at_index(0, "9")
+    assert twin.get_data() == [9, 2, 3, 4]
+    assert original.get_data() == [1, 2, 3]
+    original.delete_at_index(0)
+    assert original.get_data() == [2, 3] and twin.get_data() == [9, 2, 3, 4]
+    assert twin.array is not original.array
+
+def test_clone_of_a_clone_and_bulk_edits():
+    workspace = workspace_with()
+    workspace.clone("a", "b")
+    workspace.clone("b", "c")
+    arrays = workspace.arrays
+    arrays["b"].clear()
+    arrays["c"].insert_many([(0, "0")])
+    arrays["a"].modify_many([(2, "7")])
+    assert arrays["a"].get_data() == [1, 2, 7]
+    assert arrays["b"].get_data() == []
+    assert arrays["c"].get_data() == [0, 1, 2, 3]
+
+def test_clone_keeps_settings_and_starts_a_fresh_history():
+    workspace = workspace_with()
+    original = workspace.current()
+    original.set_history(True, policy="drop-snapshots")
+    original.set_indexing(True)
+    original.track_changes(True)
+    original.insert("4")
+    workspace.clone("a", "b")
+    twin = workspace.current()
+    assert twin.get_capacity() == 5 and twin.data_type == "Integer"
+    assert twin.history.policy == "drop-snapshots" and not twin.undo() # Nothing to undo yet
+    assert twin.search("4") == 3 and twin.pop_changes() == []
+
+    twin.delete_at_index(0)
+    original.undo()
+    assert original.get_data() == [1, 2, 3] and twin.get_data() == [2, 3, 4]
+    twin.undo()
+    assert twin.get_data() == [1, 2, 3, 4]
+
+def test_clone_of_a_loaded_file(tmp_path):
+    box = MitaInABox()
+    box.create_array(4, "a,b", "String")
+    box.save(str(tmp_path / "array.mita"))
+    workspace = Workspace()
+    workspace.add("file")
+    assert workspace.current().load(str(tmp_path / "array.mita"))[0]
+    workspace.clone("file", "copy")
+    workspace.arrays["copy"].insert("c")
+    assert workspace.arrays["file"].get_data() == ["a", "b"]
+    assert workspace.arrays["copy"].get_data() == ["a", "b", "c"]
+
+def test_clone_errors():
+    workspace = workspace_with()
+    assert workspace.clone("x", "b") == (False, "No array named 'x'.")
+    assert workspace.clone("a", "a") == (False, "'a' already exists.")
+    assert workspace.names() == ["a"]
+
+def test_rename_keeps_order_and_focus():
+    workspace = workspace_with()
+    workspace.add("b")
+    workspace.add("c")
+    workspace.focus("b")
+    box = workspace.current()
+    assert workspace.rename("b", " x ") == (True, "x")
+    assert workspace.names() == ["a", "x", "c"] and workspace.active == "x" and workspace.current() is box
+    assert workspace.rename("a", "c") == (False, "'c' already exists.")
+    assert workspace.rename("q", "r") == (False, "No array named 'q'.")
+    assert workspace.rename("a", "") == (False, "Name cannot be empty.")
+    assert workspace.rename("c", "z") == (True, "z") and workspace.active == "x"
+
+def test_remove_moves_focus_to_a_neighbour():
+    workspace = workspace_with()
+    for name in "bcd":
+        workspace.add(name)
+    workspace.focus("b")
+    assert workspace.remove("b") == (True, "b")
+    assert workspace.active == "c" # The next one takes its place
+    workspace.focus("d")
+    workspace.remove("d")
+    assert workspace.active == "c" # The last one falls back to the previous
+    workspace.focus("a")
+    workspace.remove("c")
+    assert workspace.active == "a" # Removing another array keeps the focus
+    workspace.remove("a")
+    assert workspace.active is None and workspace.current() is None
+    assert workspace.remove("a") == (False, "No array named 'a'.")
+
+def test_memory_usage_counts_shared_storage_once():
+    workspace = workspace_with(",".join(map(str, range(5))))
+    single = workspace.get_memory_usage()
+    workspace.clone("a", "b")
+    assert workspace.get_memory_usage() == single
+    workspace.arrays["b"].modify_at_index(0, "9")
+    assert workspace.get_memory_usage() == 2 * single
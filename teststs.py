@@ -1,72 +1,16 @@
-import customtkinter as ctk
+import time
+STARTUP_STARTED = time.perf_counter() # Before the other imports, so the startup report includes them
 
-# ==========================================
-#               BACKEND LOGIC
-# ==========================================
-class ArrayBackend:
-    def __init__(self):
-        self.arr, self.cap, self.type = [], 0, "String"
-
-    def validate(self, val):
-        val = str(val).strip()
-        if self.type == "Integer":
-            return (True, int(val)) if val.lstrip('-').isdigit() else (False, None)
-        elif self.type == "Boolean":
-            if val.lower() in {'true', '1', 'yes', 'on', 't', 'y'}: return True, True
-            if val.lower() in {'false', '0', 'no', 'off', 'f', 'n'}: return True, False
-            return False, None
-        return True, val
-
-    def create(self, cap_input, raw_data, dtype):
-        try: self.cap = int(cap_input) if cap_input else 1
-        except ValueError: self.cap = 1
-        self.type, self.arr = dtype, []
-        
-        if raw_data and raw_data.strip():
-            for item in raw_data.split(','):
-                valid, val = self.validate(item)
-                if not valid: return False, f"'{item.strip()}' invalid for {dtype}"
-                self.arr.append(val)
-            self.arr = self.arr[:self.cap]
-        return True, "Success"
-
-    def insert(self, item, resize=False):
-        valid, val = self.validate(item)
-        if not valid: return False, "TYPE_ERROR"
-        if len(self.arr) >= self.cap:
-            if not resize: return False, "FULL"
-            self.cap *= 2
-        self.arr.append(val)
-        return True, "Success"
-
-    def modify(self, idx, val):
-        if not (0 <= idx < len(self.arr)): return "INDEX_ERROR"
-        valid, conv = self.validate(val)
-        if not valid: return "TYPE_ERROR"
-        self.arr[idx] = conv
-        return True
-
-    def insert_at(self, idx, val):
-        if len(self.arr) >= self.cap: return "FULL"
-        # Check Valid Bounds (0 to Capacity-1) for UI safety
-        if idx < 0 or idx >= self.cap: return "INDEX_ERROR"
-        
-        valid, conv = self.validate(val)
-        if not valid: return "TYPE_ERROR"
-        
-        # Standard insert behavior (appends if idx > current length)
-        self.arr.insert(idx, conv)
-        return True
+import customtkinter as ctk
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-    def delete(self, idx):
-        if 0 <= idx < len(self.arr): return self.arr.pop(idx) is not None
-        return False
+from array_backend import ArrayBackend
+from mita_backend import DATA_TYPES
 
-    def search(self, val):
-        valid, target = self.validate(val)
-        if not valid: return -1
-        try: return self.arr.index(target)
-        except ValueError: return -1
+STARTUP_IMPORTED = time.perf_counter() # Imports done (opt-in report, MITA_STARTUP_TIMING)
 
 # ==========================================
 #               FRONTEND GUI
@@ -75,19 +19,25 @@ class ArrayVisualizer(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.bk = ArrayBackend()
+        self.bk.track_changes(); self.bk.use_history()
         self.boxes = []
+        self.pool, self.events, self.cancel = ThreadPoolExecutor(1), queue.Queue(), threading.Event()
         self.setup_ui()
 
+    def destroy(self):
+        self.cancel.set(); self.pool.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
     # --- UI HELPERS ---
     def setup_ui(self):
-        ctrl = ctk.CTkFrame(self, fg_color="transparent")
+        ctrl = self.ctrl = ctk.CTkFrame(self, fg_color="transparent")
         ctrl.pack(fill="x", padx=20, pady=10)
 
         # Setup Section
         self.add_section(ctrl, "Setup Array", [
             ("lbl", "Capacity (1-10):"),
             ("entry_var", "cap", "5"),
-            ("menu", ["String", "Integer", "Boolean"]),
+            ("menu", list(DATA_TYPES)),
             ("entry", "init_data", "e.g. A, B"),
             ("btn", "Create / Reset", self.create_array, "green")
         ])
@@ -106,8 +56,14 @@ class ArrayVisualizer(ctk.CTkFrame):
             ("btn", "Insert At", self.insert_at_idx, "#8E44AD"),
             ("btn", "Modify Idx", self.modify_idx, "#D68910"),
             ("btn", "Delete Idx", self.del_idx, "#C0392B"),
-            ("btn", "Clear", self.clear_arr, "#7F8C8D")
+            ("btn", "Clear", self.clear_arr, "#7F8C8D"),
+            ("btn", "Undo", self.undo, "#34495E"),
+            ("btn", "Redo", self.redo, "#34495E")
         ], div=True)
+        top = self.winfo_toplevel()
+        # Shortcuts are ignored while background work holds the backend
+        for seq, fn in (("<Control-z>", self.undo), ("<Control-y>", self.redo)):
+            top.bind(seq, lambda e, fn=fn: None if self.busy is not None and self.busy.winfo_manager() else fn(), add=True)
 
         # Append Section
         self.add_section(ctrl, "Append", [
@@ -120,6 +76,7 @@ class ArrayVisualizer(ctk.CTkFrame):
         self.vis_frame.pack(fill="both", expand=True, padx=20, pady=20)
         self.status = ctk.CTkLabel(self.vis_frame, text="", font=("Arial", 14))
         self.status.pack(pady=10)
+        self.busy = None # Progress bar + cancel, built by the first background job
         self.box_frame = ctk.CTkFrame(self.vis_frame, fg_color="transparent")
         self.box_frame.pack(fill="x", padx=20)
 
@@ -152,7 +109,7 @@ class ArrayVisualizer(ctk.CTkFrame):
     def update_status(self, msg, color="black"):
         self.status.configure(text=msg, text_color=color)
 
-    def refresh(self, frame=None, title="Current Array"):
+    def refresh(self, frame=None, title="Current Array", cap=None):
         tgt = frame if frame else self.box_frame
         for w in tgt.winfo_children(): w.destroy()
         
@@ -160,7 +117,7 @@ class ArrayVisualizer(ctk.CTkFrame):
         cont = ctk.CTkFrame(tgt, fg_color="transparent"); cont.pack()
         
         self.boxes = []
-        for i in range(self.bk.cap):
+        for i in range(cap or self.bk.cap):
             filled = i < len(self.bk.arr)
             card = ctk.CTkFrame(cont, width=50, height=70, corner_radius=6, border_width=2,
                                 fg_color="#3B8ED0" if filled else ("gray90", "#3A3A3A"),
@@ -168,12 +125,32 @@ class ArrayVisualizer(ctk.CTkFrame):
             card.grid(row=i//10, column=i%10, padx=4, pady=(0, 25))
             card.pack_propagate(False)
             
-            ctk.CTkLabel(card, text=str(self.bk.arr[i]) if filled else "", font=("Arial", 12, "bold"),
+            ctk.CTkLabel(card, text=self.bk.show(self.bk.arr[i]) if filled else "", font=("Arial", 12, "bold"),
                          text_color="white" if filled else "gray60").place(relx=0.5, rely=0.5, anchor="c")
             ctk.CTkLabel(cont, text=str(i), font=("Arial", 10), text_color="gray60").place(in_=card, relx=0.5, rely=1.0, y=10, anchor="c")
             self.boxes.append(card)
         return self.boxes
 
+    # Patches only the boxes named by the backend's change records
+    def patch(self):
+        changes = self.bk.pop_changes()
+        if len(self.boxes) != self.bk.cap or any(c[0] in ("reset", "capacity") for c in changes): return self.refresh()
+        n = len(self.bk.arr)
+        for c in changes:
+            if c[0] == "set": lo, hi = c[1], c[1] + 1
+            elif c[0] == "shift": lo, hi = c[1], n + max(0, -c[2]) # Old tail when it shrank
+            else: lo, hi = 0, c[1] # cleared
+            for i in range(lo, min(hi, len(self.boxes))): self.paint_box(i)
+
+    def paint_box(self, i):
+        filled = i < len(self.bk.arr)
+        card, text = self.boxes[i], self.bk.show(self.bk.arr[i]) if filled else ""
+        lbl = card.winfo_children()[0]
+        if lbl.cget("text") == text and (card.cget("fg_color") == "#3B8ED0") == filled: return # Unchanged
+        card.configure(fg_color="#3B8ED0" if filled else ("gray90", "#3A3A3A"),
+                       border_color="#2c6e91" if filled else ("gray70", "#505050"))
+        lbl.configure(text=text, text_color="white" if filled else "gray60")
+
     def get_input(self, prompt, cast_int=False):
         if not self.bk.cap: return self.update_status("Error: Create array first!", "red")
         val = ctk.CTkInputDialog(text=prompt, title="Input").get_input()
@@ -182,11 +159,50 @@ class ArrayVisualizer(ctk.CTkFrame):
             return int(val) if val.lstrip('-').isdigit() else (self.update_status("Invalid Number", "red"), None)[1]
         return val
 
+    # --- BACKGROUND WORK ---
+    # Runs work(progress) on the single worker thread (keeps backend calls serialized);
+    # done(result) runs back on the Tk thread once drain() picks the result up
+    def run_bg(self, label, work, done):
+        if self.busy is None:
+            self.busy = ctk.CTkFrame(self.vis_frame, fg_color="transparent")
+            self.bar = ctk.CTkProgressBar(self.busy, width=200); self.bar.pack(side="left")
+            ctk.CTkButton(self.busy, text="Cancel", command=self.cancel.set, fg_color="#C0392B", width=70, height=24).pack(side="left", padx=10)
+        self.cancel.clear(); self.lock(True); self.bar.set(0)
+        self.busy.pack(before=self.box_frame, pady=5); self.update_status(f"{label}...", "orange")
+
+        def progress(n, total):
+            self.events.put(("progress", n / total if total else 1.0))
+            return not self.cancel.is_set()
+
+        def job():
+            try: self.events.put(("done", work(progress)))
+            except Exception as e: self.events.put(("error", e))
+        self.pool.submit(job)
+        self.after(30, lambda: self.drain(done))
+
+    def drain(self, done):
+        while not self.events.empty():
+            kind, val = self.events.get_nowait()
+            if kind == "progress": self.bar.set(val); continue
+            self.busy.pack_forget(); self.lock(False)
+            return done(val) if kind == "done" else self.update_status(f"Error: {val}", "red")
+        self.after(30, lambda: self.drain(done))
+
+    def lock(self, on):
+        todo = [self.ctrl]
+        while todo:
+            w = todo.pop()
+            if isinstance(w, (ctk.CTkButton, ctk.CTkEntry, ctk.CTkOptionMenu, ctk.CTkSwitch)): w.configure(state="disabled" if on else "normal")
+            else: todo.extend(w.winfo_children())
+
     # OPERATION HANDLERS 
     def create_array(self):
-        s, msg = self.bk.create(self.cap.get(), self.init_data.get(), self.dtype.get())
-        if s: self.refresh(); self.update_status(f"Created {self.bk.type} Array", "green")
-        else: self.update_status(f"Error: {msg}", "red")
+        args = self.cap.get(), self.init_data.get(), self.dtype.get()
+        def done(res):
+            s, msg = res
+            if s: self.patch(); self.update_status(f"Created {self.bk.type} Array", "green")
+            else: self.patch(); self.update_status(f"Error: {msg}", "red")
+        self.run_bg("Creating", lambda progress: self.bk.create(*args, progress), done)
 
     def append_el(self):
         val = self.append_val.get()
@@ -196,22 +212,21 @@ class ArrayVisualizer(ctk.CTkFrame):
             else: self.update_status("Array Full!", "red")
         else:
             s, msg = self.bk.insert(val)
-            if s: self.refresh(); self.update_status(f"Inserted '{val}'", "blue"); self.append_val.delete(0, 'end')
+            if s: self.patch(); self.update_status(f"Inserted '{val}'", "blue"); self.append_val.delete(0, 'end')
             else: self.update_status(f"Error: {msg}", "red")
 
     def access_idx(self):
         idx = self.get_input("Enter Index:", True)
         if idx is None: return
-        val = self.bk.arr[idx] if 0 <= idx < len(self.bk.arr) else None
-        if val is not None:
-            self.update_status(f"Value at {idx}: {val}", "green")
+        if 0 <= idx < len(self.bk.arr):
+            self.update_status(f"Value at {idx}: {self.bk.show(self.bk.arr[idx])}", "green")
             self.flash(idx, "#F1C40F")
         else: self.update_status("Index out of bounds", "red")
 
     def access_special(self, i):
         if not self.bk.arr: return self.update_status("Empty Array", "red")
         actual_i = i if i >= 0 else len(self.bk.arr) + i
-        self.update_status(f"{'First' if i==0 else 'Last'}: {self.bk.arr[actual_i]}", "green")
+        self.update_status(f"{'First' if i==0 else 'Last'}: {self.bk.show(self.bk.arr[actual_i])}", "green")
         self.flash(actual_i, "#F1C40F")
 
     def show_len(self):
@@ -238,7 +253,7 @@ class ArrayVisualizer(ctk.CTkFrame):
         
         res = self.bk.insert_at(idx, val)
         if res == True: 
-            self.refresh()
+            self.patch()
             final_idx = min(idx, len(self.bk.arr)-1) 
             self.update_status(f"Inserted at {final_idx}", "green")
             self.flash(final_idx, "#2CC985")
@@ -260,7 +275,7 @@ class ArrayVisualizer(ctk.CTkFrame):
         if not val: return
 
         res = self.bk.modify(idx, val)
-        if res == True: self.refresh(); self.update_status(f"Modified {idx}", "green"); self.flash(idx, "#F39C12")
+        if res == True: self.patch(); self.update_status(f"Modified {idx}", "green"); self.flash(idx, "#F39C12")
         else: self.update_status(f"Error: {res}", "red")
 
     def del_idx(self):
@@ -274,11 +289,19 @@ class ArrayVisualizer(ctk.CTkFrame):
         if not (0 <= idx < len(self.bk.arr)):
              return self.update_status(f"Error: Index {idx} out of bounds (0-{len(self.bk.arr)-1})", "red")
 
-        if self.bk.delete(idx): self.refresh(); self.update_status(f"Deleted index {idx}", "green")
+        if self.bk.delete(idx): self.patch(); self.update_status(f"Deleted index {idx}", "green")
         else: self.update_status("Index Error", "red")
 
     def clear_arr(self):
-        self.bk.arr = []; self.refresh(); self.update_status("Array Cleared", "green")
+        self.bk.clear(); self.patch(); self.update_status("Array Cleared", "green")
+
+    def undo(self):
+        if self.bk.undo(): self.patch(); self.update_status("Undone", "green")
+        else: self.update_status("Nothing to undo", "red")
+
+    def redo(self):
+        if self.bk.redo(): self.patch(); self.update_status("Redone", "green")
+        else: self.update_status("Nothing to redo", "red")
 
     # --- ANIMATIONS ---
     def flash(self, i, col):
@@ -295,8 +318,9 @@ class ArrayVisualizer(ctk.CTkFrame):
             self.update_status(f"Type Mismatch: '{target}' is not a {self.bk.type}", "red")
             return 
 
-        found_idx = self.bk.search(target)
-        
+        self.run_bg("Searching", lambda progress: self.bk.search(target), lambda found_idx: self.animate_search(target, found_idx))
+
+    def animate_search(self, target, found_idx):
         def scan(i):
             if i >= len(self.bk.arr): return self.update_status(f"'{target}' not found", "red")
             if i < len(self.boxes): self.boxes[i].configure(fg_color="#E67E22")
@@ -318,8 +342,7 @@ class ArrayVisualizer(ctk.CTkFrame):
         
         self.update_status("Resizing...", "orange")
         pop = ctk.CTkFrame(self.vis_frame); pop.pack(pady=10)
-        self.bk.cap *= 2
-        new_boxes = self.refresh(pop, "Resizing Array...")
+        new_boxes = self.refresh(pop, "Resizing Array...", self.bk.arr.grown())
         
         def step(i):
             if i < len(self.bk.arr):
@@ -327,13 +350,13 @@ class ArrayVisualizer(ctk.CTkFrame):
                 if i < len(self.boxes): self.boxes[i].configure(fg_color="#E5AA00")
                 self.after(400, lambda: [
                     new_boxes[i].configure(fg_color="#3B8ED0", border_color="#2c6e91"),
-                    new_boxes[i].winfo_children()[0].configure(text=str(self.bk.arr[i]), text_color="white"),
+                    new_boxes[i].winfo_children()[0].configure(text=self.bk.show(self.bk.arr[i]), text_color="white"),
                     step(i+1)
                 ])
             else:
                 pop.destroy()
                 self.bk.insert(new_item, resize=True)
-                self.refresh()
+                self.patch()
                 self.update_status("Resize Complete", "green")
         step(0)
 
@@ -341,4 +364,8 @@ if __name__ == "__main__":
     ctk.set_appearance_mode("dark"); ctk.set_default_color_theme("blue")
     root = ctk.CTk(); root.title("Array Visualizer"); root.geometry("900x600")
     ArrayVisualizer(root).pack(fill="both", expand=True)
+    # Opt-in startup time, printed once Tk goes idle (first frame drawn)
+    if os.environ.get("MITA_STARTUP_TIMING"):
+        root.after_idle(lambda: print(f"Startup: imports {(STARTUP_IMPORTED - STARTUP_STARTED) * 1000:.0f} ms, "
+                                      f"window ready {(time.perf_counter() - STARTUP_STARTED) * 1000:.0f} ms"))
     root.mainloop()